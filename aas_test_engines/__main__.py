@@ -1,10 +1,13 @@
 import argparse
+import glob
 import sys
 import os
 import json
-from aas_test_engines import api, config, file, http
+import time
+from aas_test_engines import api, config, file, http, json_decoder, xml_backend
+from aas_test_engines.result import Level, set_verbosity, set_aggregation
 from enum import Enum
-from typing import Tuple
+from typing import Tuple, List, Iterator
 
 # https://stackoverflow.com/questions/27981545
 import urllib3
@@ -27,6 +30,23 @@ class OutputFormats(Enum):
     HTML = "html"
 
 
+def _parse_verbosity(s: str) -> Level:
+    try:
+        return Level[s.upper()]
+    except KeyError:
+        raise argparse.ArgumentTypeError(f"Invalid verbosity: '{s}'")
+
+
+def _add_verbosity_argument(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--verbosity",
+        type=_parse_verbosity,
+        default=Level.INFO,
+        metavar="{info,warning,error,critical}",
+        help="only report results of at least this level, does not change whether the check passes",
+    )
+
+
 def _parse_header_value(s: str) -> Tuple[str, str]:
     try:
         key, value = s.split(":", 1)
@@ -35,15 +55,71 @@ def _parse_header_value(s: str) -> Tuple[str, str]:
         raise argparse.ArgumentTypeError(f"Invalid format for header:value: '{s}'")
 
 
+def _expand_paths(paths: List[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if os.path.splitext(name)[1].lower() in (".aasx", ".json", ".xml"):
+                        yield os.path.join(root, name)
+        elif glob.has_magic(path):
+            yield from sorted(glob.glob(path, recursive=True))
+        else:
+            yield path
+
+
+def _run_batch_file_test(args):
+    if args.output == OutputFormats.HTML:
+        raise Exception("Cannot use --output html when checking multiple files")
+    if args.model_type != "Environment":
+        raise Exception("Cannot set --model_type when checking multiple files")
+    format = str(args.format) if args.format else None
+    num_ok = 0
+    num_failed = 0
+    start = time.monotonic()
+    for path, result in file.check_files(
+        _expand_paths(args.file),
+        format=format,
+        jobs=args.jobs,
+        max_errors=args.max_errors,
+        json_decoder=args.json_decoder,
+        xml_backend=args.xml_backend,
+    ):
+        verdict = {"file": path, "ok": result.ok(), "level": result.level.name}
+        if args.output == OutputFormats.JSON:
+            verdict["result"] = result.to_dict()
+        print(json.dumps(verdict), flush=True)
+        if result.ok():
+            num_ok += 1
+        else:
+            num_failed += 1
+    duration = time.monotonic() - start
+    num_files = num_ok + num_failed
+    print(
+        f"Checked {num_files} files: {num_ok} ok, {num_failed} failed "
+        f"in {duration:.1f}s ({num_files / duration if duration else 0:.1f} files/sec)",
+        file=sys.stderr,
+    )
+    sys.exit(0 if num_failed == 0 else 1)
+
+
 def run_file_test(argv):
     parser = argparse.ArgumentParser(description="Checks a file for compliance with the AAS meta-model")
-    parser.add_argument("file", type=argparse.FileType("rb"), help="the file to check")
+    parser.add_argument(
+        "file",
+        type=str,
+        nargs="+",
+        help="the file to check. Multiple files, directories or glob patterns are checked in batch mode, "
+        "which prints one JSON line per file",
+    )
     parser.add_argument("--model_type", type=str, default="Environment", help="Check for a specific model type")
     parser.add_argument(
         "--format",
         type=InputFormats,
-        default=InputFormats.aasx,
+        default=None,
         choices=list(InputFormats),
+        help="defaults to aasx, in batch mode it is derived from the file extension",
     )
     parser.add_argument(
         "--output",
@@ -51,22 +127,94 @@ def run_file_test(argv):
         default=OutputFormats.TEXT,
         choices=list(OutputFormats),
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of processes used to check the identifiables of an environment or the files in batch mode",
+    )
+    _add_verbosity_argument(parser)
+    parser.add_argument(
+        "--aggregate",
+        type=int,
+        default=None,
+        metavar="N",
+        help="group repeated findings, keeping N examples of each",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=None,
+        metavar="N",
+        help="stop checking a file after N errors, the result is marked as truncated",
+    )
+    parser.add_argument("--fail-fast", action="store_true", help="stop checking a file at the first error")
+    parser.add_argument(
+        "--json-decoder",
+        type=str,
+        default=None,
+        choices=["auto"] + json_decoder.available_decoders(),
+        help="decode JSON files at once using this library instead of streaming them, auto uses the fastest one",
+    )
+    parser.add_argument(
+        "--xml-backend",
+        type=str,
+        default=None,
+        choices=["auto"] + xml_backend.available_backends(),
+        help="library used to parse XML files, defaults to etree, auto uses the fastest one",
+    )
     args = parser.parse_args(argv)
+    if args.fail_fast:
+        args.max_errors = 1
+    if args.max_errors is not None and args.max_errors < 1:
+        parser.error("--max-errors must be at least 1")
+    set_verbosity(args.verbosity)
+    if args.aggregate is not None:
+        if args.aggregate < 1:
+            parser.error("--aggregate must be at least 1")
+        set_aggregation(args.aggregate)
+
+    if len(args.file) > 1 or os.path.isdir(args.file[0]) or glob.has_magic(args.file[0]):
+        _run_batch_file_test(args)
+        return
 
-    if args.format == InputFormats.aasx:
+    try:
+        f = argparse.FileType("rb")(args.file[0])
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    format = args.format or InputFormats.aasx
+    if format == InputFormats.aasx:
         if args.model_type != "Environment":
             raise Exception("Cannot set --model_type for --format aasx")
-        result = file.check_aasx_file(args.file)
-    elif args.format == InputFormats.json:
-        result = file.check_json_file(args.file, model_type=args.model_type)
-    elif args.format == InputFormats.xml:
-        result = file.check_xml_file(args.file, model_type=args.model_type)
+        result = file.check_aasx_file(
+            f,
+            jobs=args.jobs,
+            max_errors=args.max_errors,
+            json_decoder=args.json_decoder,
+            xml_backend=args.xml_backend,
+        )
+    elif format == InputFormats.json:
+        result = file.check_json_file(
+            f,
+            model_type=args.model_type,
+            jobs=args.jobs,
+            max_errors=args.max_errors,
+            json_decoder=args.json_decoder,
+        )
+    elif format == InputFormats.xml:
+        result = file.check_xml_file(
+            f,
+            model_type=args.model_type,
+            jobs=args.jobs,
+            max_errors=args.max_errors,
+            xml_backend=args.xml_backend,
+        )
     else:
-        raise Exception(f"Invalid format {args.format}")
+        raise Exception(f"Invalid format {format}")
     if args.output == OutputFormats.TEXT:
         result.dump()
     elif args.output == OutputFormats.HTML:
-        print(result.to_html())
+        result.write_html(sys.stdout)
     elif args.output == OutputFormats.JSON:
         print(json.dumps(result.to_dict()))
     else:
@@ -95,13 +243,33 @@ def run_api_test(argv):
         default="",
         help="remove prefix from all paths",
     )
+    parser.add_argument("--timeout", type=float, default=None, help="timeout for each request in seconds")
+    parser.add_argument("--pool-size", type=int, default=10, help="maximum number of connections kept open")
+    parser.add_argument("--no-keep-alive", action="store_true", help="open a new connection for each request")
+    parser.add_argument("--parallel", type=int, default=1, help="number of test suites executed concurrently")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="number of negative tests of a suite sent concurrently, each from a thread of its own",
+    )
+    parser.add_argument(
+        "--json-decoder",
+        type=str,
+        default="json",
+        choices=["auto"] + json_decoder.available_decoders(),
+        help="library used to decode responses, auto uses the fastest one (orjson rejects NaN and huge numbers)",
+    )
     parser.add_argument(
         "--output",
         type=OutputFormats,
         default=OutputFormats.TEXT,
         choices=list(OutputFormats),
     )
+    _add_verbosity_argument(parser)
     args = parser.parse_args(argv)
+    set_verbosity(args.verbosity)
+    json_decoder.set_decoder(args.json_decoder)
     try:
         available_suites = api.supported_versions()[args.version]
     except KeyError:
@@ -125,19 +293,24 @@ def run_api_test(argv):
         verify=not args.no_verify,
         remove_path_prefix=args.remove_path_prefix,
         additional_headers=dict(args.header),
+        pool_size=max(args.pool_size, args.parallel * args.concurrency),
+        keep_alive=not args.no_keep_alive,
+        timeout=args.timeout,
     )
     conf = config.CheckApiConfig(
         suite=suite,
         version=args.version,
         dry=args.dry,
         filter=args.filter,
+        parallel=args.parallel,
+        concurrency=args.concurrency,
     )
 
     result, mat = api.execute_tests(client, conf)
     if args.output == OutputFormats.TEXT:
         result.dump()
     elif args.output == OutputFormats.HTML:
-        print(result.to_html())
+        result.write_html(sys.stdout)
     elif args.output == OutputFormats.JSON:
         print(json.dumps(result.to_dict()))
     else:
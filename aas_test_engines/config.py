@@ -38,3 +38,7 @@ class CheckApiConfig:
     version: Optional[str] = None
     dry: bool = False
     filter: Optional[TestCaseFilter] = None
+    # Number of test suites executed concurrently
+    parallel: int = 1
+    # Number of generated negative tests of a suite sent concurrently, each from a thread of its own
+    concurrency: int = 1
@@ -1,8 +1,12 @@
 from decimal import Decimal, DecimalException
-from typing import Pattern, Dict, Mapping
+from typing import Pattern, Dict, Mapping, Callable, Iterable, List, Set
 import re
 import base64
+import math
 from enum import Enum
+from functools import lru_cache
+
+from aas_test_engines.memo import memoize
 
 
 def is_decimal(s: str) -> bool:
@@ -95,6 +99,7 @@ _REGEX_MATCHES_XS_DATE = _construct_matches_xs_date()
 _DATE_PREFIX_RE = re.compile(r"^(-?[0-9]+)-([0-9]{2})-([0-9]{2})")
 
 
+@memoize("xs:date")
 def is_xs_date(value: str) -> bool:
     if _REGEX_MATCHES_XS_DATE.match(value) is None:
         return False
@@ -143,6 +148,7 @@ def _construct_matches_xs_date_time() -> Pattern[str]:
 _REGEX_MATCHES_XS_DATE_TIME = _construct_matches_xs_date_time()
 
 
+@memoize("xs:dateTime")
 def is_xs_date_time(s: str) -> bool:
     if _REGEX_MATCHES_XS_DATE_TIME.match(s) is None:
         return False
@@ -170,6 +176,7 @@ def _construct_matches_xs_date_time_utc() -> Pattern[str]:
 _REGEX_MATCHES_XS_DATE_TIME_UTC = _construct_matches_xs_date_time_utc()
 
 
+@memoize("xs:dateTimeUTC")
 def is_xs_date_time_utc(s: str) -> bool:
     if _REGEX_MATCHES_XS_DATE_TIME_UTC.match(s) is None:
         return False
@@ -201,6 +208,8 @@ def _days_in_month(month: int, year: int) -> int:
         return _DAYS_IN_MONTH[month]
 
 
+# Compiling the pattern takes longer than importing the rest of the package, so it is compiled on first use
+@lru_cache(maxsize=None)
 def _construct_matches_xs_any_uri() -> Pattern[str]:
     scheme = "[a-zA-Z][a-zA-Z0-9+\\-.]*"
     ucschar = "[\\xa0-\\ud7ff\\uf900-\\ufdcf\\ufdf0-\\uffef\\U00010000-\\U0001fffd\\U00020000-\\U0002fffd\\U00030000-\\U0003fffd\\U00040000-\\U0004fffd\\U00050000-\\U0005fffd\\U00060000-\\U0006fffd\\U00070000-\\U0007fffd\\U00080000-\\U0008fffd\\U00090000-\\U0009fffd\\U000a0000-\\U000afffd\\U000b0000-\\U000bfffd\\U000c0000-\\U000cfffd\\U000d0000-\\U000dfffd\\U000e1000-\\U000efffd]"
@@ -252,6 +261,7 @@ def _construct_matches_xs_g_month_day() -> Pattern[str]:
 _REGEX_MATCHES_XS_G_MONTH_DAY = _construct_matches_xs_g_month_day()
 
 
+@memoize("xs:gMonthDay")
 def is_xs_g_month_day(s: str) -> bool:
     if _REGEX_MATCHES_XS_G_MONTH_DAY.match(s) is None:
         return False
@@ -262,11 +272,9 @@ def is_xs_g_month_day(s: str) -> bool:
     return day <= max_days
 
 
-_REGEX_MATCHES_XS_ANY_URI = _construct_matches_xs_any_uri()
-
-
+@memoize("xs:anyURI")
 def is_any_uri(s: str) -> bool:
-    return _REGEX_MATCHES_XS_ANY_URI.match(s) is not None
+    return _construct_matches_xs_any_uri().match(s) is not None
 
 
 def is_base64_binary(s: str) -> bool:
@@ -300,6 +308,7 @@ def _construct_matches_bcp_47() -> Pattern[str]:
 _REGEX_MATCHES_BCP_47 = _construct_matches_bcp_47()
 
 
+@memoize("bcp47")
 def is_bcp_lang_string(s: str) -> bool:
     return _REGEX_MATCHES_BCP_47.match(s) is not None
 
@@ -356,6 +365,19 @@ class DataTypeDefXsd(Enum):
     unsignedShort = "xs:unsignedShort"
 
 
+_REGEX_MATCHES_XS_G_YEAR_MONTH = re.compile(
+    r"-?([1-9][0-9]{3,}|0[0-9]{3})-(0[1-9]|1[0-2])(Z|(\+|-)((0[0-9]|1[0-3]):[0-5][0-9]|14:00))?"
+)
+_REGEX_MATCHES_XS_G_DAY = re.compile(r"---(0[1-9]|[12][0-9]|3[01])(Z|(\+|-)((0[0-9]|1[0-3]):[0-5][0-9]|14:00))?")
+_REGEX_MATCHES_XS_G_MONTH = re.compile(r"--(0[1-9]|1[0-2])(Z|(\+|-)((0[0-9]|1[0-3]):[0-5][0-9]|14:00))?")
+_REGEX_MATCHES_XS_G_YEAR = re.compile(r"-?([1-9][0-9]{3,}|0[0-9]{3})(Z|(\+|-)((0[0-9]|1[0-3]):[0-5][0-9]|14:00))?")
+_REGEX_MATCHES_XS_TIME = re.compile(
+    r"(([01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9](\.[0-9]+)?|(24:00:00(\.0+)?))(Z|(\+|-)((0[0-9]|1[0-3]):[0-5][0-9]|14:00))?"
+)
+_REGEX_MATCHES_XS_DURATION = re.compile(
+    r"-?P((([0-9]+Y([0-9]+M)?([0-9]+D)?|([0-9]+M)([0-9]+D)?|([0-9]+D))(T(([0-9]+H)([0-9]+M)?([0-9]+(\.[0-9]+)?S)?|([0-9]+M)([0-9]+(\.[0-9]+)?S)?|([0-9]+(\.[0-9]+)?S)))?)|(T(([0-9]+H)([0-9]+M)?([0-9]+(\.[0-9]+)?S)?|([0-9]+M)([0-9]+(\.[0-9]+)?S)?|([0-9]+(\.[0-9]+)?S))))"
+)
+
 validators = {
     DataTypeDefXsd.string: lambda _: True,
     DataTypeDefXsd.boolean: lambda x: x in {"true", "false", "1", "0"},
@@ -378,31 +400,14 @@ validators = {
     DataTypeDefXsd.date: is_xs_date,
     DataTypeDefXsd.dateTime: is_xs_date_time,
     DataTypeDefXsd.gMonthDay: is_xs_g_month_day,
-    DataTypeDefXsd.gYearMonth: lambda x: re.fullmatch(
-        r"-?([1-9][0-9]{3,}|0[0-9]{3})-(0[1-9]|1[0-2])(Z|(\+|-)((0[0-9]|1[0-3]):[0-5][0-9]|14:00))?",
-        x,
-    )
-    is not None,
-    DataTypeDefXsd.gDay: lambda x: re.fullmatch(
-        r"---(0[1-9]|[12][0-9]|3[01])(Z|(\+|-)((0[0-9]|1[0-3]):[0-5][0-9]|14:00))?", x
-    )
-    is not None,
-    DataTypeDefXsd.gMonth: lambda x: re.fullmatch(r"--(0[1-9]|1[0-2])(Z|(\+|-)((0[0-9]|1[0-3]):[0-5][0-9]|14:00))?", x)
-    is not None,
-    DataTypeDefXsd.gYear: lambda x: re.fullmatch(
-        r"-?([1-9][0-9]{3,}|0[0-9]{3})(Z|(\+|-)((0[0-9]|1[0-3]):[0-5][0-9]|14:00))?", x
-    )
-    is not None,
-    DataTypeDefXsd.time: lambda x: re.fullmatch(
-        r"(([01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9](\.[0-9]+)?|(24:00:00(\.0+)?))(Z|(\+|-)((0[0-9]|1[0-3]):[0-5][0-9]|14:00))?",
-        x,
-    )
-    is not None,
-    DataTypeDefXsd.duration: lambda x: re.fullmatch(
-        r"-?P((([0-9]+Y([0-9]+M)?([0-9]+D)?|([0-9]+M)([0-9]+D)?|([0-9]+D))(T(([0-9]+H)([0-9]+M)?([0-9]+(\.[0-9]+)?S)?|([0-9]+M)([0-9]+(\.[0-9]+)?S)?|([0-9]+(\.[0-9]+)?S)))?)|(T(([0-9]+H)([0-9]+M)?([0-9]+(\.[0-9]+)?S)?|([0-9]+M)([0-9]+(\.[0-9]+)?S)?|([0-9]+(\.[0-9]+)?S))))",
-        x,
-    )
-    is not None,
+    DataTypeDefXsd.gYearMonth: memoize("xs:gYearMonth")(
+        lambda x: _REGEX_MATCHES_XS_G_YEAR_MONTH.fullmatch(x) is not None
+    ),
+    DataTypeDefXsd.gDay: memoize("xs:gDay")(lambda x: _REGEX_MATCHES_XS_G_DAY.fullmatch(x) is not None),
+    DataTypeDefXsd.gMonth: memoize("xs:gMonth")(lambda x: _REGEX_MATCHES_XS_G_MONTH.fullmatch(x) is not None),
+    DataTypeDefXsd.gYear: memoize("xs:gYear")(lambda x: _REGEX_MATCHES_XS_G_YEAR.fullmatch(x) is not None),
+    DataTypeDefXsd.time: memoize("xs:time")(lambda x: _REGEX_MATCHES_XS_TIME.fullmatch(x) is not None),
+    DataTypeDefXsd.duration: memoize("xs:duration")(lambda x: _REGEX_MATCHES_XS_DURATION.fullmatch(x) is not None),
     DataTypeDefXsd.anyURI: is_any_uri,
     DataTypeDefXsd.base64Binary: is_base64_binary,
     DataTypeDefXsd.hexBinary: is_hex_binary,
@@ -411,3 +416,93 @@ validators = {
 
 def base64_urlsafe(s: str) -> str:
     return base64.urlsafe_b64encode(s.encode()).decode().strip("=")
+
+
+# Bulk validation: each function below takes all values of one type and returns True only if all of them are
+# accepted by the corresponding validator. On False, the values are validated one by one to find the invalid ones.
+
+
+def _all_bounded_integers(lower: int, upper: int) -> Callable[[List[str]], bool]:
+    def check(values: List[str]) -> bool:
+        # Accepts the same strings as _is_bounded_integer
+        try:
+            numbers = list(map(int, values))
+        except ValueError:
+            return False
+        return min(numbers) >= lower and max(numbers) <= upper
+
+    return check
+
+
+def _all_bounded_doubles(lower: float, upper: float) -> Callable[[List[str]], bool]:
+    def check(values: List[str]) -> bool:
+        # INF, -INF and NaN are left to _is_bounded_double, min and max are not reliable in presence of nan
+        try:
+            numbers = list(map(float, values))
+        except ValueError:
+            return False
+        if any(map(math.isnan, numbers)):
+            return False
+        return min(numbers) > lower and max(numbers) < upper
+
+    return check
+
+
+def _all_decimals(values: List[str]) -> bool:
+    try:
+        for i in values:
+            Decimal(i)
+    except DecimalException:
+        return False
+    return True
+
+
+def _all_matching(pattern: Pattern[str]) -> Callable[[List[str]], bool]:
+    # Values of these types repeat often, e.g. timestamps
+    return lambda values: all(map(pattern.fullmatch, set(values)))
+
+
+_BOOLEANS = frozenset(["true", "false", "1", "0"])
+
+_bulk_validators: Dict[DataTypeDefXsd, Callable[[List[str]], bool]] = {
+    DataTypeDefXsd.string: lambda _: True,
+    DataTypeDefXsd.boolean: _BOOLEANS.issuperset,
+    DataTypeDefXsd.decimal: _all_decimals,
+    DataTypeDefXsd.integer: _all_bounded_integers(float("-inf"), float("inf")),
+    DataTypeDefXsd.float: _all_bounded_doubles(-3.4028234663852886e38, 3.4028234663852886e38),
+    DataTypeDefXsd.double: _all_bounded_doubles(-1.7976931348623158e308, 1.7976931348623158e308),
+    DataTypeDefXsd.byte: _all_bounded_integers(-128, 127),
+    DataTypeDefXsd.short: _all_bounded_integers(-32768, 32767),
+    DataTypeDefXsd.int: _all_bounded_integers(-2147483648, 2147483647),
+    DataTypeDefXsd.long: _all_bounded_integers(-9223372036854775808, 9223372036854775807),
+    DataTypeDefXsd.unsignedByte: _all_bounded_integers(0, 255),
+    DataTypeDefXsd.unsignedShort: _all_bounded_integers(0, 65535),
+    DataTypeDefXsd.unsignedInt: _all_bounded_integers(0, 4294967295),
+    DataTypeDefXsd.unsignedLong: _all_bounded_integers(0, 18446744073709551615),
+    DataTypeDefXsd.positiveInteger: _all_bounded_integers(1, float("inf")),
+    DataTypeDefXsd.nonNegativeInteger: _all_bounded_integers(0, float("inf")),
+    DataTypeDefXsd.negativeInteger: _all_bounded_integers(float("-inf"), -1),
+    DataTypeDefXsd.nonPositiveInteger: _all_bounded_integers(float("-inf"), 0),
+    DataTypeDefXsd.gYearMonth: _all_matching(_REGEX_MATCHES_XS_G_YEAR_MONTH),
+    DataTypeDefXsd.gDay: _all_matching(_REGEX_MATCHES_XS_G_DAY),
+    DataTypeDefXsd.gMonth: _all_matching(_REGEX_MATCHES_XS_G_MONTH),
+    DataTypeDefXsd.gYear: _all_matching(_REGEX_MATCHES_XS_G_YEAR),
+    DataTypeDefXsd.time: _all_matching(_REGEX_MATCHES_XS_TIME),
+    DataTypeDefXsd.duration: _all_matching(_REGEX_MATCHES_XS_DURATION),
+}
+
+
+def find_invalid(value_type: DataTypeDefXsd, values: Iterable[str]) -> Set[str]:
+    """
+    Validates many values of the same type at once and returns the invalid ones.
+    The verdicts are the same as those of validators.
+    """
+    if not isinstance(values, list):
+        values = list(values)
+    if not values:
+        return set()
+    all_valid = _bulk_validators.get(value_type)
+    if all_valid is not None and all_valid(values):
+        return set()
+    validator = validators[value_type]
+    return {i for i in set(values) if not validator(i)}
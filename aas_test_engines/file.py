@@ -1,13 +1,22 @@
-from typing import List, Dict, TextIO, Union, Any, Set, Optional
+from typing import List, Dict, TextIO, Union, Any, Set, Optional, Iterable, Iterator, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
 import json
+import os
 
-from .result import AasTestResult, Level
+from .result import AasTestResult, Level, export_settings, apply_settings, limit_errors, budget_exhausted
 from .opc import Relationship, read_opc
+from .xml_backend import PARSE_ERRORS as XML_PARSE_ERRORS
 
 from xml.etree import ElementTree
 import zipfile
 
-from aas_test_engines.test_cases.v3_0 import json_to_obj, xml_to_obj
+from aas_test_engines.test_cases.v3_0 import (
+    json_to_result,
+    xml_to_result,
+    json_file_to_result,
+    xml_file_to_result,
+)
 from aas_test_engines.test_cases.v3_0.submodel_templates import supported_templates
 
 JSON = Union[str, int, float, bool, None, Dict[str, Any], List[Any]]
@@ -23,32 +32,59 @@ def latest_version():
     return _DEFAULT_VERSION
 
 
-def check_json_data(data: any, version: str = _DEFAULT_VERSION, model_type: str = "Environment") -> AasTestResult:
-    result, obj = json_to_obj(data, model_type)
-    return result
+def check_json_data(
+    data: any,
+    version: str = _DEFAULT_VERSION,
+    model_type: str = "Environment",
+    jobs: int = 1,
+    max_errors: Optional[int] = None,
+) -> AasTestResult:
+    return limit_errors(max_errors, lambda: json_to_result(data, model_type, jobs))
 
 
-def check_json_file(file: TextIO, version: str = _DEFAULT_VERSION, model_type: str = "Environment") -> AasTestResult:
+def check_json_file(
+    file: TextIO,
+    version: str = _DEFAULT_VERSION,
+    model_type: str = "Environment",
+    jobs: int = 1,
+    max_errors: Optional[int] = None,
+    json_decoder: Optional[str] = None,
+) -> AasTestResult:
+    """
+    Environments are streamed with bounded memory by default.
+    If json_decoder is given (e.g. 'orjson' or 'auto'), the file is decoded at once using that library instead.
+    """
     try:
-        data = json.load(file)
+        return limit_errors(max_errors, lambda: json_file_to_result(file, model_type, jobs, json_decoder))
     except json.decoder.JSONDecodeError as e:
         return AasTestResult(f"Invalid JSON: {e}", Level.ERROR)
-    return check_json_data(data, version, model_type)
 
 
 def check_xml_data(
-    data: ElementTree, version: str = _DEFAULT_VERSION, model_type: str = "Environment"
+    data: ElementTree,
+    version: str = _DEFAULT_VERSION,
+    model_type: str = "Environment",
+    jobs: int = 1,
+    max_errors: Optional[int] = None,
 ) -> AasTestResult:
-    result, obj = xml_to_obj(data, model_type)
-    return result
+    return limit_errors(max_errors, lambda: xml_to_result(data, model_type, jobs))
 
 
-def check_xml_file(file: TextIO, version: str = _DEFAULT_VERSION, model_type: str = "Environment") -> AasTestResult:
+def check_xml_file(
+    file: TextIO,
+    version: str = _DEFAULT_VERSION,
+    model_type: str = "Environment",
+    jobs: int = 1,
+    max_errors: Optional[int] = None,
+    xml_backend: Optional[str] = None,
+) -> AasTestResult:
+    """
+    The file is parsed using the standard library by default, xml_backend may select 'lxml' or 'auto' instead.
+    """
     try:
-        data = ElementTree.fromstring(file.read())
-    except ElementTree.ParseError as e:
+        return limit_errors(max_errors, lambda: xml_file_to_result(file, model_type, jobs, xml_backend))
+    except XML_PARSE_ERRORS as e:
         return AasTestResult(f"Invalid xml: {e}", Level.ERROR)
-    return check_xml_data(data, version)
 
 
 TYPE_AASX_ORIGIN = "http://admin-shell.io/aasx/relationships/aasx-origin"
@@ -62,7 +98,14 @@ DEPRECATED_TYPES = {
 TYPE_THUMBNAIL = "http://schemas.openxmlformats.org/package/2006/relationships/metadata/thumbnail"
 
 
-def _check_files(zipfile: zipfile.ZipFile, root_rel: Relationship, version: str) -> AasTestResult:
+def _check_files(
+    zipfile: zipfile.ZipFile,
+    root_rel: Relationship,
+    version: str,
+    jobs: int,
+    json_decoder: Optional[str],
+    xml_backend: Optional[str],
+) -> AasTestResult:
     result = AasTestResult("Checking files")
     origin_rels = root_rel.sub_rels_by_type(TYPE_AASX_ORIGIN)
     if len(origin_rels) != 1:
@@ -73,17 +116,21 @@ def _check_files(zipfile: zipfile.ZipFile, root_rel: Relationship, version: str)
             )
         )
     for aasx_origin in origin_rels:
+        if budget_exhausted():
+            break
         spec_rels = aasx_origin.sub_rels_by_type(TYPE_AASX_SPEC)
         if not spec_rels:
             result.append(AasTestResult("No aas spec found", level=Level.WARNING))
         for aasx_spec in spec_rels:
+            if budget_exhausted():
+                break
             sub_result = AasTestResult(f"Checking {aasx_spec.target}")
             try:
                 with zipfile.open(aasx_spec.target) as f:
                     if aasx_spec.target.endswith(".xml"):
-                        r = check_xml_file(f, version)
+                        r = check_xml_file(f, version, jobs=jobs, xml_backend=xml_backend)
                     elif aasx_spec.target.endswith(".json"):
-                        r = check_json_file(f, version)
+                        r = check_json_file(f, version, jobs=jobs, json_decoder=json_decoder)
                     else:
                         r = AasTestResult("Unknown filetype", Level.WARNING)
                     sub_result.append(r)
@@ -93,24 +140,127 @@ def _check_files(zipfile: zipfile.ZipFile, root_rel: Relationship, version: str)
     return result
 
 
-def check_aasx_data(zipfile: zipfile.ZipFile, version: str = _DEFAULT_VERSION) -> AasTestResult:
+def check_aasx_data(
+    zipfile: zipfile.ZipFile,
+    version: str = _DEFAULT_VERSION,
+    jobs: int = 1,
+    max_errors: Optional[int] = None,
+    json_decoder: Optional[str] = None,
+    xml_backend: Optional[str] = None,
+) -> AasTestResult:
+    return limit_errors(max_errors, lambda: _check_aasx_data(zipfile, version, jobs, json_decoder, xml_backend))
 
+
+def _check_aasx_data(
+    zipfile: zipfile.ZipFile, version: str, jobs: int, json_decoder: Optional[str], xml_backend: Optional[str]
+) -> AasTestResult:
     result = AasTestResult("Checking AASX package")
     root_rel = Relationship("ROOT", "/")
     read_opc(zipfile, root_rel, result, DEPRECATED_TYPES)
     if not result.ok():
         return result
-    result.append(_check_files(zipfile, root_rel, version))
+    result.append(_check_files(zipfile, root_rel, version, jobs, json_decoder, xml_backend))
     if not result.ok():
         return result
 
     return result
 
 
-def check_aasx_file(file: TextIO, version: str = _DEFAULT_VERSION) -> AasTestResult:
+def check_aasx_file(
+    file: TextIO,
+    version: str = _DEFAULT_VERSION,
+    jobs: int = 1,
+    max_errors: Optional[int] = None,
+    json_decoder: Optional[str] = None,
+    xml_backend: Optional[str] = None,
+) -> AasTestResult:
     try:
         zip = zipfile.ZipFile(file)
     except zipfile.BadZipFile as e:
         return AasTestResult(f"Cannot read: {e}", level=Level.ERROR)
 
-    return check_aasx_data(zip, version)
+    return check_aasx_data(zip, version, jobs, max_errors, json_decoder, xml_backend)
+
+
+_FORMATS_BY_EXTENSION = {
+    ".aasx": "aasx",
+    ".json": "json",
+    ".xml": "xml",
+}
+
+
+def format_of(path: str, default: str = "aasx") -> str:
+    """Derives the format of a file from its extension"""
+    return _FORMATS_BY_EXTENSION.get(os.path.splitext(path)[1].lower(), default)
+
+
+def check_file(
+    path: str,
+    version: str = _DEFAULT_VERSION,
+    format: Optional[str] = None,
+    model_type: str = "Environment",
+    jobs: int = 1,
+    max_errors: Optional[int] = None,
+    json_decoder: Optional[str] = None,
+    xml_backend: Optional[str] = None,
+) -> AasTestResult:
+    if format is None:
+        format = format_of(path)
+    if format not in _FORMATS_BY_EXTENSION.values():
+        raise ValueError(f"Invalid format {format}")
+    try:
+        with open(path, "rb") as f:
+            if format == "aasx":
+                return check_aasx_file(f, version, jobs, max_errors, json_decoder, xml_backend)
+            elif format == "json":
+                return check_json_file(f, version, model_type, jobs, max_errors, json_decoder)
+            else:
+                return check_xml_file(f, version, model_type, jobs, max_errors, xml_backend)
+    except OSError as e:
+        return AasTestResult(f"Cannot read: {e}", level=Level.ERROR)
+    except Exception as e:
+        # A single file must not abort a batch, see check_files
+        return AasTestResult(f"Internal error: {e}", Level.CRITICAL)
+
+
+def _result_of(future: Future) -> AasTestResult:
+    try:
+        return future.result()
+    except Exception as e:
+        # E.g. a worker process died or the result could not be transferred
+        return AasTestResult(f"Internal error: {e}", Level.CRITICAL)
+
+
+def check_files(
+    paths: Iterable[str],
+    version: str = _DEFAULT_VERSION,
+    format: Optional[str] = None,
+    model_type: str = "Environment",
+    jobs: int = 1,
+    max_errors: Optional[int] = None,
+    json_decoder: Optional[str] = None,
+    xml_backend: Optional[str] = None,
+) -> Iterator[Tuple[str, AasTestResult]]:
+    """
+    Checks many files and yields their results in the order of paths as soon as they are available.
+    With jobs > 1 the files are distributed to a pool of worker processes, which is reused for all files.
+    """
+    if jobs <= 1:
+        for path in paths:
+            yield path, check_file(path, version, format, model_type, 1, max_errors, json_decoder, xml_backend)
+        return
+    # Limit the number of pending files to keep memory bounded
+    max_pending = 2 * jobs
+    pending = deque()
+    with ProcessPoolExecutor(jobs, initializer=apply_settings, initargs=(export_settings(),)) as executor:
+        for path in paths:
+            future = executor.submit(
+                check_file, path, version, format, model_type, 1, max_errors, json_decoder, xml_backend
+            )
+            pending.append((path, future))
+            while len(pending) > max_pending:
+                path, future = pending.popleft()
+                yield path, _result_of(future)
+        while pending:
+            path, future = pending.popleft()
+            yield path, _result_of(future)
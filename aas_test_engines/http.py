@@ -1,6 +1,8 @@
-from typing import Tuple, Optional, List, Dict
+from typing import Tuple, Optional, List, Dict, Union
 import requests
+from requests.adapters import HTTPAdapter
 from requests.models import Response
+from http.cookiejar import DefaultCookiePolicy
 from dataclasses import dataclass, field
 from urllib.parse import urlencode
 import json
@@ -33,22 +35,67 @@ class Request:
             print(f"  BODY: {b}")
 
 
+Timeout = Union[None, float, Tuple[float, float]]
+
+
+def _create_session(pool_size: int, keep_alive: bool) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Do not carry cookies from one request over to the next, each request must be independent
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
 class HttpClient:
+    """
+    Sends requests to a server.
+    Connections are pooled in a session which is shared with all clients created by descend().
+    The timeout is given in seconds, either as a single value or as (connect timeout, read timeout).
+    """
 
     def __init__(
-        self, host: str, verify: bool = False, remove_path_prefix: str = "", additional_headers: Dict[str, str] = {}
+        self,
+        host: str,
+        verify: bool = False,
+        remove_path_prefix: str = "",
+        additional_headers: Dict[str, str] = {},
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        timeout: Timeout = None,
+        session: Optional[requests.Session] = None,
     ):
         self.host = host
         self.verify = verify
         self.remove_path_prefix = remove_path_prefix
         self.prefixes: List[str] = []
         self.additional_headers = additional_headers
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.session = session or _create_session(pool_size, keep_alive)
 
     def descend(self, prefix: str):
-        result = HttpClient(self.host, self.verify, self.remove_path_prefix, self.additional_headers)
+        result = HttpClient(
+            self.host,
+            self.verify,
+            self.remove_path_prefix,
+            self.additional_headers,
+            self.pool_size,
+            self.keep_alive,
+            self.timeout,
+            self.session,
+        )
         result.prefixes.append(prefix)
         return result
 
+    def close(self):
+        """Closes all pooled connections, including those of descendants"""
+        self.session.close()
+
     def send(self, request: Request) -> Response:
         if request.body is None:
             body = None
@@ -66,10 +113,11 @@ class HttpClient:
         ):
             url = url[len(self.remove_path_prefix) :]
 
-        return requests.request(
+        return self.session.request(
             url=host + url,
             method=request.method,
             data=body,
             headers=request.headers,
             verify=self.verify,
+            timeout=self.timeout,
         )
@@ -0,0 +1,77 @@
+"""
+Decoding of JSON documents, using the standard library unless a faster library is selected explicitly.
+orjson is faster, but rejects NaN and numbers out of the range of a double and decodes integers wider than
+64 bit as floats. All decoders raise json.JSONDecodeError (or a subclass of it) on invalid input.
+"""
+
+from typing import Callable, Dict, IO, List, Optional, Union
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def _orjson_loads(data: Union[str, bytes]) -> any:
+    # Unlike the standard library, orjson does not skip a byte order mark
+    if isinstance(data, bytes) and data.startswith(_UTF8_BOM):
+        data = data[len(_UTF8_BOM) :]
+    elif isinstance(data, str) and data.startswith("\ufeff"):
+        data = data[1:]
+    return orjson.loads(data)
+
+
+def _json_loads(data: Union[str, bytes]) -> any:
+    if isinstance(data, str) and data.startswith("\ufeff"):
+        data = data[1:]
+    try:
+        return json.loads(data)
+    except UnicodeDecodeError as e:
+        raise json.JSONDecodeError(f"Cannot decode {e.encoding}: {e.reason}", "", e.start)
+
+
+# Ordered from fastest to slowest
+_decoders: Dict[str, Callable[[Union[str, bytes]], any]] = {}
+if orjson is not None:
+    _decoders["orjson"] = _orjson_loads
+_decoders["json"] = _json_loads
+
+_default = "json"
+
+
+def available_decoders() -> List[str]:
+    """Returns the names of the installed decoders, fastest first"""
+    return list(_decoders)
+
+
+def set_decoder(name: str):
+    """Sets the decoder used if none is given explicitly (initially 'json'), 'auto' selects the fastest one installed"""
+    _resolve(name)
+    global _default
+    _default = name
+
+
+def get_decoder() -> str:
+    return _default
+
+
+def _resolve(name: Optional[str]) -> Callable[[Union[str, bytes]], any]:
+    if name is None:
+        name = _default
+    if name == "auto":
+        return next(iter(_decoders.values()))
+    try:
+        return _decoders[name]
+    except KeyError:
+        raise ValueError(f"Unknown JSON decoder '{name}', must be one of auto, {', '.join(_decoders)}")
+
+
+def loads(data: Union[str, bytes], decoder: Optional[str] = None) -> any:
+    return _resolve(decoder)(data)
+
+
+def load(file: IO, decoder: Optional[str] = None) -> any:
+    return _resolve(decoder)(file.read())
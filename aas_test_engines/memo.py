@@ -0,0 +1,75 @@
+"""
+Bounded caches for checks whose outcome depends on their arguments only.
+Real documents repeat the same values over and over (language tags, semantic ids, timestamps), so checks with costly
+regular expressions are cached by their arguments. Each cache keeps the most recently used entries only.
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict, NamedTuple, Optional
+
+DEFAULT_CACHE_SIZE = 4096
+
+_cache_size: Optional[int] = DEFAULT_CACHE_SIZE
+_memos: Dict[str, "Memo"] = {}
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+class Memo:
+    """Calls fn through a cache which can be resized and inspected"""
+
+    __slots__ = ("name", "fn", "cached")
+
+    def __init__(self, name: str, fn: Callable):
+        self.name = name
+        self.fn = fn
+        self.cached = lru_cache(maxsize=_cache_size)(fn)
+
+    def __call__(self, *args):
+        return self.cached(*args)
+
+    def __repr__(self) -> str:
+        return f"Memo({self.name})"
+
+
+def memoize(name: str) -> Callable[[Callable], Memo]:
+    def decorator(fn: Callable) -> Memo:
+        if name in _memos:
+            raise ValueError(f"Cache {name} already exists")
+        memo = _memos[name] = Memo(name, fn)
+        return memo
+
+    return decorator
+
+
+def set_cache_size(size: Optional[int]):
+    """Sets the number of entries of each cache, None means unbounded and 0 disables caching. Clears all caches."""
+    if size is not None and size < 0:
+        raise ValueError("Cache size must not be negative")
+    global _cache_size
+    _cache_size = size
+    for memo in _memos.values():
+        memo.cached = lru_cache(maxsize=size)(memo.fn)
+
+
+def get_cache_size() -> Optional[int]:
+    return _cache_size
+
+
+def clear_caches():
+    for memo in _memos.values():
+        memo.cached.cache_clear()
+
+
+def cache_stats() -> Dict[str, CacheStats]:
+    return {name: CacheStats(*memo.cached.cache_info()) for name, memo in _memos.items()}
@@ -1,5 +1,5 @@
 from typing import List, Set, Optional, Tuple, Dict
-from .result import AasTestResult, Level
+from .result import AasTestResult, Level, enabled
 import zipfile
 from xml.etree import ElementTree
 
@@ -133,10 +133,12 @@ def _scan_relationships(
 
         sub_dir, file = splitpath(target)
         sub_rel = Relationship(type, target)
-        result.append(AasTestResult(f"Relationship {sub_rel.target} is of type {sub_rel.type}", Level.INFO))
+        if enabled(Level.INFO):
+            result.append(AasTestResult(f"Relationship {sub_rel.target} is of type {sub_rel.type}", Level.INFO))
         parent_rel.sub_rels.append(sub_rel)
         if target in visited_targets:
-            result.append(AasTestResult(f"Already checked {target}", Level.INFO))
+            if enabled(Level.INFO):
+                result.append(AasTestResult(f"Already checked {target}", Level.INFO))
             continue
         visited_targets.add(target)
         if target not in zipfile.namelist():
@@ -13,7 +13,9 @@ from enum import Enum
 from dataclasses import is_dataclass, fields
 import re
 import inspect
+import threading
 from aas_test_engines.data_types import base64_urlsafe
+from aas_test_engines.memo import memoize
 
 
 def abstract(cls):
@@ -26,6 +28,37 @@ def is_abstract(cls):
     return hasattr(cls, f"_{cls}_abstract")
 
 
+def slotted(cls):
+    """
+    Returns a copy of the dataclass cls storing its fields in __slots__ instead of a per instance __dict__,
+    i.e. dataclass(slots=True) for Python versions before 3.10.
+    Instances have no __dict__ only if all bases define __slots__, so mixins and abstract classes declare
+    __slots__ = () and the fields they define are stored by the slotted classes deriving from them.
+    As with dataclass(slots=True), methods of cls cannot use super() without arguments.
+    """
+    assert is_dataclass(cls)
+    inherited = set()
+    for base in cls.__mro__[1:]:
+        inherited.update(base.__dict__.get("__slots__", ()))
+    slots = tuple(field.name for field in fields(cls) if field.name not in inherited)
+    namespace = dict(cls.__dict__)
+    # Defaults are kept by the dataclass fields, as class attributes they would conflict with the slots
+    for name in slots:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = slots
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted_cls.__qualname__ = cls.__qualname__
+    # The original class remains a subclass of the bases until it is garbage collected
+    setattr(cls, "_superseded", True)
+    return slotted_cls
+
+
+def is_superseded(cls):
+    return "_superseded" in cls.__dict__
+
+
 def _unwrap_optional(cls) -> Tuple[bool, type]:
     try:
         origin = cls.__origin__
@@ -52,12 +85,31 @@ def _unwrap_forward_ref(cls, globals, locals) -> Tuple[type]:
         return cls
 
 
+# Constraint AASd-130: An attribute with data type "string" shall be restricted to the characters as defined in
+# XML Schema 1.0, i.e. the string shall consist of these characters only: ^[\x09\x0A\x0D\x20-\uD7FF\uE000-
+# \uFFFD\u00010000-\u0010FFFF]*$.
+_XML_CHARACTERS = re.compile(r"[\x09\x0a\x0d\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]*")
+
+
+def _is_xml_serializable(s: str) -> bool:
+    # Printable ASCII characters are allowed, which covers most strings without running the regular expression
+    if s.isascii() and s.isprintable():
+        return True
+    return _XML_CHARACTERS.fullmatch(s) is not None
+
+
 class StringFormattedValue:
     min_length: Optional[int] = None
     max_length: Optional[int] = None
     pattern: Optional[Pattern] = None
     base64: bool = False
 
+    _compiled_pattern: Optional[Pattern] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._compiled_pattern = re.compile(cls.pattern) if cls.pattern else None
+
     def __init__(self, raw_value: str):
         self.raw_value = raw_value
         if self.min_length is not None:
@@ -67,20 +119,11 @@ class StringFormattedValue:
             if len(raw_value) > self.max_length:
                 raise ValueError(f"String is longer than {self.max_length} characters")
 
-        # Constraint AASd-130: An attribute with data type "string" shall be restricted to the characters as defined in
-        # XML Schema 1.0, i.e. the string shall consist of these characters only: ^[\x09\x0A\x0D\x20-\uD7FF\uE000-
-        # \uFFFD\u00010000-\u0010FFFF]*$.
-        if (
-            re.fullmatch(
-                r"[\x09\x0a\x0d\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]*",
-                raw_value,
-            )
-            is None
-        ):
+        if not _is_xml_serializable(raw_value):
             raise ValueError("Constraint AASd-130 violated: String is not XML serializable")
 
-        if self.pattern:
-            if re.fullmatch(self.pattern, raw_value) is None:
+        if self._compiled_pattern is not None:
+            if self._compiled_pattern.fullmatch(raw_value) is None:
                 raise ValueError(f"String '{raw_value}' does not match pattern {self.pattern}")
 
     def __eq__(self, other: "StringFormattedValue") -> bool:
@@ -205,12 +248,27 @@ class ListType(TypeBase):
         self.allow_empty = allow_empty
 
 
+@memoize("StringFormattedValue")
+def _check_string_formatted_value(cls, raw_value: str) -> Optional[str]:
+    try:
+        cls(raw_value)
+    except ValueError as e:
+        return str(e)
+    return None
+
+
 class StringFormattedValueType(TypeBase):
     def __init__(self, cls):
         self.cls: StringFormattedValue = cls
 
     def construct(self, args):
-        return self.cls(args)
+        # Subclasses only add checks to __init__, so once a value has been checked it can be constructed right away
+        error = _check_string_formatted_value(self.cls, args)
+        if error is not None:
+            raise ValueError(error)
+        value = self.cls.__new__(self.cls)
+        value.raw_value = args
+        return value
 
 
 class UnresolvedType(TypeBase):
@@ -221,6 +279,8 @@ class UnresolvedType(TypeBase):
 
 def _collect_subclasses(cls):
     for i in cls.__subclasses__():
+        if is_superseded(i):
+            continue
         if not is_abstract(i):
             yield i
         yield from _collect_subclasses(i)
@@ -246,25 +306,68 @@ class SymbolTable:
         else:
             raise ValueError(f"{type_name} is ambiguous")
 
-    def _resolve(self):
-        for name, symbol in self.symbols.items():
+
+class _ReflectionCache:
+    """
+    Process wide cache of all reflected types, keyed by the reflected class.
+    Each class is reflected only once, i.e. the subclasses of a class must be defined before it is reflected.
+    """
+
+    def __init__(self):
+        self.types: Dict[any, TypeBase] = {}
+        # Classes whose reflection refers to the reflection of other classes
+        self.dependencies: Dict[any, List[any]] = {}
+        # Classes reflected by the current call, which are not resolved yet
+        self.pending: List[any] = []
+        self.lock = threading.Lock()
+
+    def resolve(self):
+        for cls in self.pending:
+            symbol = self.types[cls]
             if isinstance(symbol, ClassType):
+                dependencies = [field.type.ref_cls for field in symbol.attrs]
+                dependencies += [sc.ref_cls for sc in symbol.subclasses]
                 for field in symbol.attrs:
-                    assert isinstance(field.type, UnresolvedType)
-                    field.type = self.symbols[str(field.type.ref_cls)]
-                symbol.subclasses = [self.symbols[str(sc.ref_cls)] for sc in symbol.subclasses]
+                    field.type = self.types[field.type.ref_cls]
+                symbol.subclasses = [self.types[sc.ref_cls] for sc in symbol.subclasses]
             elif isinstance(symbol, ListType):
-                assert isinstance(symbol.item_type, UnresolvedType)
-                symbol.item_type = self.symbols[str(symbol.item_type.ref_cls)]
-
-
-def _reflect_list(item_cls, globals, locals, symbol_table: SymbolTable, allow_empty: bool) -> ClassType:
+                dependencies = [symbol.item_type.ref_cls]
+                symbol.item_type = self.types[symbol.item_type.ref_cls]
+            else:
+                continue
+            self.dependencies[cls] = dependencies
+        self.pending.clear()
+
+    def rollback(self):
+        for cls in self.pending:
+            del self.types[cls]
+        self.pending.clear()
+
+    def symbol_table(self, cls) -> SymbolTable:
+        """Returns a symbol table with cls and all classes reachable from it"""
+        symbol_table = SymbolTable()
+        visited = set()
+        stack = [cls]
+        while stack:
+            cls = stack.pop()
+            if cls in visited:
+                continue
+            visited.add(cls)
+            symbol_table.symbols[str(cls)] = self.types[cls]
+            stack.extend(self.dependencies.get(cls, ()))
+        return symbol_table
+
+
+_reflection_cache = _ReflectionCache()
+
+
+def _reflect_list(item_cls, globals, locals, cache: _ReflectionCache, allow_empty: bool) -> ClassType:
     item_cls = _unwrap_forward_ref(item_cls, globals, locals)
-    _reflect(item_cls, globals, locals, symbol_table)
+    _reflect(item_cls, globals, locals, cache)
     return ListType(UnresolvedType(item_cls), allow_empty)
 
 
-def _reflect_class(cls, globals, locals, symbol_table: SymbolTable) -> ClassType:
+def _reflect_class(cls, globals, locals, cache: _ReflectionCache) -> ClassType:
     assert is_dataclass(cls)
     attrs: List[ClassType.Attribute] = []
     static_attrs: Dict[str, any] = {}
@@ -278,37 +381,50 @@ def _reflect_class(cls, globals, locals, symbol_table: SymbolTable) -> ClassType
             pass
         force_name = field.metadata.get("force_name", None)
         field_type = _unwrap_forward_ref(field_type, globals, locals)
+        field_type = _resolve_item_forward_ref(field_type, globals, locals)
         attrs.append(ClassType.Attribute(field.name, UnresolvedType(field_type), required, force_name))
-        _reflect(field_type, globals, locals, symbol_table)
+        _reflect(field_type, globals, locals, cache)
 
     subclasses: List[TypeBase] = []
     for subclass in _collect_subclasses(cls):
         subclasses.append(UnresolvedType(subclass))
-        _reflect(subclass, globals, locals, symbol_table)
+        _reflect(subclass, globals, locals, cache)
     return ClassType(cls, attrs, static_attrs, subclasses)
 
 
-def _reflect(cls: any, globals, locals, symbol_table: SymbolTable) -> Tuple[TypeBase, SymbolTable]:
-    key = str(cls)
+def _resolve_item_forward_ref(cls, globals, locals):
+    # The cache is process wide, so List["Foo"] must not be cached by the name of Foo
+    origin = getattr(cls, "__origin__", None)
+    if origin is list or origin is NonEmptyList:
+        item_cls = cls.__args__[0]
+        if isinstance(item_cls, ForwardRef):
+            item_cls = _unwrap_forward_ref(item_cls, globals, locals)
+            return List[item_cls] if origin is list else NonEmptyList[item_cls]
+    return cls
+
+
+def _reflect(cls: any, globals, locals, cache: _ReflectionCache) -> TypeBase:
+    cls = _resolve_item_forward_ref(cls, globals, locals)
     try:
-        return symbol_table.symbols[key]
+        return cache.types[cls]
     except KeyError:
         # Avoid infinite recursion if _reflect_unsafe calls itself again
-        symbol_table.symbols[key] = None
-        result = _reflect_unsafe(cls, globals, locals, symbol_table)
-        symbol_table.symbols[key] = result
+        cache.types[cls] = None
+        cache.pending.append(cls)
+        result = _reflect_unsafe(cls, globals, locals, cache)
+        cache.types[cls] = result
         return result
 
 
-def _reflect_unsafe(cls: any, globals, locals, symbol_table: SymbolTable) -> Tuple[TypeBase, SymbolTable]:
+def _reflect_unsafe(cls: any, globals, locals, cache: _ReflectionCache) -> TypeBase:
     origin = getattr(cls, "__origin__", None)
     if origin:
         if origin is list:
             item_type = cls.__args__[0]
-            return _reflect_list(item_type, globals, locals, symbol_table, True)
+            return _reflect_list(item_type, globals, locals, cache, True)
         elif origin is NonEmptyList:
             item_type = cls.__args__[0]
-            return _reflect_list(item_type, globals, locals, symbol_table, False)
+            return _reflect_list(item_type, globals, locals, cache, False)
     else:
         if cls is None:
             return NoneType()
@@ -329,7 +445,7 @@ def _reflect_unsafe(cls: any, globals, locals, symbol_table: SymbolTable) -> Tup
         elif inspect.isclass(cls):
             if not is_dataclass(cls):
                 raise Exception(f"Classes must be dataclasses, but {cls} is not. Maybe you forgot to add @dataclass?")
-            return _reflect_class(cls, globals, locals, symbol_table)
+            return _reflect_class(cls, globals, locals, cache)
 
     raise NotImplementedError(
         f"There is no reflection implemented for:\n"
@@ -340,21 +456,36 @@ def _reflect_unsafe(cls: any, globals, locals, symbol_table: SymbolTable) -> Tup
 
 
 def reflect(cls: any, globals={}, locals={}) -> Tuple[TypeBase, SymbolTable]:
-    symbol_table = SymbolTable()
-    type = _reflect(cls, globals, locals, symbol_table)
-    symbol_table._resolve()
-    return type, symbol_table
+    """
+    Returns the reflection of cls and a symbol table with all types reachable from it.
+    Reflections are cached, so reflecting a class again or a class sharing types with an already reflected one
+    only looks up the cached types.
+    """
+    with _reflection_cache.lock:
+        try:
+            cls = _resolve_item_forward_ref(cls, globals, locals)
+            type = _reflect(cls, globals, locals, _reflection_cache)
+        except BaseException:
+            _reflection_cache.rollback()
+            raise
+        _reflection_cache.resolve()
+        return type, _reflection_cache.symbol_table(cls)
 
 
 def reflect_function(fn: callable, globals={}, locals={}) -> FunctionType:
-    symbol_table = SymbolTable()
-    return_type = fn.__annotations__.get("return", None)
-    r_return_type = _reflect(return_type, globals, locals, symbol_table)
-    args: List[FunctionType.Argument] = []
-    for key, value in fn.__annotations__.items():
-        if key in ["return"]:
-            continue
-        required, arg_type = _unwrap_optional(value)
-        r_arg_type = _reflect(arg_type, globals, locals, symbol_table)
-        args.append(FunctionType.Argument(key, r_arg_type, required))
+    with _reflection_cache.lock:
+        try:
+            return_type = fn.__annotations__.get("return", None)
+            r_return_type = _reflect(return_type, globals, locals, _reflection_cache)
+            args: List[FunctionType.Argument] = []
+            for key, value in fn.__annotations__.items():
+                if key in ["return"]:
+                    continue
+                required, arg_type = _unwrap_optional(value)
+                r_arg_type = _reflect(arg_type, globals, locals, _reflection_cache)
+                args.append(FunctionType.Argument(key, r_arg_type, required))
+        except BaseException:
+            _reflection_cache.rollback()
+            raise
+        _reflection_cache.resolve()
     return FunctionType(fn, r_return_type, args)
@@ -1,6 +1,11 @@
-from typing import List, TypeVar, Union
+from typing import List, TypeVar, Union, Tuple, TextIO, Iterator, Sequence, Dict, Optional, Callable
+from contextvars import ContextVar, copy_context
 from enum import Enum
+from functools import lru_cache
 import os
+import io
+import sys
+import re
 import html
 
 T = TypeVar("T")
@@ -28,18 +33,110 @@ class Level(Enum):
         return "\033[94m"
 
 
+_HTML_CLASSES = {
+    Level.INFO: "info",
+    Level.WARNING: "warning",
+    Level.ERROR: "error",
+    Level.CRITICAL: "critical",
+}
+
+_HTML_CHUNK_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=None)
+def _html_template() -> Tuple[str, str]:
+    with open(os.path.join(script_dir, "data", "template.html"), "r") as f:
+        content = f.read()
+    head, _, tail = content.partition("<!-- CONTENT -->")
+    return head, tail
+
+
+class ErrorBudget:
+    """Number of errors which may still be reported before checks stop early, see limit_errors"""
+
+    __slots__ = ("remaining", "skipped")
+
+    def __init__(self, max_errors: int):
+        self.remaining = max_errors
+        # Whether a check was actually skipped, reaching max_errors with the last check is no truncation
+        self.skipped = False
+
+
+# ContextVar is subscriptable only from Python 3.9 on, hence the quoted annotations
+_error_budget: "ContextVar[Optional[ErrorBudget]]" = ContextVar("error_budget", default=None)
+
+# Maximum number of examples kept per group of repeated findings, None disables grouping, see set_aggregation
+_max_examples: "ContextVar[Optional[int]]" = ContextVar("max_examples", default=None)
+
+# Quoted literals and numbers, which vary between repetitions of the same finding.
+# Numbers within words like AASd-117 are kept, so the constraint id is part of the template.
+_TEMPLATE_LITERALS = re.compile(r"'[^']*'|\"[^\"]*\"|(?<![\w-])\d+(?![\w-])")
+
+
+def _template_of(message: str) -> str:
+    """Returns the message of a finding without its paths and with literals masked"""
+    # Paths are appended with " @ ", e.g. the IdShortPath followed by the path within the document
+    message = message.split(" @ ", 1)[0]
+    return _TEMPLATE_LITERALS.sub(lambda m: "'*'" if m.group(0)[0] in "'\"" else "*", message)
+
+
 class AasTestResult:
+    # Results are created by the million when checking large files, hence the compact layout:
+    # no instance dict and leaves share an empty tuple
+    __slots__ = ("message", "level", "sub_results", "_groups")
 
     def __init__(self, message: str, level=Level.INFO):
         assert isinstance(level, Level)
         self.message = message
         self.level = level
-        self.sub_results: List[AasTestResult] = []
+        self.sub_results: Sequence[AasTestResult] = ()
+        if level.value >= Level.ERROR.value:
+            # Errors are counted on creation, so results moved between parents are not counted twice
+            budget = _error_budget.get()
+            if budget is not None:
+                budget.remaining -= 1
 
     def append(self, result: "AasTestResult"):
-        self.sub_results.append(result)
+        if result.level.value >= Level.WARNING.value and (
+            not result.sub_results or isinstance(result, AasTestResultGroup)
+        ):
+            max_examples = _max_examples.get()
+            if max_examples is not None:
+                self._aggregate(result, max_examples)
+                return
+        if self.sub_results:
+            self.sub_results.append(result)
+        else:
+            self.sub_results = [result]
         self.level = self.level | result.level
 
+    def _aggregate(self, result: "AasTestResult", max_examples: int):
+        if isinstance(result, AasTestResultGroup):
+            key = (result.template, result.level)
+        else:
+            key = (_template_of(result.message), result.level)
+        try:
+            groups: Dict[Tuple[str, Level], int] = self._groups
+        except AttributeError:
+            groups = self._groups = {}
+        try:
+            idx = groups[key]
+        except KeyError:
+            # First occurrence, appended as is
+            groups[key] = len(self.sub_results)
+            if self.sub_results:
+                self.sub_results.append(result)
+            else:
+                self.sub_results = [result]
+            self.level = self.level | result.level
+            return
+        group = self.sub_results[idx]
+        if not isinstance(group, AasTestResultGroup):
+            group = AasTestResultGroup(key[0], key[1])
+            group.add(self.sub_results[idx], max_examples)
+            self.sub_results[idx] = group
+        group.add(result, max_examples)
+
     def ok(self) -> bool:
         return self.level == Level.INFO or self.level == Level.WARNING
 
@@ -54,39 +151,55 @@ class AasTestResult:
         for sub_result in self.sub_results:
             yield from sub_result.to_lines(indent + 1)
 
-    def _to_html(self, level: int) -> str:
-        cls = {
-            Level.INFO: "info",
-            Level.WARNING: "warning",
-            Level.ERROR: "error",
-            Level.CRITICAL: "critical",
-        }[self.level]
-        s = "<div>\n"
-        msg = html.escape(self.message)
-        if self.sub_results:
-            c = "" if self.ok() else "caret-down"
-            s += f'<div class="{cls}">{msg}<span class="caret level-{level} {c}"/></div>\n'
-            c = "" if self.ok() else "visible"
-            s += f'<div class="sub-results {c}">\n'
-            for sub_result in self.sub_results:
-                s += sub_result._to_html(level + 1)
-            s += "</div>\n"
-        else:
-            s += f'<div class="{cls}">{msg}</div>\n'
-        s += "</div>\n"
-        return s
+    def _iter_html(self) -> Iterator[str]:
+        # Iterative traversal, so deeply nested results do not hit the recursion limit
+        stack: List[Union[AasTestResult, str, Tuple[AasTestResult, int]]] = [(self, 0)]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                yield item
+                continue
+            result, level = item
+            cls = _HTML_CLASSES[result.level]
+            msg = html.escape(result.message)
+            if result.sub_results:
+                c = "" if result.ok() else "caret-down"
+                yield f'<div>\n<div class="{cls}">{msg}<span class="caret level-{level} {c}"/></div>\n'
+                c = "" if result.ok() else "visible"
+                yield f'<div class="sub-results {c}">\n'
+                stack.append("</div>\n</div>\n")
+                stack.extend((i, level + 1) for i in reversed(result.sub_results))
+            else:
+                yield f'<div>\n<div class="{cls}">{msg}</div>\n</div>\n'
+
+    def write_html(self, file: TextIO):
+        """Writes an interactive view of the result as HTML to a file-like object.
+        The report is written in chunks while traversing the result, so it never has to be held in memory:
+            with open("result.html", "w") as file:
+                self.result.write_html(file)
+        Then open result.html in your browser.
+        """
+        head, tail = _html_template()
+        file.write(head)
+        chunk = []
+        size = 0
+        for part in self._iter_html():
+            chunk.append(part)
+            size += len(part)
+            if size >= _HTML_CHUNK_SIZE:
+                file.write("".join(chunk))
+                chunk.clear()
+                size = 0
+        file.write("".join(chunk))
+        file.write(tail)
 
     def to_html(self) -> str:
         """Generates an interactive view of the result as HTML.
-        You should write the result into a file:
-            content = self.result.to_html()
-            with open("result.html", "w") as file:
-                file.write(content)
-        Then open result.html in your browser.
+        Prefer write_html for large results, which does not build the whole report in memory.
         """
-        with open(os.path.join(script_dir, "data", "template.html"), "r") as f:
-            content = f.read()
-        return content.replace("<!-- CONTENT -->", self._to_html(0))
+        buffer = io.StringIO()
+        self.write_html(buffer)
+        return buffer.getvalue()
 
     def to_dict(self):
         return {
@@ -103,37 +216,158 @@ class AasTestResult:
         return v
 
 
-managers: List["ContextManager"] = []
+class AasTestResultGroup(AasTestResult):
+    """
+    Repeated findings sharing a message template.
+    The number of occurrences is exact, but only the first examples are kept.
+    """
+
+    __slots__ = ("template", "count")
+
+    def __init__(self, template: str, level: Level):
+        # Not calling super().__init__, a group is no additional error
+        self.message = template
+        self.level = level
+        self.template = template
+        self.count = 0
+        self.sub_results = []
+
+    def add(self, result: AasTestResult, max_examples: int):
+        if isinstance(result, AasTestResultGroup):
+            count = result.count
+            examples = result.sub_results
+        else:
+            count = 1
+            examples = (result,)
+        for example in examples:
+            if len(self.sub_results) >= max_examples:
+                break
+            self.sub_results.append(example)
+        self.count += count
+        self.message = f"{self.template} [{self.count} occurrences]"
+
+
+# Results below this level are not recorded by write and start, see set_verbosity
+_verbosity: "ContextVar[Level]" = ContextVar("verbosity", default=Level.INFO)
+
+
+def set_verbosity(level: Level):
+    """
+    Sets the minimum level of results recorded by write and start in the current context.
+    Results below the level are dropped instead of being appended, but their level is still
+    propagated, hence ok() and the level of enclosing results do not change.
+    """
+    assert isinstance(level, Level)
+    _verbosity.set(level)
+
+
+def get_verbosity() -> Level:
+    return _verbosity.get()
+
+
+def set_aggregation(max_examples: Optional[int]):
+    """
+    Groups repeated warnings and errors appended to the same result in the current context.
+    Findings are grouped by their message without path, literals masked, and level.
+    Each group counts all occurrences but keeps at most max_examples of them, None disables grouping.
+    """
+    assert max_examples is None or max_examples >= 1
+    _max_examples.set(max_examples)
+
+
+def error_budget() -> Optional[ErrorBudget]:
+    return _error_budget.get()
+
+
+def budget_exhausted() -> bool:
+    """
+    Returns whether the error budget of the current check is used up, i.e. remaining checks should be skipped.
+    Call it only right before a check which is skipped if it returns True, so the result is marked as truncated.
+    """
+    budget = _error_budget.get()
+    if budget is None or budget.remaining > 0:
+        return False
+    budget.skipped = True
+    return True
+
+
+def limit_errors(max_errors: Optional[int], check: Callable[[], AasTestResult]) -> AasTestResult:
+    """
+    Runs check with a budget of max_errors errors, None means unlimited.
+    Once the budget is used up, checks stop early and the returned result is marked as truncated.
+    """
+    if max_errors is None:
+        return check()
+    assert max_errors >= 1
+
+    def run() -> AasTestResult:
+        budget = ErrorBudget(max_errors)
+        _error_budget.set(budget)
+        result = check()
+        if budget.skipped:
+            result.append(
+                AasTestResult(f"Stopped after {max_errors} error(s), remaining checks were skipped", Level.ERROR)
+            )
+        return result
+
+    return copy_context().run(run)
+
+
+def export_settings() -> Dict[str, any]:
+    """Returns the settings of the current context, e.g. to apply them in worker processes"""
+    return {"verbosity": _verbosity.get(), "max_examples": _max_examples.get()}
+
+
+def apply_settings(settings: Dict[str, any]):
+    set_verbosity(settings["verbosity"])
+    set_aggregation(settings["max_examples"])
+
+
+def enabled(level: Level) -> bool:
+    """Returns whether results of the given level are recorded, use it to avoid building dropped results"""
+    return level.value >= _verbosity.get().value
+
+
+def _append(parent: AasTestResult, result: AasTestResult):
+    if enabled(result.level):
+        parent.append(result)
+    else:
+        # The level of a result is at least the level of its sub results, so the whole subtree is dropped
+        parent.level = parent.level | result.level
+
+
+# Stack of open contexts, local to each thread
+_managers: "ContextVar[Tuple[ContextManager, ...]]" = ContextVar("managers", default=())
 
 
 class ContextManager:
 
-    def __init__(self, result: AasTestResult, catch_all_exceptions: bool):
+    def __init__(self, result: AasTestResult, catch_all_exceptions: bool, detached: bool = False):
         self.result = result
         self.catch_all_exceptions = catch_all_exceptions
+        self.detached = detached
 
     def __enter__(self) -> AasTestResult:
-        managers.append(self)
+        self.token = _managers.set(_managers.get() + (self,))
         return self.result
 
     def __exit__(self, exc_type, exc_val, traceback):
-        m = managers.pop()
-        assert m is self
+        assert _managers.get()[-1] is self
+        _managers.reset(self.token)
+        managers = _managers.get()
         if exc_val is None:
-            if managers:
-                managers[-1].result.append(self.result)
+            handled = None
         elif isinstance(exc_val, ResultException):
             self.result.append(exc_val.result)
-            if managers:
-                managers[-1].result.append(self.result)
-            return True
+            handled = True
         elif self.catch_all_exceptions:
             self.result.append(AasTestResult(f"Internal error: {exc_val}", Level.CRITICAL))
-            if managers:
-                managers[-1].result.append(self.result)
-            return True
+            handled = True
         else:
             return False
+        if managers and not self.detached:
+            _append(managers[-1].result, self.result)
+        return handled
 
 
 class ResultException(Exception):
@@ -148,16 +382,35 @@ def _as_result(message: Union[str, AasTestResult], level: Level):
     return AasTestResult(message, level=level)
 
 
-def write(message: Union[str, AasTestResult]):
+def write(message: Union[str, AasTestResult], *args):
+    """
+    Appends a result to the current context.
+    Arguments are %-formatted into the message only if the result is recorded, see set_verbosity.
+    """
+    managers = _managers.get()
     if not managers:
         raise RuntimeError("No open context")
+    if isinstance(message, str):
+        if not enabled(Level.INFO):
+            return
+        if args:
+            message = message % args
     message = _as_result(message, Level.INFO)
-    managers[-1].result.append(message)
-
-
-def start(message: Union[str, AasTestResult], catch_all_exceptions: bool = False) -> ContextManager:
+    _append(managers[-1].result, message)
+
+
+def start(
+    message: Union[str, AasTestResult], catch_all_exceptions: bool = False, detached: bool = False
+) -> ContextManager:
+    """
+    Opens a new context, results written within are appended to it.
+    Unless detached, the context is appended to the enclosing context when closed.
+    """
+    if isinstance(message, str):
+        # Titles of contexts repeat for each checked element, unlike most messages written within
+        message = sys.intern(message)
     result = _as_result(message, Level.INFO)
-    return ContextManager(result, catch_all_exceptions)
+    return ContextManager(result, catch_all_exceptions, detached)
 
 
 def abort(message: Union[str, AasTestResult]):
@@ -1,9 +1,21 @@
-from typing import Tuple, Optional
-from aas_test_engines.result import AasTestResult
+from typing import Tuple, Optional, IO, Iterator, Union
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from aas_test_engines.result import AasTestResult, export_settings, apply_settings, error_budget
 
-from .parse import parse_and_check_json, parse_and_check_xml
-from .model import Environment, symbol_table
-from .submodel_templates import parse_submodel_templates
+from aas_test_engines.reflect import ListType
+from aas_test_engines import json_decoder, xml_backend
+from .adapter import Adapter, AdapterPath, JsonAdapter, XmlAdapter, JsonStreamAdapter, XmlStreamAdapter
+from .parse import (
+    parse_and_check_json,
+    parse_and_check_xml,
+    parse_and_check_stream,
+    check_stream_item,
+    StreamItem,
+    StreamItemResult,
+)
+from .model import Environment, Submodel, symbol_table
+from .submodel_templates import parse_submodel_templates, check_submodel_template
 
 
 def json_to_obj(value: any, model_type: str) -> Tuple[AasTestResult, any]:
@@ -20,3 +32,101 @@ def xml_to_obj(value: any, model_type: str) -> Tuple[AasTestResult, Optional[Env
     if result.ok():
         parse_submodel_templates(result, env)
     return result, env
+
+
+def _check_templates(obj) -> Optional[AasTestResult]:
+    if isinstance(obj, Submodel):
+        return check_submodel_template(obj)
+    return None
+
+
+def _check_stream_item(
+    model_type: str, attribute: str, adapter: Union[Adapter, bytes], path: AdapterPath
+) -> StreamItemResult:
+    # Executed in a worker process, so types are looked up by name instead of being pickled
+    if isinstance(adapter, bytes):
+        adapter = XmlAdapter(xml_backend.fromstring(adapter), path)
+    attr = next(i for i in symbol_table.lookup(model_type).attrs if i.name == attribute)
+    cls = attr.type.item_type if isinstance(attr.type, ListType) else attr.type
+    return check_stream_item(cls, adapter, path, _check_templates)
+
+
+def _check_stream_items_parallel(
+    entries: Iterator[Union[StreamItem, AasTestResult]], model_type: str, executor: Executor, jobs: int
+) -> Iterator[Union[StreamItemResult, AasTestResult]]:
+    # Limit the number of pending items to keep memory bounded
+    max_pending = 2 * jobs
+    pending = deque()
+    try:
+        for entry in entries:
+            if isinstance(entry, StreamItem):
+                adapter = entry.adapter
+                if isinstance(adapter, XmlAdapter):
+                    # Arguments are pickled later on, when streaming the element has been cleared already.
+                    # Besides, lxml elements cannot be pickled.
+                    adapter = xml_backend.tostring(adapter.value)
+                entry = executor.submit(_check_stream_item, model_type, entry.attribute, adapter, entry.path)
+            pending.append(entry)
+            while len(pending) > max_pending or (pending and isinstance(pending[0], AasTestResult)):
+                entry = pending.popleft()
+                yield entry if isinstance(entry, AasTestResult) else entry.result()
+        while pending:
+            entry = pending.popleft()
+            yield entry if isinstance(entry, AasTestResult) else entry.result()
+    finally:
+        for entry in pending:
+            if isinstance(entry, Future):
+                entry.cancel()
+
+
+def stream_to_result(adapter: Adapter, model_type: str, jobs: int = 1) -> AasTestResult:
+    """
+    Checks the given adapter one identifiable at a time.
+    With jobs > 1 the identifiables are checked by a pool of worker processes.
+    """
+    reflection = symbol_table.lookup(model_type)
+    if jobs <= 1 or error_budget() is not None:
+        # Stopping at the first errors requires checking the items in order
+        return parse_and_check_stream(reflection, adapter, _check_templates)
+    with ProcessPoolExecutor(jobs, initializer=apply_settings, initargs=(export_settings(),)) as executor:
+        return parse_and_check_stream(
+            reflection,
+            adapter,
+            _check_templates,
+            lambda entries: _check_stream_items_parallel(entries, model_type, executor, jobs),
+        )
+
+
+def json_to_result(value: any, model_type: str, jobs: int = 1) -> AasTestResult:
+    if jobs > 1 and model_type == "Environment":
+        return stream_to_result(JsonAdapter(value, AdapterPath()), model_type, jobs)
+    result, obj = json_to_obj(value, model_type)
+    return result
+
+
+def xml_to_result(value: any, model_type: str, jobs: int = 1) -> AasTestResult:
+    if jobs > 1 and model_type == "Environment":
+        return stream_to_result(XmlAdapter(value, AdapterPath()), model_type, jobs)
+    result, obj = xml_to_obj(value, model_type)
+    return result
+
+
+def json_file_to_result(file: IO, model_type: str, jobs: int = 1, decoder: Optional[str] = None) -> AasTestResult:
+    """
+    Environments are streamed, unless a decoder is given explicitly to decode the whole document at once.
+    Other model types are always decoded at once, see json_decoder.
+    """
+    if decoder is None and model_type == "Environment":
+        # Environments may be huge, check them one identifiable at a time
+        return stream_to_result(JsonStreamAdapter(file, AdapterPath()), model_type, jobs)
+    return json_to_result(json_decoder.load(file, decoder), model_type, jobs)
+
+
+def xml_file_to_result(file: IO, model_type: str, jobs: int = 1, backend: Optional[str] = None) -> AasTestResult:
+    """
+    Parses the file with the given backend, see xml_backend. Environments are streamed.
+    """
+    if model_type == "Environment":
+        return stream_to_result(XmlStreamAdapter(file, AdapterPath(), backend), model_type, jobs)
+    result, obj = xml_to_obj(xml_backend.fromstring(file.read(), backend), model_type)
+    return result
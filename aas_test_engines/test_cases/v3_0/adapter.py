@@ -1,15 +1,38 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Iterator, Tuple, IO, Mapping, Sequence
+from xml.etree import ElementTree
 from xml.etree.ElementTree import Element
+from functools import lru_cache
+import codecs
+import json
+import re
+
+from aas_test_engines import xml_backend
 
 
 class AdapterPath:
-    def __init__(self):
-        self.elements = []
+    """
+    Immutable path, each step links to its parent instead of copying all elements.
+    Hence, descending is O(1) and siblings share their prefix. Paths are only rendered when reporting.
+    """
+
+    __slots__ = ("parent", "element")
+
+    def __init__(self, parent: Optional["AdapterPath"] = None, element: any = None):
+        self.parent = parent
+        self.element = element
 
     def __add__(self, other):
-        result = AdapterPath()
-        result.elements = self.elements + [other]
-        return result
+        return AdapterPath(self, other)
+
+    @property
+    def elements(self) -> list:
+        elements = []
+        path = self
+        while path.parent is not None:
+            elements.append(path.element)
+            path = path.parent
+        elements.reverse()
+        return elements
 
     def __str__(self):
         return "/" + "/".join([str(i) for i in self.elements])
@@ -20,6 +43,7 @@ class AdapterException(Exception):
 
 
 class Adapter:
+    __slots__ = ()
 
     path: AdapterPath
 
@@ -38,24 +62,82 @@ class Adapter:
     def get_model_type(self) -> str:
         raise NotImplementedError()
 
+    def iter_object(self) -> Iterator[Tuple[str, "Adapter"]]:
+        return iter(self.as_object().items())
+
+    def iter_list(self, allow_empty: bool) -> Iterator["Adapter"]:
+        return iter(self.as_list(allow_empty))
+
+
+class _JsonObjectView(Mapping[str, "JsonAdapter"]):
+    """Read-only view on a JSON object without 'modelType', child adapters are created on access"""
+
+    __slots__ = ("value", "path")
+
+    def __init__(self, value: dict, path: AdapterPath):
+        self.value = value
+        self.path = path
+
+    def __getitem__(self, key: str) -> "JsonAdapter":
+        if key == "modelType":
+            raise KeyError(key)
+        return JsonAdapter(self.value[key], self.path + key)
+
+    def __contains__(self, key) -> bool:
+        return key != "modelType" and key in self.value
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.value:
+            if key != "modelType":
+                yield key
+
+    def __len__(self) -> int:
+        return len(self.value) - ("modelType" in self.value)
+
+
+class _JsonListView(Sequence["JsonAdapter"]):
+    """Read-only view on a JSON array, child adapters are created on access"""
+
+    __slots__ = ("value", "path")
+
+    def __init__(self, value: list, path: AdapterPath):
+        self.value = value
+        self.path = path
+
+    def __getitem__(self, idx: int) -> "JsonAdapter":
+        if isinstance(idx, slice):
+            raise TypeError("Slicing is not supported")
+        if idx < 0:
+            idx += len(self.value)
+        return JsonAdapter(self.value[idx], self.path + idx)
+
+    def __iter__(self) -> Iterator["JsonAdapter"]:
+        path = self.path
+        for idx, value in enumerate(self.value):
+            yield JsonAdapter(value, path + idx)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
 
 class JsonAdapter(Adapter):
+    __slots__ = ("value", "path")
 
     def __init__(self, value: any, path: AdapterPath):
         self.value = value
         self.path = path
 
-    def as_object(self) -> Dict[str, Adapter]:
+    def as_object(self) -> Mapping[str, Adapter]:
         if not isinstance(self.value, dict):
             raise AdapterException(f"Cannot convert {self.value} to object")
-        return {k: JsonAdapter(v, self.path + k) for k, v in self.value.items() if k != "modelType"}
+        return _JsonObjectView(self.value, self.path)
 
-    def as_list(self, allow_empty: bool) -> List["Adapter"]:
+    def as_list(self, allow_empty: bool) -> Sequence["Adapter"]:
         if not isinstance(self.value, list):
             raise AdapterException(f"Cannot convert {self.value} to list")
         if len(self.value) == 0 and not allow_empty:
             raise AdapterException(f"Empty array not allowed")
-        return [JsonAdapter(val, self.path + idx) for idx, val in enumerate(self.value)]
+        return _JsonListView(self.value, self.path)
 
     def as_string(self):
         if not isinstance(self.value, str):
@@ -79,6 +161,213 @@ class JsonAdapter(Adapter):
         return str(self.value)
 
 
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _JsonStream:
+    """
+    Reads a JSON document from a file chunk by chunk.
+    Only the structural characters are consumed here, values are decoded one at a time using the stdlib decoder.
+    """
+
+    def __init__(self, file: IO, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        self.bytes_decoder = None
+        # Location of buffer[0] within the document, used for error messages
+        self.offset = 0
+        self.lineno = 1
+        self.colno = 1
+
+    def _fill(self, size: int) -> bool:
+        if self.eof:
+            return False
+        data = self.file.read(size)
+        if isinstance(data, bytes):
+            if self.bytes_decoder is None:
+                # Like json.loads, detect UTF-8, UTF-16 or UTF-32 from the first four bytes
+                while 0 < len(data) < 4:
+                    more = self.file.read(4 - len(data))
+                    if not more:
+                        break
+                    data += more
+                self.bytes_decoder = codecs.getincrementaldecoder(json.detect_encoding(data))()
+            try:
+                text = self.bytes_decoder.decode(data, final=not data)
+            except UnicodeDecodeError as e:
+                raise self.error(f"Cannot decode {e.encoding}: {e.reason}", len(self.buffer))
+        else:
+            text = data
+        if not data:
+            self.eof = True
+        # Drop everything already consumed
+        newlines = self.buffer.count("\n", 0, self.pos)
+        if newlines:
+            self.lineno += newlines
+            self.colno = self.pos - self.buffer.rfind("\n", 0, self.pos)
+        else:
+            self.colno += self.pos
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos :] + text
+        self.pos = 0
+        return True
+
+    def error(self, msg: str, pos: Optional[int] = None) -> json.JSONDecodeError:
+        if pos is None:
+            pos = self.pos
+        newlines = self.buffer.count("\n", 0, pos)
+        lineno = self.lineno + newlines
+        colno = pos - self.buffer.rfind("\n", 0, pos) if newlines else self.colno + pos
+        e = json.JSONDecodeError(msg, self.buffer, pos)
+        e.pos, e.lineno, e.colno = self.offset + pos, lineno, colno
+        e.args = (f"{msg}: line {lineno} column {colno} (char {e.pos})",)
+        return e
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character or '' at the end of the document"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self.chunk_size):
+                return ""
+
+    def consume(self, expected: str, msg: str):
+        if self.peek() != expected:
+            raise self.error(msg)
+        self.pos += 1
+
+    def delimiter(self, end: str) -> bool:
+        """Consumes either ',' or the given end character, returns True for the latter"""
+        c = self.peek()
+        if c == ",":
+            self.pos += 1
+            return False
+        if c == end:
+            self.pos += 1
+            return True
+        raise self.error("Expecting ',' delimiter")
+
+    def decode(self) -> any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Probably truncated, double the buffer and retry
+                if self._fill(max(self.chunk_size, len(self.buffer))):
+                    continue
+                raise self.error(e.msg, e.pos)
+            if end == len(self.buffer) and isinstance(value, (int, float)) and not isinstance(value, bool):
+                # A number might continue in the next chunk
+                if self._fill(self.chunk_size):
+                    continue
+            self.pos = end
+            return value
+
+    def expect_end(self):
+        if self.peek() != "":
+            raise self.error("Extra data")
+
+
+class _JsonStreamListAdapter(Adapter):
+
+    def __init__(self, stream: _JsonStream, path: AdapterPath):
+        self.stream = stream
+        self.path = path
+        self.items = self._read_items()
+
+    def _read_items(self) -> Iterator[Adapter]:
+        stream = self.stream
+        stream.consume("[", "Expecting value")
+        if stream.peek() == "]":
+            stream.pos += 1
+            return
+        idx = 0
+        while True:
+            yield JsonAdapter(stream.decode(), self.path + idx)
+            idx += 1
+            if stream.delimiter("]"):
+                return
+
+    def iter_list(self, allow_empty: bool) -> Iterator[Adapter]:
+        empty = True
+        for item in self.items:
+            empty = False
+            yield item
+        if empty and not allow_empty:
+            raise AdapterException(f"Empty array not allowed")
+
+    def skip(self):
+        for _ in self.items:
+            pass
+
+    def _materialize(self) -> JsonAdapter:
+        return JsonAdapter([i.value for i in self.items], self.path)
+
+    def as_object(self) -> Dict[str, Adapter]:
+        return self._materialize().as_object()
+
+    def as_list(self, allow_empty: bool) -> List[Adapter]:
+        return self._materialize().as_list(allow_empty)
+
+    def as_string(self) -> str:
+        return self._materialize().as_string()
+
+    def as_bool(self) -> bool:
+        return self._materialize().as_bool()
+
+    def get_model_type(self) -> str:
+        return self._materialize().get_model_type()
+
+
+class JsonStreamAdapter(Adapter):
+    """
+    Adapter for a JSON document which is read from a file while iterating over it.
+    Lists in the root object are decoded item by item, so only one item needs to be held in memory at a time.
+    Syntax errors are raised as json.JSONDecodeError during iteration.
+    """
+
+    def __init__(self, file: IO, path: AdapterPath, chunk_size: int = 1 << 16):
+        self.stream = _JsonStream(file, chunk_size)
+        self.path = path
+
+    def iter_object(self) -> Iterator[Tuple[str, Adapter]]:
+        stream = self.stream
+        if stream.peek() != "{":
+            # Not an object, so there is nothing to stream
+            value = stream.decode()
+            stream.expect_end()
+            yield from JsonAdapter(value, self.path).iter_object()
+            return
+        stream.pos += 1
+        if stream.peek() == "}":
+            stream.pos += 1
+            stream.expect_end()
+            return
+        while True:
+            if stream.peek() != '"':
+                raise stream.error("Expecting property name enclosed in double quotes")
+            key = stream.decode()
+            stream.consume(":", "Expecting ':' delimiter")
+            if stream.peek() == "[":
+                value = _JsonStreamListAdapter(stream, self.path + key)
+                if key != "modelType":
+                    yield key, value
+                value.skip()
+            else:
+                value = stream.decode()
+                if key != "modelType":
+                    yield key, JsonAdapter(value, self.path + key)
+            if stream.delimiter("}"):
+                break
+        stream.expect_end()
+
+
 _expected_namespace = "{https://admin-shell.io/aas/3/0}"
 
 
@@ -89,7 +378,9 @@ def _get_single_child(el: Element) -> Element:
 
 
 def _assert_no_children(el: Element):
-    if next(iter(el), None):
+    # Only children which have children themselves are rejected
+    child = next(iter(el), None)
+    if child is not None and len(child):
         raise AdapterException("No child elements allowed")
 
 
@@ -100,38 +391,66 @@ def _assert_no_text(el: Element):
         raise AdapterException("No inline text allowed")
 
 
-def _get_model_type(el: Element, expected_namespace: str):
-    model_type = el.tag[len(expected_namespace) :]
-    model_type = model_type[0].upper() + model_type[1:]
-    return model_type
+class _Tag:
+    """Properties of a tag, computed once per distinct tag instead of once per element"""
+
+    __slots__ = ("local_name", "model_type", "is_data_specification_content")
+
+    def __init__(self, tag: str):
+        if tag.startswith(_expected_namespace):
+            self.local_name = tag[len(_expected_namespace) :]
+        else:
+            self.local_name = None
+        local_name = tag[len(_expected_namespace) :]
+        self.model_type = local_name[:1].upper() + local_name[1:]
+        self.is_data_specification_content = tag.endswith("dataSpecificationContent")
+
+
+# Bounded, since documents may contain any number of foreign tags, e.g. when checking many files in batch mode
+@lru_cache(maxsize=1024)
+def _get_tag(tag: str) -> _Tag:
+    if not isinstance(tag, str):
+        # Not an element, e.g. a comment which was not removed
+        raise AdapterException(f"invalid node {tag}")
+    return _Tag(tag)
+
 
+class XmlAdapter(Adapter):
+    """Adapter for an element of a tree parsed by either ElementTree or lxml, see xml_backend"""
 
-class XmlAdapter:
+    __slots__ = ("value", "path")
 
     def __init__(self, value: Element, path: AdapterPath):
         self.value = value
         self.path = path
 
     def as_object(self) -> Dict[str, "Adapter"]:
-        if not self.value.tag.startswith(_expected_namespace):
+        tag = _get_tag(self.value.tag)
+        if tag.local_name is None:
             raise AdapterException(f"invalid namespace, got '{self.value.tag}'")
         _assert_no_text(self.value)
 
         # Special handling for data specification content
-        if self.value.tag.endswith("dataSpecificationContent"):
+        if tag.is_data_specification_content:
             data = _get_single_child(self.value)
         else:
             data = self.value
 
         result = {}
+        is_operation_variable = None
+        path = self.path
         for child in data:
-            if not child.tag.startswith(_expected_namespace):
+            child_tag = _get_tag(child.tag)
+            local_name = child_tag.local_name
+            if local_name is None:
                 raise AdapterException(f"invalid namespace, got {child.tag}")
-            tag = child.tag[len(_expected_namespace) :]
-            if self.get_model_type() == "OperationVariable" and tag == "value":
-                result[tag] = XmlAdapter(_get_single_child(child), self.path + tag)
-            else:
-                result[tag] = XmlAdapter(child, self.path + tag)
+            if local_name == "value":
+                if is_operation_variable is None:
+                    is_operation_variable = _get_tag(data.tag).model_type == "OperationVariable"
+                if is_operation_variable:
+                    result[local_name] = XmlAdapter(_get_single_child(child), path + local_name)
+                    continue
+            result[local_name] = XmlAdapter(child, path + local_name)
         return result
 
     def as_list(self, allow_empty: bool) -> List["Adapter"]:
@@ -152,8 +471,126 @@ class XmlAdapter:
 
     def get_model_type(self) -> str:
         # Special handling for data specification content
-        if self.value.tag.endswith("dataSpecificationContent"):
+        if _get_tag(self.value.tag).is_data_specification_content:
             data = _get_single_child(self.value)
         else:
             data = self.value
-        return _get_model_type(data, _expected_namespace)
+        return _get_tag(data.tag).model_type
+
+
+class _XmlStream:
+    """
+    Reads an XML document from a file using iterparse.
+    Elements are handed out as soon as their start tag has been read, callers have to read them to the end before
+    asking for the next sibling.
+    """
+
+    def __init__(self, file: IO, backend: Optional[str] = None):
+        self.events = xml_backend.iterparse(file, ("start", "end"), backend)
+
+    def next_child(self) -> Optional[Element]:
+        """Returns the next child of the current element or None if the end tag of the current element was read"""
+        for event, el in self.events:
+            if event == "end":
+                return None
+            return el
+        return None
+
+    def read_to_end(self, el: Element):
+        for event, i in self.events:
+            if event == "end" and i is el:
+                return
+
+    def finish(self):
+        # Reading the rest of the document reports trailing syntax errors
+        for _ in self.events:
+            pass
+
+
+class _XmlStreamListAdapter(Adapter):
+
+    def __init__(self, stream: _XmlStream, value: Element, path: AdapterPath):
+        self.stream = stream
+        self.value = value
+        self.path = path
+        self.items = self._read_items()
+
+    def _read_items(self) -> Iterator[Adapter]:
+        idx = 0
+        child = self.stream.next_child()
+        while child is not None:
+            self.stream.read_to_end(child)
+            yield XmlAdapter(child, self.path + idx)
+            idx += 1
+            child.clear()
+            self.value.remove(child)
+            child = self.stream.next_child()
+
+    def iter_list(self, allow_empty: bool) -> Iterator[Adapter]:
+        empty = True
+        for item in self.items:
+            empty = False
+            yield item
+        if empty and not allow_empty:
+            raise AdapterException("Empty list not allowed")
+
+    def skip(self):
+        for _ in self.items:
+            pass
+
+    def _materialize(self) -> XmlAdapter:
+        self.items = iter(())
+        self.stream.read_to_end(self.value)
+        return XmlAdapter(self.value, self.path)
+
+    def as_object(self) -> Dict[str, Adapter]:
+        return self._materialize().as_object()
+
+    def as_list(self, allow_empty: bool) -> List[Adapter]:
+        return self._materialize().as_list(allow_empty)
+
+    def as_string(self) -> str:
+        return self._materialize().as_string()
+
+    def as_bool(self) -> bool:
+        return self._materialize().as_bool()
+
+    def get_model_type(self) -> str:
+        return self._materialize().get_model_type()
+
+
+class XmlStreamAdapter(Adapter):
+    """
+    Adapter for an XML document which is read from a file while iterating over it.
+    Lists in the root element are read one item subtree at a time, which is cleared once the caller moves on.
+    Syntax errors are raised as one of xml_backend.PARSE_ERRORS during iteration.
+    """
+
+    def __init__(self, file: IO, path: AdapterPath, backend: Optional[str] = None):
+        self.stream = _XmlStream(file, backend)
+        self.path = path
+
+    def iter_object(self) -> Iterator[Tuple[str, Adapter]]:
+        stream = self.stream
+        root = stream.next_child()
+        try:
+            if root is None:
+                raise AdapterException("No root element")
+            if not root.tag.startswith(_expected_namespace):
+                raise AdapterException(f"invalid namespace, got '{root.tag}'")
+            child = stream.next_child()
+            _assert_no_text(root)
+            while child is not None:
+                if not child.tag.startswith(_expected_namespace):
+                    raise AdapterException(f"invalid namespace, got {child.tag}")
+                tag = child.tag[len(_expected_namespace) :]
+                value = _XmlStreamListAdapter(stream, child, self.path + tag)
+                yield tag, value
+                value.skip()
+                root.remove(child)
+                child = stream.next_child()
+        except AdapterException:
+            # Syntax errors take precedence
+            stream.finish()
+            raise
+        stream.finish()
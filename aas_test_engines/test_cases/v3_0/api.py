@@ -1,5 +1,7 @@
 from typing import Tuple, Optional, Dict, List
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from fences.core.util import ConfusionMatrix
 from aas_test_engines.exception import AasTestToolsException
 from aas_test_engines.reflect import reflect_function
@@ -15,47 +17,47 @@ from .interfaces import (
     description,
     serialization,
 )
-from .interfaces.shared import ApiTestSuite, Base64String
+from .interfaces.shared import ApiTestSuite, Base64String, FixtureCache
 from .generate import generate_calls
 
 
 SSP_PREFIX = "https://admin-shell.io/aas/API/3/0/"
 
 
-def no_prefix(client: HttpClient):
+def no_prefix(client: HttpClient, fixtures: FixtureCache):
     return ""
 
 
-def aas_prefix(client: HttpClient):
+def aas_prefix(client: HttpClient, fixtures: FixtureCache):
     return "/aas"
 
 
-def aas_submodel_prefix(client: HttpClient):
-    shell = aas.get_shell(client)
+def aas_submodel_prefix(client: HttpClient, fixtures: FixtureCache):
+    shell = aas.get_shell(client, fixtures)
     submodel_id = Base64String(shell.submodels[0].keys[0].value.raw_value)
     return f"/aas/submodels/{submodel_id}"
 
 
-def aas_repo_prefix(client: HttpClient):
-    result = aas_repo.get_all_shells(client, limit=1)
+def aas_repo_prefix(client: HttpClient, fixtures: FixtureCache):
+    result = aas_repo.get_all_shells(client, limit=1, fixtures=fixtures)
     id = Base64String(result.result[0].id.raw_value)
     return f"/shells/{id}"
 
 
-def aas_repo_submodel_prefix(client: HttpClient):
-    result = aas_repo.get_all_shells(client, limit=1)
+def aas_repo_submodel_prefix(client: HttpClient, fixtures: FixtureCache):
+    result = aas_repo.get_all_shells(client, limit=1, fixtures=fixtures)
     id = Base64String(result.result[0].id.raw_value)
     sid = Base64String(result.result[0].submodels[0].keys[0].value.raw_value)
     return f"/shells/{id}/submodels/{sid}"
 
 
-def submodel_repo_submodel_prefix(client: HttpClient):
-    result = submodel_repo.get_all_submodels(client, limit=1)
+def submodel_repo_submodel_prefix(client: HttpClient, fixtures: FixtureCache):
+    result = submodel_repo.get_all_submodels(client, limit=1, fixtures=fixtures)
     submodel_id = Base64String(result.result[0].id.raw_value)
     return f"/submodels/{submodel_id}"
 
 
-def submodel_prefix(client: HttpClient):
+def submodel_prefix(client: HttpClient, fixtures: FixtureCache):
     return "/submodel"
 
 
@@ -186,37 +188,60 @@ def _check_server(dry: bool, client: HttpClient) -> bool:
             return False
 
 
-def _execute_syntactic_tests(suite: ApiTestSuite):
+def _execute_syntactic_tests(suite: ApiTestSuite, conf: CheckApiConfig) -> List[AasTestResult]:
     # make this ForwardReference resolvable
     from .model import Reference
 
     func_type = reflect_function(suite.invoke_error, globals(), locals())
     func_type2 = reflect_function(suite.invoke_success, globals(), locals())
     assert func_type == func_type2, suite
-    generate_calls(func_type, suite.operation, suite.valid_arguments)
+    return generate_calls(func_type, suite.operation, suite.valid_arguments, conf.concurrency)
 
 
-def _execute_semantic_tests(suite: ApiTestSuite):
+def _execute_semantic_tests(suite: ApiTestSuite) -> List[AasTestResult]:
     fns = [getattr(suite, i) for i in dir(suite) if i.startswith("test_")]
     fns.sort(key=lambda x: x.__code__.co_firstlineno)
+    results = []
     for test_fn in fns:
-        with start(test_fn.__doc__ or test_fn.__name__):
+        with start(test_fn.__doc__ or test_fn.__name__) as result:
             test_fn()
+        results.append(result)
+    return results
 
 
-def _execute(suite: ApiTestSuite) -> ConfusionMatrix:
+def _execute(suite: ApiTestSuite, conf: CheckApiConfig) -> ConfusionMatrix:
+    # Passed tests are not recorded with a verbosity above INFO, hence the outcomes are counted here
     mat = ConfusionMatrix()
-    with start("Negative Tests") as result:
-        _execute_syntactic_tests(suite)
-    mat.invalid_rejected = len([i for i in result.sub_results if i.ok()])
-    mat.invalid_accepted = len(result.sub_results) - mat.invalid_rejected
-    with start("Positive Tests") as result:
-        _execute_semantic_tests(suite)
-    mat.valid_accepted = len([i for i in result.sub_results if i.ok()])
-    mat.valid_rejected = len(result.sub_results) - mat.valid_accepted
+    with start("Negative Tests"):
+        results = _execute_syntactic_tests(suite, conf)
+    mat.invalid_rejected = len([i for i in results if i.ok()])
+    mat.invalid_accepted = len(results) - mat.invalid_rejected
+    with start("Positive Tests"):
+        results = _execute_semantic_tests(suite)
+    mat.valid_accepted = len([i for i in results if i.ok()])
+    mat.valid_rejected = len(results) - mat.valid_accepted
     return mat
 
 
+def _check_operation(
+    client: HttpClient, conf: CheckApiConfig, fixtures: FixtureCache, prefix_provider, test_suite_class
+) -> Tuple[AasTestResult, ConfusionMatrix]:
+    mat = ConfusionMatrix()
+    with start(f"Checking {test_suite_class.operation}", False, detached=True) as result:
+        if conf.dry:
+            return result, mat
+
+        with start("Setup") as result_setup:
+            prefix = prefix_provider(client, fixtures)
+            sub_client = client.descend(prefix)
+            test_suite: ApiTestSuite = test_suite_class(sub_client, conf.suite, fixtures)
+            test_suite.setup()
+
+        if result_setup.ok():
+            mat = _execute(test_suite, conf)
+    return result, mat
+
+
 def execute_tests(client: HttpClient, conf: CheckApiConfig) -> Tuple[AasTestResult, ConfusionMatrix]:
     try:
         test_suites = available_suites[conf.suite]
@@ -224,6 +249,9 @@ def execute_tests(client: HttpClient, conf: CheckApiConfig) -> Tuple[AasTestResu
         all_suites = "\n".join(sorted(available_suites.keys()))
         raise AasTestToolsException(f"Unknown suite {conf.suite}, must be one of:\n{all_suites}")
 
+    if conf.concurrency < 1:
+        raise AasTestToolsException(f"Invalid concurrency {conf.concurrency}, must be at least 1")
+
     mat = ConfusionMatrix()
 
     with start(f"Checking compliance to {conf.suite}") as result_root:
@@ -232,27 +260,29 @@ def execute_tests(client: HttpClient, conf: CheckApiConfig) -> Tuple[AasTestResu
         if not _check_server(conf.dry, client):
             return result_root, mat
 
-        # Check individual operations
-        for prefix_provider, test_suite_class in test_suites:
-            if conf.filter and not conf.filter.selects(test_suite_class.operation):
-                continue
-
-            with start(
-                f"Checking {test_suite_class.operation}",
-                False,
-            ):
-                if conf.dry:
-                    continue
-
-                with start("Setup") as result_setup:
-                    prefix = prefix_provider(client)
-                    sub_client = client.descend(prefix)
-                    test_suite: ApiTestSuite = test_suite_class(sub_client, conf.suite)
-                    test_suite.setup()
-
-                if result_setup.ok():
-                    sub_mat = _execute(test_suite)
+        # Check individual operations, objects fetched to set up the suites are shared among them
+        fixtures = FixtureCache()
+        selected_suites = [
+            (prefix_provider, test_suite_class)
+            for prefix_provider, test_suite_class in test_suites
+            if not conf.filter or conf.filter.selects(test_suite_class.operation)
+        ]
+        if conf.parallel > 1:
+            with ThreadPoolExecutor(conf.parallel) as executor:
+                # Each suite runs in a copy of the current context so that results do not interleave
+                futures = [
+                    executor.submit(copy_context().run, _check_operation, client, conf, fixtures, *i)
+                    for i in selected_suites
+                ]
+                for future in futures:
+                    result, sub_mat = future.result()
+                    result_root.append(result)
                     mat += sub_mat
+        else:
+            for i in selected_suites:
+                result, sub_mat = _check_operation(client, conf, fixtures, *i)
+                result_root.append(result)
+                mat += sub_mat
 
         with start("Summary:"):
             write(f"Negative tests passed: {mat.invalid_rejected} / {mat.invalid_accepted + mat.invalid_rejected}")
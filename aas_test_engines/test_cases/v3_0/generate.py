@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple, Iterator
 from aas_test_engines.reflect import (
     FunctionType,
     NumberType,
@@ -8,8 +8,11 @@ from aas_test_engines.reflect import (
     BoolType,
     ClassType,
 )
-from aas_test_engines.result import start, write
+from aas_test_engines.result import start, write, AasTestResult
 from .interfaces.shared import AssetId
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 import base64
 
 
@@ -58,17 +61,56 @@ def generate_invalid_values(arg: FunctionType.Argument) -> List[any]:
     )
 
 
-def generate_calls(func: FunctionType, scope: str, valid_arguments: Dict[str, any]):
+def _call(func: FunctionType, scope: str, args: Dict[str, any]):
+    try:
+        func.func(**args)
+    except TypeError as e:
+        raise NotImplementedError(
+            f"Caught the following exception:\n" + f"{e}\n" + f"Have you set valid_arguments during setup() ?\n"
+            f"Scope: {scope}"
+        )
+
+
+def _call_detached(func: FunctionType, scope: str, args: Dict[str, any], message: str) -> AasTestResult:
+    with start(message, detached=True) as result:
+        _call(func, scope, args)
+    return result
+
+
+def _generate_calls_threaded(
+    func: FunctionType, scope: str, calls: List[Tuple[str, Dict[str, any]]], concurrency: int
+) -> Iterator[AasTestResult]:
+    pending = deque()
+    with ThreadPoolExecutor(concurrency) as executor:
+        for message, args in calls:
+            # Each thread needs its own copy of the current context, e.g. for the stack of open results
+            pending.append(executor.submit(copy_context().run, _call_detached, func, scope, args, message))
+            if len(pending) >= concurrency:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def generate_calls(
+    func: FunctionType, scope: str, valid_arguments: Dict[str, any], concurrency: int = 1
+) -> List[AasTestResult]:
+    """
+    Invokes func once for each invalid value of each argument and returns the result of each call.
+    With concurrency > 1, up to concurrency calls are executed at a time by a pool of threads owned by
+    this call, the results are written in the same order as they would be sequentially.
+    """
+    calls = []
     for arg in func.args:
         for invalid_value in generate_invalid_values(arg):
-            with start(f"Set {arg.name} = '{invalid_value}'"):
-                args = {**valid_arguments, arg.name: invalid_value}
-                try:
-                    func.func(**args)
-                except TypeError as e:
-                    raise NotImplementedError(
-                        f"Caught the following exception:\n"
-                        + f"{e}\n"
-                        + f"Have you set valid_arguments during setup() ?\n"
-                        f"Scope: {scope}"
-                    )
+            calls.append((f"Set {arg.name} = '{invalid_value}'", {**valid_arguments, arg.name: invalid_value}))
+    results = []
+    if concurrency > 1:
+        for result in _generate_calls_threaded(func, scope, calls, concurrency):
+            write(result)
+            results.append(result)
+    else:
+        for message, args in calls:
+            with start(message) as result:
+                _call(func, scope, args)
+            results.append(result)
+    return results
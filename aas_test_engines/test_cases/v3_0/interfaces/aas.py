@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from aas_test_engines.reflect import reflect
 from aas_test_engines.http import HttpClient, Request
 from .shared import (
+    FixtureCache,
     ErrorResult,
     invoke_and_decode,
     r_error_result,
@@ -34,9 +35,9 @@ r_asset_administration_shell, _ = reflect(AssetAdministrationShell, globals(), l
 r_reference, _ = reflect(Reference, globals(), locals())
 
 
-def get_shell(client: HttpClient) -> AssetAdministrationShell:
+def get_shell(client: HttpClient, fixtures: Optional[FixtureCache] = None) -> AssetAdministrationShell:
     request = Request("/")
-    return invoke_and_decode(client, request, r_asset_administration_shell, {200})
+    return invoke_and_decode(client, request, r_asset_administration_shell, {200}, fixtures)
 
 
 def get_all_submodel_references(
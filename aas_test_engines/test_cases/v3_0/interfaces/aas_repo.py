@@ -4,6 +4,7 @@ from aas_test_engines.reflect import reflect
 from aas_test_engines.http import HttpClient, Request
 from aas_test_engines.test_cases.v3_0.model import AssetAdministrationShell, Reference
 from .shared import (
+    FixtureCache,
     PagedResult,
     invoke_and_decode,
     Base64String,
@@ -38,6 +39,7 @@ def get_all_shells(
     cursor: Optional[str] = None,
     id_short: Optional[str] = None,
     asset_id: Optional[AssetId] = None,
+    fixtures: Optional[FixtureCache] = None,
 ) -> GetAllShellsResponse:
     request = Request(
         path="/shells",
@@ -48,13 +50,13 @@ def get_all_shells(
             "assetIds": asset_id,
         },
     )
-    return invoke_and_decode(client, request, r_get_all_shells_response, {200})
+    return invoke_and_decode(client, request, r_get_all_shells_response, {200}, fixtures)
 
 
 class GetAllAasTestSuiteBase(ApiTestSuite):
     def setup(self):
         self.cursor: Optional[str] = None
-        shells = get_all_shells(self.client, limit=1)
+        shells = get_all_shells(self.client, limit=1, fixtures=self.fixtures)
         self.valid_id_short = shells.result[0].id_short.raw_value
         global_asset_id = shells.result[0].asset_information.global_asset_id.raw_value
         if global_asset_id:
@@ -182,7 +184,7 @@ class GetAasByIdTestSuite(ApiTestSuite):
     operation = "GetAssetAdministrationShellById"
 
     def setup(self):
-        shells = get_all_shells(self.client, limit=1)
+        shells = get_all_shells(self.client, limit=1, fixtures=self.fixtures)
         self.valid_id = shells.result[0].id.raw_value
 
     def invoke_success(self, aas_id: Base64String) -> AssetAdministrationShell:
@@ -205,7 +207,7 @@ class GetAasByIdReferenceTestSuite(ApiTestSuite):
     operation = "GetAssetAdministrationShellById-Reference"
 
     def setup(self):
-        shells = get_all_shells(self.client, limit=1)
+        shells = get_all_shells(self.client, limit=1, fixtures=self.fixtures)
         self.valid_id = shells.result[0].id.raw_value
 
     def invoke_success(self, aas_id: Base64String) -> Reference:
@@ -16,7 +16,7 @@ class GenerateSerializationSuite(ApiTestSuite):
     operation = "GenerateSerializationByIds"
 
     def setup(self):
-        shells = get_all_shells(self.client, limit=1)
+        shells = get_all_shells(self.client, limit=1, fixtures=self.fixtures)
         self.valid_id = Base64String(shells.result[0].id.raw_value)
         self.valid_submod_id = Base64String(shells.result[0].submodels[0].keys[0].value.raw_value)
 
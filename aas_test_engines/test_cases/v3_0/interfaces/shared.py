@@ -1,4 +1,4 @@
-from typing import List, Union, Optional, Dict, Set
+from typing import List, Union, Optional, Dict, Set, Callable, TypeVar
 from enum import Enum
 from aas_test_engines.http import HttpClient, Request, Response
 from aas_test_engines.reflect import (
@@ -13,22 +13,27 @@ from aas_test_engines.result import (
     write,
     start,
     abort,
+    enabled,
     AasTestResult,
 )
 from aas_test_engines.result import Level as ResultLevel
 import base64
 import json
+import threading
 import requests
 from aas_test_engines.data_types import base64_urlsafe
+from aas_test_engines import json_decoder
 
 # Util
 
+T = TypeVar("T")
+
 all_operations: Dict[str, callable] = {}
 
 
 def _assert(predicate: bool, message, level: ResultLevel = ResultLevel.ERROR):
     if predicate:
-        write(f"{message}: OK")
+        write("%s: OK", message)
     else:
         abort(AasTestResult(f"{message}: Fail", level))
 
@@ -49,19 +54,20 @@ def _shorten(content: bytes, max_len: int = 300) -> str:
 
 def extract_json(response: Response) -> dict:
     try:
-        data = response.json()
+        data = json_decoder.loads(response.content)
         if not isinstance(data, (dict, list)):
             abort(f"Expected JSON, got {type(data)}")
         return data
-    except requests.exceptions.JSONDecodeError as e:
+    except json.JSONDecodeError as e:
         abort(f"Cannot decode as JSON: {e}")
 
 
 def invoke(client: HttpClient, request: Request) -> Response:
-    url = "".join(client.prefixes) + request.make_url()
-    write(f"Invoke {url}")
+    if enabled(ResultLevel.INFO):
+        write("Invoke %s%s", "".join(client.prefixes), request.make_url())
     response = client.send(request)
-    write(f"Response: ({response.status_code}): {_shorten(response.content)}")
+    if enabled(ResultLevel.INFO):
+        write("Response: (%s): %s", response.status_code, _shorten(response.content))
     return response
 
 
@@ -70,7 +76,15 @@ def invoke_and_decode(
     request: Request,
     return_type: TypeBase,
     expected_status: Set[int],
+    fixtures: Optional["FixtureCache"] = None,
 ):
+    """
+    Sends the request and parses the response as return_type.
+    If a fixture cache is given, the parsed response is taken from or stored in it.
+    """
+    if fixtures is not None:
+        key = f"{request.method.upper()} {''.join(client.prefixes)}{request.make_url()}"
+        return fixtures.get(key, lambda: invoke_and_decode(client, request, return_type, expected_status))
     request.headers["content-type"] = "application/json"
     response = invoke(client, request)
     if response.status_code >= 500:
@@ -91,6 +105,32 @@ def invoke_and_decode(
         abort(result)
 
 
+class FixtureCache:
+    """
+    Stores objects fetched from the server during a test run, e.g. to find an existing shell.
+    Each fixture is fetched at most once per run, even if requested by several threads at once.
+    Failures are not cached, i.e., the next suite requesting the fixture tries again.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.key_locks: Dict[str, threading.Lock] = {}
+        self.fixtures: Dict[str, any] = {}
+
+    def get(self, key: str, fetch: Callable[[], T]) -> T:
+        with self.lock:
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            try:
+                fixture = self.fixtures[key]
+            except KeyError:
+                fixture = fetch()
+                self.fixtures[key] = fixture
+                return fixture
+        write("Using cached fixture %s", key)
+        return fixture
+
+
 # Common
 
 
@@ -142,9 +182,10 @@ class AssetId:
 class ApiTestSuite:
     operation = "?"
 
-    def __init__(self, client: HttpClient, profile: str):
+    def __init__(self, client: HttpClient, profile: str, fixtures: Optional[FixtureCache] = None):
         self.client = client
         self.profile = profile
+        self.fixtures = fixtures or FixtureCache()
         self.valid_arguments: Dict[str, any] = {}
 
     def setup(self):
@@ -3,6 +3,7 @@ from dataclasses import dataclass, field
 from aas_test_engines.reflect import reflect
 from aas_test_engines.http import HttpClient, Request
 from .shared import (
+    FixtureCache,
     ErrorResult,
     invoke_and_decode,
     invoke,
@@ -30,8 +31,6 @@ GetSubmodelPathsResponse = List[str]
 
 r_submodel, _ = reflect(Submodel, globals(), locals())
 r_submodel_references, _ = reflect(GetAllSubmodelReferencesResponse, globals(), locals())
-
-r_submodel, _ = reflect(Submodel, globals(), locals())
 r_reference, _ = reflect(Reference, globals(), locals())
 r_get_submodel_paths, _ = reflect(GetSubmodelPathsResponse)
 
@@ -61,7 +60,10 @@ r_get_all_submodels_path, _ = reflect(GetAllSubmodelsPathResponse, globals(), lo
 
 
 def get_all_submodels(
-    client: HttpClient, limit: Optional[int] = None, cursor: Optional[str] = None
+    client: HttpClient,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fixtures: Optional[FixtureCache] = None,
 ) -> GetAllSubmodelsResponse:
     request = Request(
         path=f"/submodels",
@@ -70,14 +72,14 @@ def get_all_submodels(
             "cursor": cursor,
         },
     )
-    return invoke_and_decode(client, request, r_get_all_submodels, {200})
+    return invoke_and_decode(client, request, r_get_all_submodels, {200}, fixtures)
 
 
 class GetAllSubmodelsTestSuite(PaginationTests, ApiTestSuite):
     operation = "GetAllSubmodels"
 
     def setup(self):
-        result = get_all_submodels(self.client, limit=1)
+        result = get_all_submodels(self.client, limit=1, fixtures=self.fixtures)
         self.cursor = result.paging_metadata.cursor
 
     def invoke_success(self, limit: Optional[int] = None, cursor: Optional[str] = None) -> GetAllSubmodelsResponse:
@@ -104,7 +106,7 @@ class GetAllSubmodelsMetadataTestSuite(PaginationTests, ApiTestSuite):
     operation = "GetAllSubmodels-Metadata"
 
     def setup(self):
-        result = get_all_submodels(self.client, limit=1)
+        result = get_all_submodels(self.client, limit=1, fixtures=self.fixtures)
         self.cursor = result.paging_metadata.cursor
 
     def _invoke(self, limit, cursor, reflection, status):
@@ -134,7 +136,7 @@ class GetAllSubmodelsValueTestSuite(PaginationTests, ApiTestSuite):
     operation = "GetAllSubmodels-ValueOnly"
 
     def setup(self):
-        result = get_all_submodels(self.client, limit=1)
+        result = get_all_submodels(self.client, limit=1, fixtures=self.fixtures)
         self.cursor = result.paging_metadata.cursor
 
     def _invoke(self, limit, cursor, reflection, status):
@@ -164,7 +166,7 @@ class GetAllSubmodelsReferenceTestSuite(PaginationTests, ApiTestSuite):
     operation = "GetAllSubmodels-Reference"
 
     def setup(self):
-        result = get_all_submodels(self.client, limit=1)
+        result = get_all_submodels(self.client, limit=1, fixtures=self.fixtures)
         self.cursor = result.paging_metadata.cursor
 
     def _invoke(self, limit, cursor, reflection, status):
@@ -196,7 +198,7 @@ class GetAllSubmodelsPathTestSuite(PaginationTests, ApiTestSuite):
     operation = "GetAllSubmodels-Path"
 
     def setup(self):
-        result = get_all_submodels(self.client, limit=1)
+        result = get_all_submodels(self.client, limit=1, fixtures=self.fixtures)
         self.cursor = result.paging_metadata.cursor
 
     def _invoke(self, limit, cursor, reflection, status):
@@ -239,7 +241,7 @@ class SetupForAas(ApiTestSuite):
 
 class SetupForSubmodel(ApiTestSuite):
     def setup(self):
-        result = get_all_submodels(self.client, limit=1)
+        result = get_all_submodels(self.client, limit=1, fixtures=self.fixtures)
         self.valid_id = result.result[0].id.raw_value
         self.valid_arguments["submodel_id"] = Base64String(self.valid_id)
 
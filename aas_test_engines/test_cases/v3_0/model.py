@@ -1,8 +1,10 @@
 from .parse import (
     CheckConstraintException,
     requires_model_type,
+    deferred_checks,
+    interned,
 )
-from aas_test_engines.reflect import reflect, StringFormattedValue, abstract, NonEmptyList
+from aas_test_engines.reflect import reflect, StringFormattedValue, abstract, slotted, NonEmptyList
 
 from dataclasses import dataclass, field
 from typing import List, Optional, Set, Iterator, Union, Iterable
@@ -12,6 +14,7 @@ from aas_test_engines.data_types import (
     is_bcp_lang_string,
     DataTypeDefXsd,
     validators,
+    find_invalid,
     is_xs_date_time_utc,
     is_bcp_47_for_english,
     is_any_uri,
@@ -25,15 +28,31 @@ import re
 
 
 class IdShortPath:
-
-    def __init__(self, root: "Submodel"):
+    # Like AdapterPath, each step links to its parent and is rendered only when reporting
+    __slots__ = ("root", "parent", "token")
+
+    def __init__(
+        self,
+        root: "Submodel",
+        parent: Optional["IdShortPath"] = None,
+        token: Union["NameTypeString", int, None] = None,
+    ):
         self.root = root
-        self.id_shorts: NonEmptyList[Union["NameTypeString", int, None]] = []
+        self.parent = parent
+        self.token = token
 
     def __add__(self, token: Union["NameTypeString", int, None]):
-        result = IdShortPath(self.root)
-        result.id_shorts = self.id_shorts + [token]
-        return result
+        return IdShortPath(self.root, self, token)
+
+    @property
+    def id_shorts(self) -> List[Union["NameTypeString", int, None]]:
+        id_shorts = []
+        path = self
+        while path.parent is not None:
+            id_shorts.append(path.token)
+            path = path.parent
+        id_shorts.reverse()
+        return id_shorts
 
     def __str__(self):
         def token_to_string(t):
@@ -50,18 +69,28 @@ class IdShortPath:
         return f"{path} in Submodel {id_short}[{self.root.id}]"
 
 
+def _invalid_value_message(value_type: DataTypeDefXsd, value: str, path: Optional[IdShortPath]) -> str:
+    msg = f"Value '{value}' is not a '{value_type.value}'"
+    if path:
+        msg += f" @ {path}"
+    return msg
+
+
 def validate(value: str, value_type: DataTypeDefXsd, path: Optional[IdShortPath] = None):
+    deferred = deferred_checks()
+    if deferred is not None:
+        # Validated together with all other values of this type once the constraints have been checked
+        deferred.add(value_type, find_invalid, _invalid_value_message, value, path)
+        return
     validator = validators[value_type]
     if not validator(value):
-        msg = f"Value '{value}' is not a '{value_type.value}'"
-        if path:
-            msg += f" @ {path}"
-        raise CheckConstraintException(msg)
+        raise CheckConstraintException(_invalid_value_message(value_type, value, path))
 
 
 # 5.3.11.2 Primitive Data Types
 
 
+@slotted
 @dataclass
 class LangStringSet:
     language: str
@@ -69,7 +98,7 @@ class LangStringSet:
 
     def __init_subclass__(cls, max_len_text):
         cls._max_len_text = max_len_text
-        return super().__init_subclass__()
+        return super(LangStringSet, cls).__init_subclass__()
 
     def check_language(self):
         if not is_bcp_lang_string(self.language):
@@ -89,11 +118,11 @@ class LangStringSet:
 
 
 class MultiLanguageNameType(LangStringSet, max_len_text=128):
-    pass
+    __slots__ = ()
 
 
 class MultiLanguageTextType(LangStringSet, max_len_text=1023):
-    pass
+    __slots__ = ()
 
 
 class BlobString(StringFormattedValue):
@@ -277,6 +306,8 @@ GloballyIdentifiables = AasIdentifiables | GenericGloballyIdentifiables
 FragmentKeys = GenericFragmentKeys | AasSubmodelElements
 
 
+@interned
+@slotted
 @dataclass
 class Key:
     type: KeyType
@@ -294,6 +325,8 @@ class ReferenceType(Enum):
     ModelReference = "ModelReference"
 
 
+@interned
+@slotted
 @dataclass
 class Reference:
     type: ReferenceType
@@ -427,9 +460,12 @@ class Reference:
 @dataclass
 @abstract
 class DataSpecificationContent:
+    __slots__ = ()
+
     pass
 
 
+@slotted
 @dataclass
 class EmbeddedDataSpecification:
     data_specification: Reference
@@ -458,20 +494,25 @@ class EmbeddedDataSpecification:
 
 @dataclass
 class HasDataSpecification:
+    __slots__ = ()
+
     embedded_data_specifications: Optional[NonEmptyList[EmbeddedDataSpecification]]
 
 
+@slotted
 @dataclass
 class ValueReferencePair:
     value: IdentifierString
     value_id: Reference
 
 
+@slotted
 @dataclass
 class ValueList:
     value_reference_pairs: NonEmptyList[ValueReferencePair]
 
 
+@slotted
 @dataclass
 class LevelType:
     min: bool
@@ -503,15 +544,15 @@ class DataTypeIec61360(Enum):
 
 
 class DefinitionTypeIec61360(LangStringSet, max_len_text=1023):
-    pass
+    __slots__ = ()
 
 
 class PreferredNameTypeIec61360(LangStringSet, max_len_text=255):
-    pass
+    __slots__ = ()
 
 
 class ShortNameTypeIec61360(LangStringSet, max_len_text=18):
-    pass
+    __slots__ = ()
 
 
 class ValueTypeIec61360(StringFormattedValue):
@@ -523,6 +564,7 @@ class NonEmptyString(StringFormattedValue):
     min_length = 1
 
 
+@slotted
 @dataclass
 class DataSpecificationIec61360(DataSpecificationContent):
     preferred_name: NonEmptyList[PreferredNameTypeIec61360]
@@ -579,6 +621,8 @@ class DataSpecificationIec61360(DataSpecificationContent):
 
 @dataclass
 class HasSemantics:
+    __slots__ = ()
+
     # TODO: Note: it is recommended to use an external reference
     semantic_id: Optional[Reference]
     # TODO: Note: it is recommended to use an external reference
@@ -599,6 +643,7 @@ class HasSemantics:
 # 5.3.2.4 Extensions
 
 
+@slotted
 @dataclass
 class Extension(HasSemantics):
     name: NameTypeString
@@ -615,6 +660,8 @@ class Extension(HasSemantics):
 
 @dataclass
 class HasExtensions:
+    __slots__ = ()
+
     extensions: Optional[NonEmptyList[Extension]]
 
 
@@ -623,6 +670,8 @@ class HasExtensions:
 
 @dataclass
 class Referable(HasExtensions):
+    __slots__ = ()
+
     # TODO: category is deprecated
     category: Optional[NameTypeString]
     id_short: Optional[NameTypeString]
@@ -648,12 +697,15 @@ class ModellingKind(Enum):
 
 @dataclass
 class HasKind:
+    __slots__ = ()
+
     kind: Optional[ModellingKind]
 
 
 # 5.3.2.2 Administrative Information
 
 
+@slotted
 @dataclass
 class AdministrativeInformation(HasDataSpecification):
     version: Optional[VersionString]
@@ -677,6 +729,8 @@ class AdministrativeInformation(HasDataSpecification):
 @dataclass
 @requires_model_type
 class Identifiable(Referable):
+    __slots__ = ()
+
     administration: Optional[AdministrativeInformation]
     id: IdentifierString
 
@@ -690,6 +744,7 @@ class QualifierKind(Enum):
     ValueQualifier = "ValueQualifier"
 
 
+@slotted
 @dataclass
 class Qualifier(HasSemantics):
     # TODO: Default: ConceptQualifier
@@ -723,12 +778,15 @@ class Qualifier(HasSemantics):
 
 @dataclass
 class Qualifiable:
+    __slots__ = ()
+
     qualifiers: Optional[NonEmptyList[Qualifier]]
 
 
 # 5.3.4 Asset Information
 
 
+@slotted
 @dataclass
 class SpecificAssetId(HasSemantics):
     name: LabelString
@@ -744,6 +802,7 @@ class SpecificAssetId(HasSemantics):
             raise CheckConstraintException("Constraint AASd-133 violated: type must be ExternalReference")
 
 
+@slotted
 @dataclass
 class Resource:
     path: PathString
@@ -756,6 +815,7 @@ class AssetKind(Enum):
     TYPE = "Type"
 
 
+@slotted
 @dataclass
 class AssetInformation:
     asset_kind: AssetKind
@@ -811,6 +871,8 @@ def ensure_unique_id_shorts(value: Optional[Iterable[Referable]], path: IdShortP
 @dataclass
 @abstract
 class SubmodelElement(Referable, HasSemantics, Qualifiable, HasDataSpecification):
+    __slots__ = ()
+
     id_short_path: IdShortPath = field(metadata={"exclude_as": None})
 
     def elements(self) -> Iterator["SubmodelElement"]:
@@ -834,6 +896,7 @@ class SubmodelElement(Referable, HasSemantics, Qualifiable, HasDataSpecification
 @dataclass
 @abstract
 class DataElement(SubmodelElement):
+    __slots__ = ()
 
     def check_aasd_090(self):
         """
@@ -850,6 +913,7 @@ class DataElement(SubmodelElement):
 # 5.3.7.15 Relationship Element
 
 
+@slotted
 @dataclass
 class RelationshipElement(SubmodelElement):
     first: Reference
@@ -859,6 +923,7 @@ class RelationshipElement(SubmodelElement):
 # 5.3.7.2 Annotated Relationship Element
 
 
+@slotted
 @dataclass
 class AnnotatedRelationshipElement(RelationshipElement):
     annotations: Optional[NonEmptyList[DataElement]]
@@ -870,6 +935,7 @@ class AnnotatedRelationshipElement(RelationshipElement):
 # 5.3.7.8 Event Element
 
 
+@slotted
 @dataclass
 class EventElement(SubmodelElement):
     pass
@@ -888,6 +954,7 @@ class Direction(Enum):
     OUTPUT = "output"
 
 
+@slotted
 @dataclass
 class BasicEventElement(EventElement):
     observed: Reference
@@ -915,6 +982,7 @@ class BasicEventElement(EventElement):
 # 5.3.7.4 Blob
 
 
+@slotted
 @dataclass
 class Blob(DataElement):
     value: Optional[BlobString]
@@ -924,6 +992,7 @@ class Blob(DataElement):
 # 5.3.7.5 Capability
 
 
+@slotted
 @dataclass
 class Capability(SubmodelElement):
     pass
@@ -937,6 +1006,7 @@ class EntityType(Enum):
     SelfManagedEntity = "SelfManagedEntity"
 
 
+@slotted
 @dataclass
 class Entity(SubmodelElement):
     statements: Optional[NonEmptyList[SubmodelElement]]
@@ -967,6 +1037,7 @@ class Entity(SubmodelElement):
 # 5.3.7.9 File
 
 
+@slotted
 @dataclass
 class File(DataElement):
     value: Optional[PathString]
@@ -976,6 +1047,7 @@ class File(DataElement):
 # 5.3.7.10 Multi Language Property
 
 
+@slotted
 @dataclass
 class MultiLanguageProperty(DataElement):
     value: Optional[NonEmptyList[MultiLanguageTextType]]
@@ -995,6 +1067,7 @@ class MultiLanguageProperty(DataElement):
 # 5.3.7.11 Operation
 
 
+@slotted
 @dataclass
 class OperationVariable:
     value: SubmodelElement
@@ -1008,6 +1081,7 @@ class OperationVariable:
             raise CheckConstraintException(f"Constraint AASd-117 is violated: idShort missing @ {self.id_short_path}")
 
 
+@slotted
 @dataclass
 class Operation(SubmodelElement):
     input_variables: Optional[NonEmptyList[OperationVariable]]
@@ -1040,6 +1114,7 @@ class Operation(SubmodelElement):
 # 5.3.7.12 Property
 
 
+@slotted
 @dataclass
 class Property(DataElement):
     value_type: DataTypeDefXsd
@@ -1064,6 +1139,7 @@ class Property(DataElement):
 # 5.3.7.13 Range
 
 
+@slotted
 @dataclass
 class Range(DataElement):
     value_type: DataTypeDefXsd
@@ -1082,6 +1158,7 @@ class Range(DataElement):
 # 5.3.7.14 Reference Element
 
 
+@slotted
 @dataclass
 class ReferenceElement(DataElement):
     value: Optional[Reference]
@@ -1090,6 +1167,7 @@ class ReferenceElement(DataElement):
 # 5.3.7.16 Submodel Element Collection
 
 
+@slotted
 @dataclass
 class SubmodelElementCollection(SubmodelElement):
     value: Optional[NonEmptyList[SubmodelElement]]
@@ -1116,6 +1194,7 @@ class SubmodelElementCollection(SubmodelElement):
 # 5.3.7.17 Submodel Element List
 
 
+@slotted
 @dataclass
 class SubmodelElementList(SubmodelElement):
     # TODO: default: true
@@ -1240,6 +1319,7 @@ class SubmodelElementList(SubmodelElement):
 # 5.3.3 Asset Administration Shell
 
 
+@slotted
 @dataclass
 class AssetAdministrationShell(Identifiable, HasDataSpecification):
     derived_from: Optional[Reference]
@@ -1264,6 +1344,7 @@ class AssetAdministrationShell(Identifiable, HasDataSpecification):
 # 5.3.5 Submodel
 
 
+@slotted
 @dataclass
 class Submodel(Identifiable, HasKind, HasSemantics, Qualifiable, HasDataSpecification):
     submodel_elements: Optional[NonEmptyList[SubmodelElement]]
@@ -1325,6 +1406,7 @@ class Submodel(Identifiable, HasKind, HasSemantics, Qualifiable, HasDataSpecific
 # 5.3.8 Concept Description
 
 
+@slotted
 @dataclass
 class ConceptDescription(Identifiable, HasDataSpecification):
     # TODO: Note: it is recommended to use an external reference, i.e. Reference/type = ExternalReference.
@@ -1459,6 +1541,7 @@ class ConceptDescription(Identifiable, HasDataSpecification):
 # 5.3.9 Environment
 
 
+@slotted
 @dataclass
 class Environment:
     asset_administration_shells: Optional[NonEmptyList[AssetAdministrationShell]]
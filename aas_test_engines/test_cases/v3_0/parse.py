@@ -11,10 +11,13 @@ from aas_test_engines.reflect import (
 )
 
 from dataclasses import dataclass, fields, field, is_dataclass
-from typing import List, Dict, Optional, Tuple, Union, ForwardRef, Pattern, Callable
-from aas_test_engines.result import AasTestResult, Level
+from typing import List, Dict, Optional, Tuple, Union, ForwardRef, Pattern, Callable, Iterator, get_type_hints
+from aas_test_engines.result import AasTestResult, Level, budget_exhausted
 from enum import Enum
 import re
+import threading
+from contextvars import ContextVar
+from contextlib import contextmanager
 from .adapter import AdapterPath, JsonAdapter, XmlAdapter
 from aas_test_engines.reflect import StringFormattedValue
 
@@ -42,25 +45,86 @@ def has_requires_model_type(cls):
     return hasattr(cls, f"_requires_model_type")
 
 
+def interned(cls):
+    """Marks an immutable class, equal instances found by the same parse call are stored once"""
+    setattr(cls, "_interned", True)
+    return cls
+
+
+def is_interned(cls) -> bool:
+    return hasattr(cls, "_interned")
+
+
+class InternTable:
+    """
+    Values parsed so far by the current parse call, looked up by their class and content.
+    Only string formatted values and instances of interned classes are stored. As these are never modified after
+    parsing, equal values can be shared.
+    """
+
+    __slots__ = ("enabled", "values", "hits")
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.values: Dict[tuple, object] = {}
+        self.hits = 0
+
+    def lookup(self, key: tuple):
+        value = self.values.get(key)
+        if value is not None:
+            self.hits += 1
+        return value
+
+    def add(self, key: tuple, value):
+        self.values[key] = value
+
+
+_intern_table: "ContextVar[Optional[InternTable]]" = ContextVar("_intern_table", default=None)
+
+
+@contextmanager
+def interning(enabled: bool = True) -> Iterator[InternTable]:
+    """Parse calls within the block share one table, if enabled is False values are not interned at all"""
+    table = InternTable(enabled)
+    token = _intern_table.set(table)
+    try:
+        yield table
+    finally:
+        _intern_table.reset(token)
+
+
+def _intern_key(value):
+    """Returns a hashable key for the content of value, INVALID if value cannot be interned"""
+    if value is None or isinstance(value, (str, bool, Enum)):
+        return value
+    if isinstance(value, list):
+        keys = tuple(_intern_key(i) for i in value)
+        return INVALID if INVALID in keys else keys
+    # Parts of interned values are interned themselves, so equal parts are the same object
+    if isinstance(value, StringFormattedValue) or is_interned(type(value)):
+        return id(value)
+    return INVALID
+
+
 def parse_string_formatted_value(
     cls: StringFormattedValueType, value: Adapter, result: AasTestResult
 ) -> StringFormattedValue:
     try:
-        return cls.construct(value.as_string())
+        raw_value = value.as_string()
+        table = _intern_table.get()
+        if table is None or not table.enabled:
+            return cls.construct(raw_value)
+        key = (cls.cls, raw_value)
+        obj = table.lookup(key)
+        if obj is None:
+            obj = cls.construct(raw_value)
+            table.add(key, obj)
+        return obj
     except (AdapterException, ValueError) as e:
         result.append(AasTestResult(f"{e} @ {value.path}", level=Level.ERROR))
     return INVALID
 
 
-def parse_list(item_cls: ListType, value: Adapter, result: AasTestResult, allow_empty: bool) -> list:
-    try:
-        items = value.as_list(allow_empty)
-    except AdapterException as e:
-        result.append(AasTestResult(f"{e} @ {value.path}", level=Level.ERROR))
-        return INVALID
-    return [parse(item_cls.item_type, i, result) for i in items]
-
-
 def parse_bool(value: Adapter, result: AasTestResult) -> bool:
     try:
         return value.as_bool()
@@ -90,119 +154,319 @@ def parse_enum(cls: EnumType, value: Adapter, result: AasTestResult):
     return INVALID
 
 
-def parse_abstract_object(cls: ClassType, adapter: Adapter, result: AasTestResult):
-    try:
-        discriminator = adapter.get_model_type()
-    except AdapterException as e:
-        result.append(AasTestResult(f"{e} @ {adapter.path}", level=Level.ERROR))
-        return INVALID
-    subclass = None
-    for subclass in cls.subclasses:
-        if subclass.cls.__name__ == discriminator:
-            return parse_concrete_object(subclass, adapter, result)
-    result.append(
-        AasTestResult(
-            f"Invalid model type {discriminator} @ {adapter.path}",
-            level=Level.ERROR,
-        )
-    )
-    return INVALID
+Parser = Callable[[Adapter, AasTestResult], any]
+
+# Parsers are compiled once per type and cached by identity of the type
+_parsers: Dict[any, Parser] = {}
+# Parsers being compiled, these may still contain unresolved forward references
+_compiling: Dict[any, Parser] = {}
+_compile_lock = threading.RLock()
 
 
-def parse_concrete_object(cls: ClassType, adapter: Adapter, result: AasTestResult):
+def _compile_cached(key, build: Callable[[], Parser]) -> Parser:
     try:
-        obj = adapter.as_object()
-    except AdapterException as e:
-        result.append(AasTestResult(f"{e} @ {adapter.path}", level=Level.ERROR))
-        return INVALID
-    if has_requires_model_type(cls.cls):
+        return _parsers[key]
+    except KeyError:
+        pass
+    with _compile_lock:
         try:
-            discriminator = adapter.get_model_type()
-            if discriminator != cls.cls.__name__:
-                result.append(AasTestResult(f"Wrong model type @ {adapter.path}", level=Level.ERROR))
+            return _parsers.get(key) or _compiling[key]
+        except KeyError:
+            pass
+        outermost = not _compiling
+        parser = None
+        # Register a forward reference first, recursive types refer to themselves
+        _compiling[key] = lambda obj_value, result: parser(obj_value, result)
+        try:
+            parser = build()
+            _compiling[key] = parser
+            if outermost:
+                # All forward references are resolved now, publish the parsers to other threads
+                _parsers.update(_compiling)
+        finally:
+            if outermost:
+                _compiling.clear()
+        return parser
+
+
+def _compile_list(cls: ListType) -> Parser:
+    item_parser = compile_parser(cls.item_type)
+    allow_empty = cls.allow_empty
+
+    def parse_list(value: Adapter, result: AasTestResult) -> list:
+        try:
+            items = value.as_list(allow_empty)
         except AdapterException as e:
-            result.append(AasTestResult(f"Model typ missing @ {adapter.path}", level=Level.ERROR))
+            result.append(AasTestResult(f"{e} @ {value.path}", level=Level.ERROR))
+            return INVALID
+        parsed = []
+        for i in items:
+            if budget_exhausted():
+                return INVALID
+            parsed.append(item_parser(i, result))
+        return parsed
+
+    return parse_list
+
 
-    args = {}
-    all_fields = set()
-    for field in cls.attrs:
-        field_name = field.force_name or to_lower_camel_case(field.name)
-        all_fields.add(field_name)
+def _compile_abstract_object(cls: ClassType) -> Parser:
+    parsers = {}
+    for subclass in cls.subclasses:
+        parsers.setdefault(subclass.cls.__name__, _compile_concrete_object(subclass))
+
+    def parse_abstract_object(adapter: Adapter, result: AasTestResult):
         try:
-            obj_value = obj[field_name]
+            discriminator = adapter.get_model_type()
+        except AdapterException as e:
+            result.append(AasTestResult(f"{e} @ {adapter.path}", level=Level.ERROR))
+            return INVALID
+        try:
+            parser = parsers[discriminator]
         except KeyError:
-            if field.required:
-                result.append(
-                    AasTestResult(
-                        f"Missing attribute {field_name} @ {adapter.path}",
-                        level=Level.ERROR,
-                    )
-                )
-                args[field.name] = INVALID
-            else:
-                args[field.name] = None
-            continue
-        args[field.name] = parse(field.type, obj_value, result)
-
-    # Check unknown additional attributes
-    for key in obj.keys():
-        if key not in all_fields:
             result.append(
                 AasTestResult(
-                    f"Unknown additional attribute {key} @ {adapter.path}",
+                    f"Invalid model type {discriminator} @ {adapter.path}",
                     level=Level.ERROR,
                 )
             )
+            return INVALID
+        return parser(adapter, result)
 
-    return cls.construct(args)
+    return parse_abstract_object
 
 
-def parse(cls: TypeBase, obj_value: Adapter, result: AasTestResult):
+def _compile_concrete_object(cls: ClassType) -> Parser:
+    return _compile_cached((cls, "concrete"), lambda: _build_concrete_object(cls))
+
+
+def _build_concrete_object(cls: ClassType) -> Parser:
+    attrs = [
+        (field.name, field.force_name or to_lower_camel_case(field.name), field.required, compile_parser(field.type))
+        for field in cls.attrs
+    ]
+    all_fields = frozenset(field_name for _, field_name, _, _ in attrs)
+    check_model_type = has_requires_model_type(cls.cls)
+    model_type = cls.cls.__name__
+    construct = cls.construct
+    intern = is_interned(cls.cls)
+
+    def parse_concrete_object(adapter: Adapter, result: AasTestResult):
+        if budget_exhausted():
+            return INVALID
+        try:
+            obj = adapter.as_object()
+        except AdapterException as e:
+            result.append(AasTestResult(f"{e} @ {adapter.path}", level=Level.ERROR))
+            return INVALID
+        if check_model_type:
+            try:
+                discriminator = adapter.get_model_type()
+                if discriminator != model_type:
+                    result.append(AasTestResult(f"Wrong model type @ {adapter.path}", level=Level.ERROR))
+            except AdapterException as e:
+                result.append(AasTestResult(f"Model typ missing @ {adapter.path}", level=Level.ERROR))
+
+        args = {}
+        num_present = 0
+        for name, field_name, required, field_parser in attrs:
+            try:
+                obj_value = obj[field_name]
+            except KeyError:
+                if required:
+                    result.append(
+                        AasTestResult(
+                            f"Missing attribute {field_name} @ {adapter.path}",
+                            level=Level.ERROR,
+                        )
+                    )
+                    args[name] = INVALID
+                else:
+                    args[name] = None
+                continue
+            num_present += 1
+            args[name] = field_parser(obj_value, result)
+
+        # Check unknown additional attributes, only needed if there are more keys than known attributes found
+        if len(obj) != num_present:
+            for key in obj:
+                if key not in all_fields:
+                    result.append(
+                        AasTestResult(
+                            f"Unknown additional attribute {key} @ {adapter.path}",
+                            level=Level.ERROR,
+                        )
+                    )
+
+        if intern:
+            table = _intern_table.get()
+            if table is not None and table.enabled:
+                key = _intern_key(list(args.values()))
+                if key is not INVALID:
+                    key = (cls.cls, key)
+                    obj = table.lookup(key)
+                    if obj is None:
+                        obj = construct(args)
+                        table.add(key, obj)
+                    return obj
+        return construct(args)
+
+    return parse_concrete_object
+
+
+def _compile_class(cls: ClassType) -> Parser:
+    if cls.is_abstract():
+        return _compile_abstract_object(cls)
+    parse_concrete_object = _compile_concrete_object(cls)
+    if not hasattr(cls.cls, "post_parse"):
+        return parse_concrete_object
+
+    def parse_object(adapter: Adapter, result: AasTestResult):
+        obj = parse_concrete_object(adapter, result)
+        if obj is not INVALID and result.ok():
+            obj.post_parse()
+        return obj
+
+    return parse_object
+
+
+def _compile(cls: TypeBase) -> Parser:
     if isinstance(cls, ListType):
-        return parse_list(cls, obj_value, result, cls.allow_empty)
+        return _compile_list(cls)
     elif isinstance(cls, ClassType):
-        if cls.is_abstract():
-            return parse_abstract_object(cls, obj_value, result)
-        else:
-            obj = parse_concrete_object(cls, obj_value, result)
-            post_parse = getattr(obj, "post_parse", None)
-            if post_parse and result.ok():
-                post_parse()
-            return obj
+        return _compile_class(cls)
     elif isinstance(cls, BoolType):
-        return parse_bool(obj_value, result)
+        return parse_bool
     elif isinstance(cls, StringType):
-        return parse_string(obj_value, result)
+        return parse_string
     elif isinstance(cls, AnyType):
-        return obj_value
+        return lambda obj_value, result: obj_value
     elif isinstance(cls, EnumType):
-        return parse_enum(cls, obj_value, result)
+        return lambda obj_value, result: parse_enum(cls, obj_value, result)
     elif isinstance(cls, StringFormattedValueType):
-        return parse_string_formatted_value(cls, obj_value, result)
-    raise NotImplementedError(
-        f"There is no parsing implemented for:\n"
-        f"  args:      {getattr(cls, '__args__', None)}\n"
-        f"  obj_value: {obj_value}\n"
-        f"  cls:       {cls}\n"
-    )
+        return lambda obj_value, result: parse_string_formatted_value(cls, obj_value, result)
+
+    def parse_unknown(obj_value: Adapter, result: AasTestResult):
+        raise NotImplementedError(
+            f"There is no parsing implemented for:\n"
+            f"  args:      {getattr(cls, '__args__', None)}\n"
+            f"  obj_value: {obj_value}\n"
+            f"  cls:       {cls}\n"
+        )
 
+    return parse_unknown
 
-def check_constraints(obj, result: AasTestResult, path: AdapterPath = AdapterPath()):
-    if not is_dataclass(obj):
+
+def compile_parser(cls: TypeBase) -> Parser:
+    """
+    Returns a function parsing an adapter into an instance of cls.
+    The dispatch on the kind of type, the attribute names and the set of allowed attributes are resolved only once.
+    """
+    return _compile_cached(cls, lambda: _compile(cls))
+
+
+def parse(cls: TypeBase, obj_value: Adapter, result: AasTestResult):
+    if _intern_table.get() is not None:
+        return compile_parser(cls)(obj_value, result)
+    with interning():
+        return compile_parser(cls)(obj_value, result)
+
+
+def _is_leaf(annotation) -> bool:
+    """Returns True if values of the annotated type cannot contain dataclasses, e.g. strings or enums"""
+    origin = getattr(annotation, "__origin__", None)
+    if origin is Union:
+        return all(_is_leaf(i) for i in annotation.__args__)
+    if isinstance(origin, type) and issubclass(origin, list):
+        return _is_leaf(annotation.__args__[0])
+    return isinstance(annotation, type) and annotation is not object and not is_dataclass(annotation)
+
+
+class _ConstraintPlan:
+    def __init__(self, cls: type):
+        self.check_fns = [getattr(cls, i) for i in dir(cls) if i.startswith("check_")]
+        try:
+            hints = get_type_hints(cls)
+        except Exception:
+            # Cannot tell which fields are leaves, descend into all of them
+            hints = {}
+        self.field_names = [i.name for i in fields(cls) if i.name not in hints or not _is_leaf(hints[i.name])]
+
+
+_constraint_plans: Dict[type, _ConstraintPlan] = {}
+
+
+class DeferredChecks:
+    """
+    Checks of single values collected while checking the constraints of an object, so that all values of the same
+    kind can be checked at once afterwards. For each kind, find_invalid(key, values) returns the invalid values and
+    describe(key, value, context) the message for one of them.
+    Findings are appended after all other constraint findings.
+    """
+
+    __slots__ = ("path", "groups")
+
+    def __init__(self):
+        self.path = AdapterPath()
+        self.groups: Dict[object, Tuple[Callable, Callable, list]] = {}
+
+    def add(self, key, find_invalid: Callable, describe: Callable, value, context=None):
+        try:
+            entries = self.groups[key][2]
+        except KeyError:
+            entries = []
+            self.groups[key] = (find_invalid, describe, entries)
+        entries.append((value, context, self.path))
+
+    def run(self, result: AasTestResult):
+        for key, (find_invalid, describe, entries) in self.groups.items():
+            invalid = find_invalid(key, [i[0] for i in entries])
+            if not invalid:
+                continue
+            for value, context, path in entries:
+                if value in invalid:
+                    if budget_exhausted():
+                        return
+                    result.append(AasTestResult(f"{describe(key, value, context)} @ {path}", level=Level.ERROR))
+
+
+_deferred_checks: "ContextVar[Optional[DeferredChecks]]" = ContextVar("_deferred_checks", default=None)
+
+
+def deferred_checks() -> Optional[DeferredChecks]:
+    """Returns the checks to be run at the end of the current check_constraints call, None outside of one"""
+    return _deferred_checks.get()
+
+
+def _check_constraints(obj, result: AasTestResult, path: AdapterPath, deferred: DeferredChecks):
+    if not is_dataclass(obj) or budget_exhausted():
         return
-    fns = [getattr(obj, i) for i in dir(obj) if i.startswith("check_")]
-    for fn in fns:
+    try:
+        plan = _constraint_plans[type(obj)]
+    except KeyError:
+        plan = _constraint_plans[type(obj)] = _ConstraintPlan(type(obj))
+    deferred.path = path
+    for fn in plan.check_fns:
         try:
-            fn()
+            fn(obj)
         except CheckConstraintException as e:
             result.append(AasTestResult(f"{e} @ {path}", level=e.level))
-    for field in fields(obj):
-        value = getattr(obj, field.name)
+    for name in plan.field_names:
+        value = getattr(obj, name)
         if isinstance(value, list):
             for idx, i in enumerate(value):
-                check_constraints(i, result, path + field.name + idx)
+                _check_constraints(i, result, path + name + idx, deferred)
         else:
-            check_constraints(value, result, path + field.name)
+            _check_constraints(value, result, path + name, deferred)
+
+
+def check_constraints(obj, result: AasTestResult, path: AdapterPath = AdapterPath()):
+    deferred = DeferredChecks()
+    token = _deferred_checks.set(deferred)
+    try:
+        _check_constraints(obj, result, path, deferred)
+    finally:
+        _deferred_checks.reset(token)
+    deferred.run(result)
 
 
 def _parse_and_check(cls, adapter: Adapter) -> Tuple[object, AasTestResult]:
@@ -219,6 +483,139 @@ def _parse_and_check(cls, adapter: Adapter) -> Tuple[object, AasTestResult]:
     return result_root, env
 
 
+class StreamItem:
+    """
+    An attribute of the root object (or an item of a list attribute) which is parsed and checked on its own
+    """
+
+    def __init__(self, attribute: str, cls: TypeBase, adapter: Adapter, path: AdapterPath):
+        self.attribute = attribute
+        self.cls = cls
+        self.adapter = adapter
+        self.path = path
+
+
+# Meta model result, constraint result and additional results of a single StreamItem
+StreamItemResult = Tuple[AasTestResult, AasTestResult, List[AasTestResult]]
+
+
+def iter_stream_items(cls: ClassType, adapter: Adapter) -> Iterator[Union[StreamItem, AasTestResult]]:
+    """
+    Walks the attributes of the object given by adapter without constructing it.
+    Errors concerning the object itself are yielded in between the items in document order.
+    """
+    attrs = {field.force_name or to_lower_camel_case(field.name): field for field in cls.attrs}
+    present = set()
+    unknown = []
+    try:
+        for key, value in adapter.iter_object():
+            try:
+                field = attrs[key]
+            except KeyError:
+                unknown.append(key)
+                continue
+            present.add(key)
+            if isinstance(field.type, ListType):
+                try:
+                    for idx, item in enumerate(value.iter_list(field.type.allow_empty)):
+                        yield StreamItem(field.name, field.type.item_type, item, AdapterPath() + field.name + idx)
+                except AdapterException as e:
+                    yield AasTestResult(f"{e} @ {value.path}", level=Level.ERROR)
+            else:
+                yield StreamItem(field.name, field.type, value, AdapterPath() + field.name)
+    except AdapterException as e:
+        yield AasTestResult(f"{e} @ {adapter.path}", level=Level.ERROR)
+        return
+    for key, field in attrs.items():
+        if field.required and key not in present:
+            yield AasTestResult(f"Missing attribute {key} @ {adapter.path}", level=Level.ERROR)
+    for key in unknown:
+        yield AasTestResult(f"Unknown additional attribute {key} @ {adapter.path}", level=Level.ERROR)
+
+
+def check_stream_item(
+    cls: TypeBase,
+    adapter: Adapter,
+    path: AdapterPath,
+    on_item: Callable[[object], Optional[AasTestResult]],
+    check: bool = True,
+) -> StreamItemResult:
+    """
+    Parses and checks a single item. If check is False or any errors are found, the remaining steps are skipped.
+    """
+    result_meta_model = AasTestResult("Check meta model")
+    result_constraints = AasTestResult("Check constraints")
+    additional_results = []
+    obj = parse(cls, adapter, result_meta_model)
+    if check and result_meta_model.ok():
+        check_constraints(obj, result_constraints, path)
+        if result_constraints.ok():
+            additional_result = on_item(obj)
+            if additional_result:
+                additional_results.append(additional_result)
+    return result_meta_model, result_constraints, additional_results
+
+
+def check_stream_items(
+    entries: Iterator[Union[StreamItem, AasTestResult]], on_item: Callable[[object], Optional[AasTestResult]]
+) -> Iterator[Union[StreamItemResult, AasTestResult]]:
+    ok = True
+    for entry in entries:
+        if budget_exhausted():
+            return
+        if isinstance(entry, AasTestResult):
+            ok = ok and entry.ok()
+            yield entry
+            continue
+        item_result = check_stream_item(entry.cls, entry.adapter, entry.path, on_item, ok)
+        # Like _parse_and_check, constraints are checked for all items unless the meta model is violated
+        ok = ok and item_result[0].ok()
+        yield item_result
+
+
+def parse_and_check_stream(
+    cls: ClassType,
+    adapter: Adapter,
+    on_item: Callable[[object], Optional[AasTestResult]],
+    check_items: Callable[
+        [Iterator[Union[StreamItem, AasTestResult]]], Iterator[Union[StreamItemResult, AasTestResult]]
+    ] = None,
+) -> AasTestResult:
+    """
+    Like _parse_and_check, but parses and checks the attributes of the root object one list item at a time.
+    Items are handed to check_items which may process them in any way, as long as results are returned in order.
+    The results of on_item are appended if no errors have been found in any item.
+    Constraints defined on cls itself are not checked.
+    """
+    if check_items is None:
+        check_items = lambda entries: check_stream_items(entries, on_item)
+    result_root = AasTestResult("Check")
+    result_meta_model = AasTestResult("Check meta model")
+    result_constraints = AasTestResult("Check constraints")
+    additional_results = []
+    for entry in check_items(iter_stream_items(cls, adapter)):
+        if isinstance(entry, AasTestResult):
+            result_meta_model.append(entry)
+            continue
+        item_meta_model, item_constraints, item_additional = entry
+        for i in item_meta_model.sub_results:
+            result_meta_model.append(i)
+        if not result_meta_model.ok():
+            continue
+        for i in item_constraints.sub_results:
+            result_constraints.append(i)
+        additional_results.extend(item_additional)
+    result_root.append(result_meta_model)
+    if result_root.ok():
+        result_root.append(result_constraints)
+        if result_constraints.ok():
+            for i in additional_results:
+                result_root.append(i)
+    else:
+        result_root.append(AasTestResult("Skipped checking of constraints", Level.WARNING))
+    return result_root
+
+
 def parse_and_check_json(t: TypeBase, value: any) -> Tuple[AasTestResult, object]:
     return _parse_and_check(t, JsonAdapter(value, AdapterPath()))
 
@@ -1,10 +1,10 @@
 from typing import Optional, Tuple, Dict, List
 from dataclasses import dataclass, field
-from aas_test_engines.result import AasTestResult, Level
+from aas_test_engines.result import AasTestResult, Level, enabled, budget_exhausted
 from enum import Enum
 import datetime
 
-from .model import Environment
+from .model import Environment, Submodel
 from .parse_submodel import parse_submodel, LangString
 from .parse import check_constraints, CheckConstraintException
 from .adapter import AdapterPath
@@ -330,22 +330,31 @@ class DigitalNameplate:
             raise CheckConstraintException("Either ManufacturerProductFamily or ManufacturerProductType is required")
 
 
+def check_submodel_template(submodel: Submodel) -> Optional[AasTestResult]:
+    if not submodel.semantic_id or not submodel.semantic_id.keys:
+        return None
+    sid = submodel.semantic_id.keys[0].value.raw_value
+    sub_result = AasTestResult(f"Check submodel '{submodel.id}'")
+    try:
+        template = templates[sid]
+    except KeyError:
+        sub_result.append(AasTestResult(f"Unknown semantic id '{sid}'", level=Level.WARNING))
+        return None
+    if enabled(Level.INFO):
+        sub_result.append(AasTestResult(f"Template: {template.__name__} ({sid})"))
+    parsed_submodel = parse_submodel(sub_result, template, submodel)
+    if sub_result.ok():
+        check_constraints(parsed_submodel, sub_result, AdapterPath())
+    return sub_result
+
+
 def parse_submodel_templates(root_result: AasTestResult, env: Environment):
     for submodel in env.submodels or []:
-        if not submodel.semantic_id or not submodel.semantic_id.keys:
-            continue
-        sid = submodel.semantic_id.keys[0].value.raw_value
-        sub_result = AasTestResult(f"Check submodel '{submodel.id}'")
-        try:
-            template = templates[sid]
-        except KeyError:
-            sub_result.append(AasTestResult(f"Unknown semantic id '{sid}'", level=Level.WARNING))
-            continue
-        sub_result.append(AasTestResult(f"Template: {template.__name__} ({sid})"))
-        parsed_submodel = parse_submodel(sub_result, template, submodel)
-        if sub_result.ok():
-            check_constraints(parsed_submodel, sub_result, AdapterPath())
-        root_result.append(sub_result)
+        if budget_exhausted():
+            return
+        sub_result = check_submodel_template(submodel)
+        if sub_result:
+            root_result.append(sub_result)
 
 
 def supported_templates() -> List[str]:
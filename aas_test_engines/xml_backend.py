@@ -0,0 +1,105 @@
+"""
+Parsing of XML documents using either the standard library or lxml, if installed.
+Both backends produce trees with the same interface. Comments and processing instructions are dropped in both,
+and syntax errors are raised as one of PARSE_ERRORS.
+"""
+
+from typing import IO, Iterator, List, Optional, Tuple, Union
+from xml.etree import ElementTree
+import codecs
+import io
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+if lxml_etree is not None:
+    PARSE_ERRORS: Tuple[type, ...] = (ElementTree.ParseError, lxml_etree.XMLSyntaxError)
+else:
+    PARSE_ERRORS = (ElementTree.ParseError,)
+
+
+def available_backends() -> List[str]:
+    """Returns the names of the installed backends, fastest first"""
+    if lxml_etree is not None:
+        return ["lxml", "etree"]
+    return ["etree"]
+
+
+def _resolve(name: Optional[str]) -> str:
+    if name is None:
+        return "etree"
+    if name == "auto":
+        return available_backends()[0]
+    if name not in available_backends():
+        raise ValueError(f"Unknown XML backend '{name}', must be one of auto, {', '.join(available_backends())}")
+    return name
+
+
+def _lxml_parser(encoding: Optional[str] = None):
+    # Do not resolve external entities, the documents are untrusted
+    return lxml_etree.XMLParser(
+        remove_comments=True, remove_pis=True, resolve_entities=False, no_network=True, encoding=encoding
+    )
+
+
+class _EncodingReader:
+    """Reads a text stream as UTF-8 encoded bytes, one chunk at a time"""
+
+    def __init__(self, file: IO[str]):
+        self.file = file
+        self.encoder = codecs.getincrementalencoder("utf-8")()
+        self.buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            data = self.buffer + self.encoder.encode(self.file.read(), final=True)
+            self.buffer = b""
+            return data
+        while len(self.buffer) < size:
+            chunk = self.file.read(size)
+            self.buffer += self.encoder.encode(chunk, final=not chunk)
+            if not chunk:
+                break
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+def fromstring(data: Union[str, bytes], backend: Optional[str] = None):
+    if _resolve(backend) == "etree":
+        return ElementTree.fromstring(data)
+    if isinstance(data, str):
+        # lxml refuses strings with an encoding declaration, hence we pass bytes and override the declaration
+        return lxml_etree.fromstring(data.encode(), _lxml_parser("utf-8"))
+    return lxml_etree.fromstring(data, _lxml_parser())
+
+
+def tostring(element) -> bytes:
+    """Serializes an element of either backend without its tail, e.g. to pass it to another process"""
+    if lxml_etree is not None and isinstance(element, lxml_etree._Element):
+        return lxml_etree.tostring(element, with_tail=False)
+    tail, element.tail = element.tail, None
+    try:
+        return ElementTree.tostring(element)
+    finally:
+        element.tail = tail
+
+
+def iterparse(file: IO, events: Tuple[str, ...], backend: Optional[str] = None) -> Iterator[Tuple[str, any]]:
+    if _resolve(backend) == "etree":
+        return ElementTree.iterparse(file, events=events)
+    encoding = None
+    if isinstance(file, io.TextIOBase):
+        # lxml reads bytes only, the text is already decoded so its encoding declaration must be ignored
+        file = _EncodingReader(file)
+        encoding = "utf-8"
+    return lxml_etree.iterparse(
+        file,
+        events=events,
+        remove_comments=True,
+        remove_pis=True,
+        resolve_entities=False,
+        no_network=True,
+        encoding=encoding,
+    )
@@ -139,7 +139,7 @@ def main():
             )
             result, mat = execute_tests(client, conf)
             with open(result_file, "w") as f:
-                f.write(result.to_html())
+                result.write_html(f)
             profile.mats.append(mat)
             # to save some time, we are not gentle here
             docker_compose(server_dir, 'kill')
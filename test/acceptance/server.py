@@ -115,7 +115,7 @@ for param in params:
     result, mat = api.execute_tests(client, conf)
     mat.print()
     with open("output.html", "w") as f:
-        f.write(result.to_html())
+        result.write_html(f)
     # TODO
     # assert result.ok()
     assert mat.valid_rejected == param.valid_rejected
@@ -0,0 +1,49 @@
+#! /usr/bin/env python3
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+
+def measure(module: str) -> Dict[str, List[int]]:
+    """Returns the self and cumulative import time in microseconds of each imported module"""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = [int(self_time), int(cumulative)]
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the time needed to import aas_test_engines")
+    parser.add_argument("--module", default="aas_test_engines.api")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest modules to show")
+    args = parser.parse_args()
+
+    # Warm up, e.g. write the byte code caches
+    measure(args.module)
+    runs = [measure(args.module) for _ in range(args.rounds)]
+    medians = {
+        name: [statistics.median(run[name][i] for run in runs) for i in range(2)]
+        for name in runs[0]
+        if name.startswith("aas_test_engines")
+    }
+    print(f"{'module':>60} {'self':>10} {'cumulative':>10}")
+    for name, (self_time, cumulative) in sorted(medians.items(), key=lambda i: i[1][0], reverse=True)[: args.top]:
+        print(f"{name:>60} {self_time / 1e3:8.1f}ms {cumulative / 1e3:8.1f}ms")
+    print(f"{'total':>60} {'':>10} {medians[args.module][1] / 1e3:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
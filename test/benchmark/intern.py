@@ -0,0 +1,53 @@
+#! /usr/bin/env python3
+
+import argparse
+import json
+import os
+import tracemalloc
+
+from aas_test_engines.result import AasTestResult
+from aas_test_engines.test_cases.v3_0.adapter import JsonAdapter, AdapterPath
+from aas_test_engines.test_cases.v3_0.model import symbol_table
+from aas_test_engines.test_cases.v3_0.parse import parse, interning
+from parse import find_files
+
+
+def measure(data, enabled: bool):
+    cls = symbol_table.lookup("Environment")
+    # Compile the parsers before measuring
+    parse(cls, JsonAdapter(data, AdapterPath()), AasTestResult("Parse"))
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    with interning(enabled) as table:
+        env = parse(cls, JsonAdapter(data, AdapterPath()), AasTestResult("Parse"))
+    # The table is freed with the end of the parse call, only the environment is kept
+    del table.values
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(i.size_diff for i in end.compare_to(start, "filename"))
+    del env
+    return size, table.hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the memory used by parsed environments")
+    parser.add_argument("--files", type=int, default=5, help="number of largest files to measure")
+    parser.add_argument("--repeat", type=int, default=1, help="repeat the submodels of each file, with new ids")
+    args = parser.parse_args()
+
+    files = sorted(find_files(), key=os.path.getsize, reverse=True)[: args.files]
+    for path in files:
+        with open(path) as f:
+            data = json.load(f)
+        submodels = data.get("submodels", [])
+        data["submodels"] = [{**i, "id": f"{i['id']}/{n}"} for n in range(args.repeat) for i in submodels]
+        before, _ = measure(data, False)
+        after, hits = measure(data, True)
+        print(
+            f"{os.path.basename(path)[:40]:>40}: {before / 1e3:8.1f} kB -> {after / 1e3:8.1f} kB "
+            f"(saved {100 * (1 - after / before):.0f}%, {hits} shared values)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#! /usr/bin/env python3
+
+import argparse
+import io
+import time
+
+from aas_test_engines import json_decoder
+from aas_test_engines.file import check_json_file
+from parse import find_files
+
+
+def measure(documents, rounds: int, decoder) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for document in documents:
+            check_json_file(io.BytesIO(document), json_decoder=decoder)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares decode plus validate time of the JSON decoders")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    documents = []
+    for path in find_files():
+        with open(path, "rb") as f:
+            documents.append(f.read())
+    size = sum(len(i) for i in documents) * args.rounds / 1e6
+
+    # Decoding only
+    for decoder in json_decoder.available_decoders():
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for document in documents:
+                json_decoder.loads(document, decoder)
+        duration = time.perf_counter() - start
+        print(f"decode {decoder:>8}: {duration:.3f}s ({size / duration:.1f} MB/s)")
+    # Decoding and validation, None streams the document
+    for decoder in [None] + json_decoder.available_decoders():
+        duration = measure(documents, args.rounds, decoder)
+        print(f"check  {decoder or 'stream':>8}: {duration:.3f}s ({size / duration:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
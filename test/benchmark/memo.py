@@ -0,0 +1,46 @@
+#! /usr/bin/env python3
+
+import argparse
+import time
+
+from aas_test_engines import memo
+from aas_test_engines.file import check_json_data
+from aas_test_engines.json_decoder import load
+from parse import find_files
+
+
+def measure(documents, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for document in documents:
+            check_json_data(document)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares checking time with and without the validator caches")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--cache-size", type=int, default=memo.DEFAULT_CACHE_SIZE)
+    args = parser.parse_args()
+
+    documents = []
+    for path in find_files():
+        with open(path, "rb") as f:
+            documents.append(load(f))
+
+    # Warm up, e.g. the reflection of the meta model
+    measure(documents, 1)
+    memo.set_cache_size(0)
+    uncached = measure(documents, args.rounds)
+    memo.set_cache_size(args.cache_size)
+    cached = measure(documents, args.rounds)
+    print(f"no caches:         {uncached:.3f}s")
+    print(f"cache size {args.cache_size:>6}: {cached:.3f}s ({uncached / cached:.2f}x)")
+    for name, stats in memo.cache_stats().items():
+        if stats.hits + stats.misses == 0:
+            continue
+        print(f"  {name:>20}: {stats.hit_rate:6.1%} hits, {stats.currsize} entries")
+
+
+if __name__ == "__main__":
+    main()
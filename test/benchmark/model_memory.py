@@ -0,0 +1,81 @@
+#! /usr/bin/env python3
+
+import argparse
+import json
+import tracemalloc
+from dataclasses import fields, is_dataclass
+
+from aas_test_engines.result import AasTestResult
+from aas_test_engines.test_cases.v3_0.adapter import JsonAdapter, AdapterPath
+from aas_test_engines.test_cases.v3_0.model import symbol_table
+from aas_test_engines.test_cases.v3_0.parse import parse
+from parse import find_files
+
+
+def collect(value, instances: list):
+    if is_dataclass(value):
+        instances.append(value)
+        for field in fields(value):
+            collect(getattr(value, field.name), instances)
+    elif isinstance(value, list):
+        for i in value:
+            collect(i, instances)
+
+
+_dict_classes = {}
+
+
+def dict_copy(obj):
+    """Copies obj into an instance of a class without __slots__, i.e. the previous layout"""
+    cls = type(obj)
+    try:
+        dict_cls = _dict_classes[cls]
+    except KeyError:
+        dict_cls = _dict_classes[cls] = type(cls.__name__, (), {})
+    copy = dict_cls()
+    for field in fields(obj):
+        setattr(copy, field.name, getattr(obj, field.name))
+    return copy
+
+
+def slotted_copy(obj):
+    cls = type(obj)
+    copy = cls.__new__(cls)
+    for field in fields(obj):
+        object.__setattr__(copy, field.name, getattr(obj, field.name))
+    return copy
+
+
+def measure(instances: list, copy) -> int:
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    copies = [copy(i) for i in instances]
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(i.size_diff for i in end.compare_to(start, "filename"))
+    # Do not count the list holding the copies
+    size -= copies.__sizeof__()
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the memory used by the objects of parsed environments")
+    parser.parse_args()
+
+    cls = symbol_table.lookup("Environment")
+    instances = []
+    for path in find_files():
+        with open(path) as f:
+            data = json.load(f)
+        collect(parse(cls, JsonAdapter(data, AdapterPath()), AasTestResult("Parse")), instances)
+
+    before = measure(instances, dict_copy)
+    after = measure(instances, slotted_copy)
+    print(f"{len(instances)} objects")
+    print(f"dict layout:  {before / len(instances):.1f} bytes/object")
+    print(f"__slots__:    {after / len(instances):.1f} bytes/object")
+    print(f"saved:        {(before - after) / 1e6:.2f} MB ({100 * (1 - after / before):.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#! /usr/bin/env python3
+
+import argparse
+import glob
+import json
+import os
+import time
+
+from aas_test_engines.result import AasTestResult
+from aas_test_engines.test_cases.v3_0.adapter import JsonAdapter, AdapterPath
+from aas_test_engines.test_cases.v3_0.model import symbol_table
+from aas_test_engines.test_cases.v3_0.parse import parse
+
+script_dir = os.path.dirname(os.path.realpath(__file__))
+
+
+def find_files():
+    files = glob.glob(
+        os.path.join(
+            script_dir, "../fixtures/aas-core3.0-testgen/test_data/Json/ContainedInEnvironment/Expected/**/*.json"
+        ),
+        recursive=True,
+    )
+    if not files:
+        print("aas-core3.0-testgen fixtures not found, falling back to fixtures/submodel_templates")
+        files = glob.glob(os.path.join(script_dir, "../fixtures/submodel_templates/*.json"))
+    return files
+
+
+def count_nodes(value) -> int:
+    if isinstance(value, dict):
+        return 1 + sum(count_nodes(i) for i in value.values())
+    if isinstance(value, list):
+        return 1 + sum(count_nodes(i) for i in value)
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the throughput of parsing environments")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    documents = []
+    for path in find_files():
+        with open(path) as f:
+            documents.append(json.load(f))
+    nodes = sum(count_nodes(i) for i in documents) * args.rounds
+    cls = symbol_table.lookup("Environment")
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for document in documents:
+            parse(cls, JsonAdapter(document, AdapterPath()), AasTestResult("Parse"))
+    duration = time.perf_counter() - start
+    print(f"{len(documents)} files, {nodes} nodes in {duration:.3f}s: {nodes / duration:.0f} nodes/sec")
+
+
+if __name__ == "__main__":
+    main()
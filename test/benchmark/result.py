@@ -0,0 +1,92 @@
+#! /usr/bin/env python3
+
+import argparse
+import sys
+import time
+import tracemalloc
+from typing import Tuple
+
+from aas_test_engines.result import AasTestResult, Level
+
+
+class DictResult:
+    """Previous layout of AasTestResult: instance dict, own message and own list per node"""
+
+    def __init__(self, message: str, level=Level.INFO):
+        self.message = message
+        self.level = level
+        self.sub_results = []
+
+    def append(self, result: "DictResult"):
+        self.sub_results.append(result)
+        self.level = self.level | result.level
+
+
+class InterningResult(AasTestResult):
+    """AasTestResult interning every message, the layout before only titles of start() were interned"""
+
+    __slots__ = ()
+
+    def __init__(self, message: str, level=Level.INFO):
+        super().__init__(sys.intern(message), level)
+
+
+def build_repeated(cls, num_identifiables: int, num_elements: int):
+    # Mimics the shape of a typical check: few containers with many INFO leaves carrying repeated messages
+    root = cls("Check")
+    for i in range(num_identifiables):
+        identifiable = cls(f"Checking submodel {i}")
+        for j in range(num_elements):
+            element = cls(f"Checking {'SubmodelElementCollection'}")
+            element.append(cls(f"Invoke: {'GET'} {'/submodels'}"))
+            element.append(cls(f"Relationship {'aas-spec'} is of type {'http://admin-shell.io/aasx'}"))
+            identifiable.append(element)
+        root.append(identifiable)
+    return root
+
+
+def build_unique(cls, num_identifiables: int, num_elements: int):
+    # Most messages carry a path or url, titles of contexts are interned by start()
+    root = cls("Check")
+    for i in range(num_identifiables):
+        identifiable = cls(sys.intern(f"Checking submodel {i}"))
+        for j in range(num_elements):
+            element = cls(sys.intern(f"Checking {'SubmodelElementCollection'}"))
+            element.append(cls(f"Invoke: GET /submodels/{i}/submodel-elements/{j}"))
+            element.append(cls(f"Value '{j}' is not a 'xs:int' @ submodels[{i}].submodelElements[{j}]", Level.ERROR))
+            identifiable.append(element)
+        root.append(identifiable)
+    return root
+
+
+def measure(build, cls, num_identifiables: int, num_elements: int) -> Tuple[float, float]:
+    """Returns the memory in bytes and the time in microseconds per node"""
+    nodes = 1 + num_identifiables * (1 + 3 * num_elements)
+    start = time.perf_counter()
+    build(cls, num_identifiables, num_elements)
+    duration = time.perf_counter() - start
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    root = build(cls, num_identifiables, num_elements)
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(i.size_diff for i in end.compare_to(start, "filename"))
+    del root
+    return size / nodes, duration * 1e6 / nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the memory used per result node")
+    parser.add_argument("--identifiables", type=int, default=100)
+    parser.add_argument("--elements", type=int, default=1000)
+    args = parser.parse_args()
+
+    for build in [build_repeated, build_unique]:
+        print(f"{build.__name__[6:]} messages:")
+        for cls in [DictResult, InterningResult, AasTestResult]:
+            size, duration = measure(build, cls, args.identifiables, args.elements)
+            print(f"  {cls.__name__:>16}: {size:6.1f} bytes/node {duration:5.2f} us/node")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#! /usr/bin/env python3
+
+import argparse
+import re
+import timeit
+
+from aas_test_engines.test_cases.v3_0.model import NameTypeString, IdentifierString, ContentType
+
+
+class PreviousInit:
+    """Previous StringFormattedValue.__init__: patterns are looked up in the re module cache on each call"""
+
+    def __init__(self, raw_value: str):
+        self.raw_value = raw_value
+        if self.min_length is not None:
+            if len(raw_value) < self.min_length:
+                raise ValueError(f"String is shorter than {self.min_length} characters")
+        if self.max_length is not None:
+            if len(raw_value) > self.max_length:
+                raise ValueError(f"String is longer than {self.max_length} characters")
+        if re.fullmatch(r"[\x09\x0a\x0d\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]*", raw_value) is None:
+            raise ValueError("Constraint AASd-130 violated: String is not XML serializable")
+        if self.pattern:
+            if re.fullmatch(self.pattern, raw_value) is None:
+                raise ValueError(f"String '{raw_value}' does not match pattern {self.pattern}")
+
+
+def previous(cls):
+    return type(f"Previous{cls.__name__}", (cls,), {"__init__": PreviousInit.__init__})
+
+
+CASES = [
+    (NameTypeString, "ManufacturerName"),
+    (NameTypeString, "Herstellername_\u00e4"),
+    (IdentifierString, "https://admin-shell.io/zvei/nameplate/2/0/Nameplate"),
+    (ContentType, "application/json; charset=utf-8"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the construction time of string formatted values")
+    parser.add_argument("--number", type=int, default=200000)
+    args = parser.parse_args()
+
+    for cls, value in CASES:
+        previous_cls = previous(cls)
+        before = timeit.timeit(lambda: previous_cls(value), number=args.number)
+        after = timeit.timeit(lambda: cls(value), number=args.number)
+        scale = 1e9 / args.number
+        print(
+            f"{cls.__name__:>16} {value[:24]!r:>28}: "
+            f"{before * scale:6.0f} ns -> {after * scale:6.0f} ns ({before / after:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
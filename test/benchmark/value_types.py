@@ -0,0 +1,63 @@
+#! /usr/bin/env python3
+
+import argparse
+import random
+import time
+
+from aas_test_engines.data_types import DataTypeDefXsd, validators, find_invalid
+from aas_test_engines.file import check_json_data
+
+
+def generate_values(num_values: int):
+    # Mimics sensor data: mostly numbers, some timestamps
+    rnd = random.Random(0)
+    values = {
+        DataTypeDefXsd.int: [str(rnd.randint(-1000000, 1000000)) for _ in range(num_values)],
+        DataTypeDefXsd.double: [repr(rnd.uniform(-1e6, 1e6)) for _ in range(num_values)],
+        DataTypeDefXsd.boolean: [rnd.choice(["true", "false"]) for _ in range(num_values)],
+        DataTypeDefXsd.time: [f"{rnd.randint(0, 23):02}:{rnd.randint(0, 59):02}:00Z" for _ in range(num_values)],
+    }
+    return values
+
+
+def generate_environment(num_submodels: int, num_elements: int):
+    rnd = random.Random(0)
+    submodels = []
+    for i in range(num_submodels):
+        elements = [
+            {
+                "idShort": f"p{j}",
+                "modelType": "Property",
+                "valueType": "xs:double",
+                "value": repr(rnd.uniform(-1e6, 1e6)),
+            }
+            for j in range(num_elements)
+        ]
+        submodels.append({"id": f"urn:submodel:{i}", "modelType": "Submodel", "submodelElements": elements})
+    return {"submodels": submodels}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares validating typed values one by one and per type")
+    parser.add_argument("--values", type=int, default=200000)
+    args = parser.parse_args()
+
+    for value_type, values in generate_values(args.values).items():
+        validator = validators[value_type]
+        start = time.perf_counter()
+        for i in values:
+            validator(i)
+        single = time.perf_counter() - start
+        start = time.perf_counter()
+        find_invalid(value_type, values)
+        bulk = time.perf_counter() - start
+        print(f"{value_type.value:>10}: one by one {single:.3f}s, per type {bulk:.3f}s ({single / bulk:.1f}x)")
+
+    data = generate_environment(10, args.values // 10)
+    start = time.perf_counter()
+    check_json_data(data)
+    print(f"check of {args.values} properties: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
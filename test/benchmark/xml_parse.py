@@ -0,0 +1,73 @@
+#! /usr/bin/env python3
+
+import argparse
+import glob
+import io
+import os
+import time
+
+from aas_test_engines import xml_backend
+from aas_test_engines.file import check_xml_file
+
+script_dir = os.path.dirname(os.path.realpath(__file__))
+
+
+def generate(num_submodels: int, num_elements: int) -> bytes:
+    # Used if the aas-core3.0-testgen fixtures are not available
+    parts = ['<environment xmlns="https://admin-shell.io/aas/3/0">\n<submodels>\n']
+    for i in range(num_submodels):
+        parts.append(f"<submodel><id>urn:submodel:{i}</id><submodelElements>\n")
+        for j in range(num_elements):
+            parts.append(
+                f"<property><idShort>prop{j}</idShort><valueType>xs:int</valueType><value>{j}</value></property>\n"
+            )
+        parts.append("</submodelElements></submodel>\n")
+    parts.append("</submodels>\n</environment>\n")
+    return "".join(parts).encode()
+
+
+def find_documents():
+    files = glob.glob(
+        os.path.join(
+            script_dir, "../fixtures/aas-core3.0-testgen/test_data/Xml/ContainedInEnvironment/Expected/**/*.xml"
+        ),
+        recursive=True,
+    )
+    if not files:
+        print("aas-core3.0-testgen fixtures not found, falling back to a generated environment")
+        return [generate(100, 200)]
+    documents = []
+    for path in files:
+        with open(path, "rb") as f:
+            documents.append(f.read())
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares parse plus validate time of the XML backends")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    documents = find_documents()
+    size = sum(len(i) for i in documents) * args.rounds / 1e6
+
+    # Parsing only
+    for backend in xml_backend.available_backends():
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for document in documents:
+                xml_backend.fromstring(document, backend)
+        duration = time.perf_counter() - start
+        print(f"parse  {backend:>5}: {duration:.3f}s ({size / duration:.1f} MB/s)")
+    # Streaming, parsing and validation
+    for backend in xml_backend.available_backends():
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for document in documents:
+                check_xml_file(io.BytesIO(document), xml_backend=backend)
+        duration = time.perf_counter() - start
+        print(f"check  {backend:>5}: {duration:.3f}s ({size / duration:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
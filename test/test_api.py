@@ -1,6 +1,15 @@
 from unittest import TestCase
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+from contextvars import copy_context
 
-from aas_test_engines import api
+from aas_test_engines import api, config, http
+from aas_test_engines.reflect import reflect_function
+from aas_test_engines.result import AasTestResult, Level, start, write, abort, set_verbosity
+from aas_test_engines.test_cases.v3_0.generate import generate_calls
+from aas_test_engines.test_cases.v3_0.interfaces.shared import Base64String
+from aas_test_engines.test_cases.v3_0.interfaces.shared import FixtureCache
 
 
 class SupportedVersionsTest(TestCase):
@@ -10,3 +19,164 @@ class SupportedVersionsTest(TestCase):
         for i in s:
             print(i)
         self.assertIn(api.latest_version(), s)
+
+
+class NotFoundHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    serve_empty_submodels = False
+
+    def do_GET(self):
+        if self.serve_empty_submodels and self.path.split("?")[0] == "/submodels":
+            status = 200
+            body = b'{"result": [], "paging_metadata": {}}'
+        else:
+            status = 404
+            body = b'{"messages": []}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class EmptyRepositoryHandler(NotFoundHandler):
+    serve_empty_submodels = True
+
+
+class ValidatingHandler(EmptyRepositoryHandler):
+
+    def do_GET(self):
+        if "limit=-1" not in self.path:
+            return super().do_GET()
+        body = b'{"messages": []}'
+        self.send_response(400)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ExecuteTestsTest(TestCase):
+
+    suite = "https://admin-shell.io/aas/API/3/0/SubmodelRepositoryServiceSpecification/SSP-002"
+
+    def assertEqualsSerial(self, client: http.HttpClient, dry: bool, filter=None, **kwargs):
+        result, mat = api.execute_tests(client, config.CheckApiConfig(self.suite, dry=dry, filter=filter))
+        result_other, mat_other = api.execute_tests(
+            client, config.CheckApiConfig(self.suite, dry=dry, filter=filter, **kwargs)
+        )
+        self.assertEqual(result_other.to_dict(), result.to_dict())
+        self.assertEqual(vars(mat_other), vars(mat))
+        self.assertGreaterEqual(len(result.sub_results), 3)
+        return mat
+
+    def run_against_server(self, handler, check=None, **kwargs):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            client = http.HttpClient(f"http://127.0.0.1:{server.server_port}")
+            if check:
+                return check(client)
+            return self.assertEqualsSerial(client, False, **kwargs)
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+    def test_parallel_dry(self):
+        self.assertEqualsSerial(http.HttpClient("http://localhost"), True, parallel=4)
+
+    def test_parallel(self):
+        self.run_against_server(NotFoundHandler, parallel=4)
+
+    def test_concurrency(self):
+        mat = self.run_against_server(
+            EmptyRepositoryHandler,
+            filter=config.TestCaseFilter("GetAllSubmodels"),
+            concurrency=4,
+        )
+        self.assertGreater(mat.invalid_accepted + mat.invalid_rejected, 0)
+
+    def test_verbosity(self):
+        def check(client: http.HttpClient):
+            conf = config.CheckApiConfig(self.suite, filter=config.TestCaseFilter("GetAllSubmodels"))
+            _, mat = api.execute_tests(client, conf)
+
+            def quiet():
+                set_verbosity(Level.WARNING)
+                return api.execute_tests(client, conf)
+
+            result, mat_quiet = copy_context().run(quiet)
+            self.assertEqual(vars(mat_quiet), vars(mat))
+            self.assertGreater(mat.invalid_rejected, 0)
+            self.assertGreater(mat.valid_accepted, 0)
+
+        self.run_against_server(ValidatingHandler, check)
+
+
+class GenerateCallsTest(TestCase):
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def generate(self, max_in_flight: int) -> AasTestResult:
+        def fn(limit: int, flag: bool, aas_id: Base64String, cursor: str) -> None:
+            with self.lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            time.sleep(0.05)
+            with self.lock:
+                self.in_flight -= 1
+            write(f"called with {limit} {flag} {aas_id}")
+            if flag == "invalid-bool":
+                abort("rejected")
+
+        with start("Negative Tests") as result:
+            generate_calls(
+                reflect_function(fn), "test", {"limit": 1, "flag": True, "aas_id": "a", "cursor": "c"}, max_in_flight
+            )
+        return result
+
+    def test_threaded_equals_sequential(self):
+        result = self.generate(1)
+        self.assertEqual(len(result.sub_results), 3)
+        self.assertFalse(result.ok())
+        self.assertEqual(self.generate(3).to_dict(), result.to_dict())
+
+    def test_max_in_flight(self):
+        self.generate(2)
+        self.assertEqual(self.max_in_flight, 2)
+
+
+class FixtureCacheTest(TestCase):
+
+    def test_fetch_once(self):
+        fixtures = FixtureCache()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return "value"
+
+        with start("first") as first:
+            self.assertEqual(fixtures.get("GET /shells", fetch), "value")
+        with start("second") as second:
+            self.assertEqual(fixtures.get("GET /shells", fetch), "value")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(first.sub_results), 0)
+        self.assertEqual(second.sub_results[0].message, "Using cached fixture GET /shells")
+
+    def test_failure_not_cached(self):
+        fixtures = FixtureCache()
+        with start("first") as first:
+            fixtures.get("GET /shells", lambda: abort("failed"))
+        self.assertFalse(first.ok())
+        with start("second") as second:
+            self.assertEqual(fixtures.get("GET /shells", lambda: "value"), "value")
+        self.assertEqual(len(second.sub_results), 0)
@@ -1,6 +1,10 @@
 from unittest import TestCase
 import subprocess
 import os
+import json
+import tempfile
+
+from aas_test_engines.result import Level
 
 script_dir = os.path.dirname(os.path.realpath(__file__))
 
@@ -28,10 +32,51 @@ class CheckFileCli(TestCase):
         result = self.invoke([self.json_file, "--format", "json", "--output", "html"])
         self.assertTrue(result.startswith("<!DOCTYPE html>"))
 
+    def test_verbosity(self):
+        result = self.invoke([self.json_file, "--format", "json", "--output", "json", "--verbosity", "error"])
+        self.assertEqual(json.loads(result)["l"], Level.INFO.value)
+        with self.assertRaises(subprocess.CalledProcessError):
+            self.invoke([self.json_file, "--format", "json", "--verbosity", "foo"])
+
+    def test_fail_fast(self):
+        with self.assertRaises(subprocess.CalledProcessError) as cm:
+            self.invoke([self.json_file, "--format", "xml", "--fail-fast"])
+        self.assertIn("Invalid xml", cm.exception.output.decode())
+        result = self.invoke([self.json_file, "--format", "json", "--max-errors", "5"])
+        self.assertNotIn("Stopped", result)
+
     def test_invalid_file(self):
         with self.assertRaises(subprocess.CalledProcessError):
             self.invoke([self.json_file, "--format", "xml"])
 
+    def test_batch(self):
+        for jobs in ["1", "2"]:
+            result = self.invoke([self.json_file, self.xml_file, "--jobs", jobs])
+            lines = [json.loads(i) for i in result.splitlines()]
+            self.assertEqual([i["file"] for i in lines], [self.json_file, self.xml_file])
+            self.assertTrue(all(i["ok"] for i in lines))
+
+    def test_batch_directory(self):
+        with self.assertRaises(subprocess.CalledProcessError) as cm:
+            self.invoke([os.path.join(script_dir, "fixtures", "aasx", "invalid")])
+        lines = [json.loads(i) for i in cm.exception.output.decode().splitlines()]
+        self.assertTrue(lines)
+        self.assertFalse(all(i["ok"] for i in lines))
+
+    def test_batch_corrupt_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            corrupt_file = os.path.join(tmp, "corrupt.json")
+            with open(corrupt_file, "wb") as f:
+                # Nested too deeply for the JSON decoder, which raises a RecursionError
+                f.write(b'{"submodels": ' + b"[" * 100000 + b"]}")
+            for jobs in ["1", "2"]:
+                with self.assertRaises(subprocess.CalledProcessError) as cm:
+                    self.invoke([corrupt_file, self.json_file, "--jobs", jobs])
+                lines = [json.loads(i) for i in cm.exception.output.decode().splitlines()]
+                self.assertEqual([i["file"] for i in lines], [corrupt_file, self.json_file])
+                self.assertEqual([i["ok"] for i in lines], [False, True])
+                self.assertEqual(lines[0]["level"], Level.CRITICAL.name)
+
 
 class CheckServerCli(TestCase):
 
@@ -25,3 +25,51 @@ class Base64UrlTest(TestCase):
             encoded = data_types.base64_urlsafe(value)
             self.assertNotIn("=", encoded)
             self.assertEqual(b64urlsafe_decode(encoded), value)
+
+
+class FindInvalidTest(TestCase):
+
+    def test_same_as_validators(self):
+        values = [
+            "",
+            "0",
+            "-5",
+            "+7",
+            "00",
+            "1_000",
+            " 3",
+            "1\n2",
+            "\u0665",
+            "9" * 5000,
+            "128",
+            "-129",
+            "3000000000",
+            "1.5",
+            ".5",
+            "5.",
+            "1e5",
+            "1E-3",
+            "1e400",
+            "INF",
+            "-INF",
+            "NaN",
+            "true",
+            "x",
+            "--05",
+            "---31",
+            "2020-01",
+            "2020",
+            "2020-02-30",
+            "2020-01-01T12:00:00Z",
+            "24:00:00",
+            "P1Y",
+            "PT1S",
+            "P",
+        ]
+        for value_type in data_types.DataTypeDefXsd:
+            validator = data_types.validators[value_type]
+            expected = {i for i in values if not validator(i)}
+            self.assertEqual(data_types.find_invalid(value_type, values), expected, value_type)
+            for value in values:
+                self.assertEqual(data_types.find_invalid(value_type, [value]), expected & {value}, value_type)
+        self.assertEqual(data_types.find_invalid(data_types.DataTypeDefXsd.int, []), set())
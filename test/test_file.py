@@ -1,12 +1,18 @@
-from unittest import TestCase
+from unittest import TestCase, skipUnless
 import os
 import zipfile
 import io
 import json
+from contextvars import copy_context
+from types import SimpleNamespace
 from xml.etree import ElementTree
 
-from aas_test_engines import file, exception
-from aas_test_engines.result import Level
+from aas_test_engines import file, exception, xml_backend
+from aas_test_engines.result import AasTestResult, Level, set_verbosity, set_aggregation
+from aas_test_engines.test_cases.v3_0 import stream_to_result
+from aas_test_engines.test_cases.v3_0.adapter import JsonAdapter, JsonStreamAdapter, AdapterPath
+from aas_test_engines.test_cases.v3_0.model import IdShortPath, symbol_table
+from aas_test_engines.test_cases.v3_0.parse import parse, interning
 
 script_dir = os.path.dirname(os.path.realpath(__file__))
 
@@ -74,6 +80,258 @@ class CheckJsonTest(TestCase):
             )
         )
 
+    def test_stream_equals_in_memory(self):
+        for name in ["digital_nameplate.json", "contact_information.json"]:
+            with open(os.path.join(script_dir, "fixtures/submodel_templates", name)) as f:
+                data = json.load(f)
+            for chunk_size in [7, 1 << 16]:
+                adapter = JsonStreamAdapter(io.BytesIO(json.dumps(data).encode()), AdapterPath(), chunk_size)
+                result_stream = stream_to_result(adapter, "Environment")
+                self.assertEqual(result_stream.to_dict(), file.check_json_data(data).to_dict())
+
+    def test_parallel(self):
+        with open(os.path.join(script_dir, "fixtures/submodel_templates/digital_nameplate.json")) as f:
+            data = json.load(f)
+        data["submodels"] = data["submodels"] * 5 + [{"modelType": "Submodel"}] + data["submodels"]
+        data["conceptDescriptions"] = []
+        for value in [{"submodels": data["submodels"][:5]}, data]:
+            expected = stream_to_result(JsonAdapter(value, AdapterPath()), "Environment").to_dict()
+            self.assertEqual(file.check_json_file(io.StringIO(json.dumps(value)), jobs=2).to_dict(), expected)
+            self.assertEqual(file.check_json_data(value, jobs=2).to_dict(), expected)
+
+    def test_stream_constraints(self):
+        with open(os.path.join(script_dir, "fixtures/submodel_templates/digital_nameplate.json")) as f:
+            nameplate = json.load(f)["submodels"]
+        invalid = [
+            {
+                "modelType": "Submodel",
+                "id": f"urn:sm:{i}",
+                "idShort": f"sm{i}",
+                "submodelElements": [
+                    {"modelType": "Property", "idShort": f"p{j}", "valueType": "xs:int", "value": "x"} for j in range(2)
+                ],
+            }
+            for i in range(3)
+        ]
+        # All constraint errors are reported, templates are not checked once constraints are violated
+        for data in [{"submodels": invalid}, {"submodels": nameplate + invalid[:1]}]:
+            expected = file.check_json_data(data).to_dict()
+            self.assertEqual(file.check_json_file(io.StringIO(json.dumps(data))).to_dict(), expected)
+            self.assertEqual(file.check_json_file(io.StringIO(json.dumps(data)), jobs=2).to_dict(), expected)
+        result = file.check_json_file(io.StringIO(json.dumps({"submodels": invalid})))
+        self.assertEqual(len(result.sub_results[1].sub_results), 6)
+
+    def test_aggregation(self):
+        data = {"submodels": [{"id": f"id{i}", "modelType": "Submodel", "foo": 1} for i in range(50)]}
+
+        def check(jobs: int):
+            set_aggregation(2)
+            return file.check_json_data(data, jobs=jobs)
+
+        for jobs in [1, 2]:
+            result = copy_context().run(check, jobs)
+            result_meta_model = result.sub_results[0]
+            self.assertEqual(len(result_meta_model.sub_results), 1)
+            group = result_meta_model.sub_results[0]
+            self.assertEqual(group.message, "Unknown additional attribute foo [50 occurrences]")
+            self.assertEqual(len(group.sub_results), 2)
+            self.assertEqual(result.level, Level.ERROR)
+
+    def test_aggregation_value_types(self):
+        # Findings of model.validate carry the IdShortPath besides the path within the document
+        data = {
+            "submodels": [
+                {
+                    "modelType": "Submodel",
+                    "id": f"urn:sm:{i}",
+                    "idShort": f"sm{i}",
+                    "submodelElements": [
+                        {"modelType": "Property", "idShort": "p3", "valueType": "xs:int", "value": f"x{i}"}
+                    ],
+                }
+                for i in range(200)
+            ]
+        }
+
+        def check():
+            set_aggregation(2)
+            return file.check_json_data(data)
+
+        result_constraints = copy_context().run(check).sub_results[1]
+        self.assertEqual(len(result_constraints.sub_results), 1)
+        group = result_constraints.sub_results[0]
+        self.assertEqual(group.message, "Value '*' is not a '*' [200 occurrences]")
+        self.assertEqual(len(group.sub_results), 2)
+
+    def test_max_errors(self):
+        data = {"submodels": [{"id": f"id{i}", "modelType": "Submodel", "foo": 1} for i in range(50)]}
+        for max_errors in [1, 3]:
+            for result in [
+                file.check_json_data(data, max_errors=max_errors),
+                file.check_json_file(io.StringIO(json.dumps(data)), max_errors=max_errors),
+                file.check_json_file(io.StringIO(json.dumps(data)), jobs=2, max_errors=max_errors),
+            ]:
+                result.dump()
+                errors = [i.message for i in result.sub_results[0].sub_results]
+                self.assertEqual(
+                    errors, [f"Unknown additional attribute foo @ /submodels/{i}" for i in range(max_errors)]
+                )
+                self.assertEqual(result.level, Level.ERROR)
+                self.assertEqual(
+                    result.sub_results[-1].message,
+                    f"Stopped after {max_errors} error(s), remaining checks were skipped",
+                )
+        # The budget is not used up by valid data
+        result = file.check_json_data({"submodels": data["submodels"][:1]}, max_errors=2)
+        self.assertNotIn("Stopped", result.sub_results[-1].message)
+        # Nothing is skipped if the last check reports the last error of the budget
+        data = {"submodels": [{"modelType": "Submodel"}]}
+        for result in [
+            file.check_json_data(data, max_errors=1),
+            file.check_json_file(io.StringIO(json.dumps(data)), max_errors=1),
+        ]:
+            self.assertFalse(result.ok())
+            self.assertFalse(any("Stopped" in i for i in result.to_lines()))
+
+    def test_stream_invalid_json(self):
+        for doc in [
+            '{"submodels": [{"id": "a"}, {"id": ]}',
+            '{\n  "submodels": [\n    {"id": "a"},\n    {"id": "b"}\n  ]\n} x',
+        ]:
+            with self.assertRaises(json.JSONDecodeError) as expected:
+                json.loads(doc)
+            result = file.check_json_file(io.StringIO(doc))
+            self.assertEqual(result.message, f"Invalid JSON: {expected.exception}")
+            adapter = JsonStreamAdapter(io.StringIO(doc), AdapterPath(), 3)
+            with self.assertRaises(json.JSONDecodeError) as actual:
+                stream_to_result(adapter, "Environment")
+            self.assertEqual(str(actual.exception), str(expected.exception))
+
+    def test_encodings(self):
+        doc = json.dumps({"submodels": [{"modelType": "Submodel", "id": "\u00e4"}]}, ensure_ascii=False)
+        expected = file.check_json_data(json.loads(doc)).to_dict()
+        for encoding in ["utf-8", "utf-8-sig", "utf-16", "utf-16-be", "utf-32-le"]:
+            data = doc.encode(encoding)
+            self.assertEqual(file.check_json_file(io.BytesIO(data)).to_dict(), expected)
+            self.assertEqual(file.check_json_file(io.BytesIO(data), json_decoder="json").to_dict(), expected)
+            adapter = JsonStreamAdapter(io.BytesIO(data), AdapterPath(), 3)
+            self.assertEqual(stream_to_result(adapter, "Environment").to_dict(), expected)
+        for data in [b'{"a": "\xff"}', b'\xef\xbb\xbf{"a": "\xc3"}']:
+            for decoder in [None, "json"]:
+                result = file.check_json_file(io.BytesIO(data), json_decoder=decoder)
+                self.assertTrue(result.message.startswith("Invalid JSON: Cannot decode"), result.message)
+
+    def test_value_types(self):
+        def prop(id_short, value_type, value):
+            return {"idShort": id_short, "modelType": "Property", "valueType": value_type, "value": value}
+
+        elements = [
+            prop("a", "xs:int", "1"),
+            prop("b", "xs:int", "x"),
+            prop("c", "xs:dateTime", "2020"),
+            prop("d", "xs:int", "3000000000"),
+            {"idShort": "e", "modelType": "Range", "valueType": "xs:byte", "min": "-1", "max": "300"},
+        ]
+        data = {"submodels": [{"id": "sm", "idShort": "sm", "modelType": "Submodel", "submodelElements": elements}]}
+        # Values are validated per type after all other constraints
+        expected = [
+            "Value 'x' is not a 'xs:int' @ b in Submodel sm[sm] @ /submodels/0/submodel_elements/1",
+            "Value '3000000000' is not a 'xs:int' @ d in Submodel sm[sm] @ /submodels/0/submodel_elements/3",
+            "Value '2020' is not a 'xs:dateTime' @ c in Submodel sm[sm] @ /submodels/0/submodel_elements/2",
+            "Value '300' is not a 'xs:byte' @ e in Submodel sm[sm] @ /submodels/0/submodel_elements/4",
+        ]
+        for result in [file.check_json_data(data), file.check_json_file(io.StringIO(json.dumps(data)))]:
+            self.assertEqual([i.message for i in result.sub_results[1].sub_results], expected)
+        result = file.check_json_data(data, max_errors=1)
+        self.assertEqual([i.message for i in result.sub_results[1].sub_results], expected[:1])
+
+    def test_stream_unknown_attributes(self):
+        data = {"foo": [1, 2], "submodels": [], "modelType": "Environment"}
+        result = file.check_json_file(io.StringIO(json.dumps(data)))
+        self.assertEqual(result.to_dict(), file.check_json_data(data).to_dict())
+
+
+class PathTest(TestCase):
+
+    def test_adapter_path(self):
+        root = AdapterPath()
+        parent = root + "submodels" + 3
+        a = parent + "idShort"
+        b = parent + "value"
+        self.assertEqual(str(root), "/")
+        self.assertEqual(str(a), "/submodels/3/idShort")
+        self.assertEqual(str(b), "/submodels/3/value")
+        self.assertEqual(b.elements, ["submodels", 3, "value"])
+        self.assertIs(a.parent, b.parent)
+
+    def test_id_short_path(self):
+        root = IdShortPath(SimpleNamespace(id_short=None, id="https://example.com"))
+        path = root + 1 + None
+        self.assertEqual(path.id_shorts, [1, None])
+        self.assertEqual(str(path), "1.? in Submodel [https://example.com]")
+        self.assertEqual(root.id_shorts, [])
+
+
+class JsonAdapterTest(TestCase):
+
+    def test_views(self):
+        value = {"modelType": "Submodel", "id": "a", "submodelElements": [1, 2]}
+        adapter = JsonAdapter(value, AdapterPath())
+        obj = adapter.as_object()
+        self.assertEqual(list(obj), ["id", "submodelElements"])
+        self.assertEqual(len(obj), 2)
+        self.assertNotIn("modelType", obj)
+        with self.assertRaises(KeyError):
+            obj["modelType"]
+        self.assertEqual(obj["id"].as_string(), "a")
+        items = obj["submodelElements"].as_list(False)
+        self.assertEqual(len(items), 2)
+        self.assertEqual([str(i.path) for i in items], ["/submodelElements/0", "/submodelElements/1"])
+        self.assertEqual(str(items[-1].path), "/submodelElements/1")
+
+    def test_unknown_attributes_in_document_order(self):
+        data = {"zz": 1, "aa": 2}
+        result = file.check_json_data(data, model_type="Environment")
+        self.assertEqual(
+            [i.message for i in result.sub_results[0].sub_results],
+            ["Unknown additional attribute zz @ /", "Unknown additional attribute aa @ /"],
+        )
+
+
+class InternTest(TestCase):
+
+    def parse(self, data, enabled: bool):
+        with interning(enabled) as table:
+            result = AasTestResult("Parse")
+            env = parse(symbol_table.lookup("Environment"), JsonAdapter(data, AdapterPath()), result)
+        self.assertTrue(result.ok())
+        return env, table
+
+    def test_interning(self):
+        semantic_id = {"type": "ExternalReference", "keys": [{"type": "GlobalReference", "value": "urn:x"}]}
+        data = {
+            "submodels": [
+                {"id": f"urn:submodel:{i}", "modelType": "Submodel", "semanticId": semantic_id} for i in range(3)
+            ]
+        }
+        env, table = self.parse(data, True)
+        a, b = env.submodels[0], env.submodels[2]
+        self.assertIs(a.semantic_id, b.semantic_id)
+        self.assertIsNot(a.id, b.id)
+        self.assertEqual(table.hits, 6)
+        env_plain, table = self.parse(data, False)
+        self.assertEqual(table.hits, 0)
+        self.assertIsNot(env_plain.submodels[0].semantic_id, env_plain.submodels[2].semantic_id)
+        self.assertEqual(a.semantic_id.keys, env_plain.submodels[0].semantic_id.keys)
+        self.assertEqual(str(a.semantic_id.keys[0]), "urn:x")
+
+    def test_same_result(self):
+        with open(os.path.join(script_dir, "fixtures/submodel_templates/contact_information.json")) as f:
+            data = json.load(f)
+        expected = file.check_json_data(data).to_dict()
+        with interning(False):
+            self.assertEqual(file.check_json_data(data).to_dict(), expected)
+
 
 class CheckXmlTest(TestCase):
 
@@ -98,6 +356,85 @@ class CheckXmlTest(TestCase):
         result = file.check_xml_file(io.StringIO("no xml"))
         self.assertFalse(result.ok())
 
+    def test_stream_equals_in_memory(self):
+        with open(os.path.join(script_dir, "fixtures/aasx/valid/xml/aasx/the_aas.xml"), "rb") as f:
+            content = f.read()
+        result_stream = file.check_xml_file(io.BytesIO(content))
+        result_stream.dump()
+        self.assertTrue(result_stream.ok())
+        self.assertEqual(result_stream.to_dict(), file.check_xml_data(ElementTree.fromstring(content)).to_dict())
+
+    def test_parallel(self):
+        submodels = [
+            f"""<submodel>
+                <idShort>sm{i}</idShort>
+                <id>urn:sm:{i}</id>
+                <submodelElements>
+                    <property><idShort>p1</idShort><valueType>xs:int</valueType><value>{i % 4 or 'x'}</value></property>
+                    <property><idShort>p2</idShort><valueType>xs:int</valueType><value>{i % 4 or 'y'}</value></property>
+                </submodelElements>
+            </submodel>"""
+            for i in range(12)
+        ]
+        content = (
+            '<environment xmlns="https://admin-shell.io/aas/3/0"><submodels>'
+            + "\n".join(submodels)
+            + "</submodels></environment>"
+        ).encode()
+        expected = file.check_xml_data(ElementTree.fromstring(content)).to_dict()
+        lines = list(file.check_xml_data(ElementTree.fromstring(content)).to_lines())
+        self.assertEqual(len([i for i in lines if "is not a 'xs:int'" in i]), 6)
+        self.assertEqual(file.check_xml_file(io.BytesIO(content)).to_dict(), expected)
+        self.assertEqual(file.check_xml_file(io.BytesIO(content), jobs=3).to_dict(), expected)
+        self.assertEqual(file.check_xml_data(ElementTree.fromstring(content), jobs=3).to_dict(), expected)
+        if "lxml" in xml_backend.available_backends():
+            self.assertEqual(file.check_xml_file(io.BytesIO(content), jobs=3, xml_backend="lxml").to_dict(), expected)
+            self.assertEqual(file.check_xml_data(xml_backend.fromstring(content, "lxml"), jobs=3).to_dict(), expected)
+
+    def test_stream_invalid(self):
+        for content in [
+            '<environment xmlns="invalid"></environment>',
+            '<environment xmlns="https://admin-shell.io/aas/3/0"><foo/></environment>',
+            '<environment xmlns="https://admin-shell.io/aas/3/0">text</environment>',
+            '<environment xmlns="https://admin-shell.io/aas/3/0"><submodels></submodels></environment>',
+        ]:
+            result_stream = file.check_xml_file(io.StringIO(content))
+            self.assertFalse(result_stream.ok())
+            self.assertEqual(result_stream.to_dict(), file.check_xml_data(ElementTree.fromstring(content)).to_dict())
+
+    def test_stream_syntax_error(self):
+        result = file.check_xml_file(
+            io.StringIO('<environment xmlns="invalid"><submodels></submodels></environment><x/>')
+        )
+        self.assertTrue(result.message.startswith("Invalid xml"))
+
+    @skipUnless("lxml" in xml_backend.available_backends(), "lxml is not installed")
+    def test_lxml_backend(self):
+        with open(os.path.join(script_dir, "fixtures/aasx/valid/xml/aasx/the_aas.xml"), "rb") as f:
+            content = f.read()
+        expected = file.check_xml_file(io.BytesIO(content)).to_dict()
+        self.assertEqual(file.check_xml_file(io.BytesIO(content), xml_backend="lxml").to_dict(), expected)
+        self.assertEqual(file.check_xml_data(xml_backend.fromstring(content, "lxml")).to_dict(), expected)
+        for content in [
+            '<environment xmlns="invalid"></environment>',
+            '<environment xmlns="https://admin-shell.io/aas/3/0"><foo/></environment>',
+            '<environment xmlns="https://admin-shell.io/aas/3/0">text</environment>',
+            '<environment xmlns="https://admin-shell.io/aas/3/0"><!-- comment --><submodels></submodels></environment>',
+        ]:
+            expected = file.check_xml_file(io.StringIO(content)).to_dict()
+            self.assertEqual(file.check_xml_file(io.StringIO(content), xml_backend="lxml").to_dict(), expected)
+        result = file.check_xml_file(io.StringIO("no xml"), xml_backend="lxml")
+        self.assertTrue(result.message.startswith("Invalid xml"))
+
+    @skipUnless("lxml" in xml_backend.available_backends(), "lxml is not installed")
+    def test_lxml_text_input(self):
+        # Text is already decoded, so the encoding declaration must be ignored
+        content = '<?xml version="1.0" encoding="ISO-8859-1"?><a>é<b>' + "ü" * 100000 + "</b></a>"
+        for backend in ["etree", "lxml"]:
+            self.assertEqual(xml_backend.fromstring(content, backend).text, "é")
+            texts = [i.text for _, i in xml_backend.iterparse(io.StringIO(content), ("end",), backend)]
+            self.assertEqual(texts, ["ü" * 100000, "é"])
+
     def test_namespaces(self):
         data = ElementTree.fromstring(
             """<aas:environment xmlns:aas="https://admin-shell.io/aas/3/0">
@@ -176,6 +513,13 @@ class CheckAasxTest(TestCase):
         result.dump()
         self.assertEqual(result.level, Level.INFO)
 
+    @skipUnless("lxml" in xml_backend.available_backends(), "lxml is not installed")
+    def test_xml_backend(self):
+        for name in ["valid/xml", "invalid/invalid_xml"]:
+            z = in_memory_zipfile(os.path.join(script_dir, "fixtures/aasx", name))
+            expected = file.check_aasx_data(z).to_dict()
+            self.assertEqual(file.check_aasx_data(z, xml_backend="lxml").to_dict(), expected)
+
     def test_valid_json(self):
         z = in_memory_zipfile(os.path.join(script_dir, "fixtures/aasx/valid/json"))
         result = file.check_aasx_data(z)
@@ -194,6 +538,28 @@ class CheckAasxTest(TestCase):
         result.dump()
         self.assertEqual(result.level, Level.ERROR)
 
+    def test_verbosity(self):
+        z = in_memory_zipfile(os.path.join(script_dir, "fixtures/aasx/valid/deprecated_rel"))
+        result = file.check_aasx_data(z)
+        self.assertTrue(any("Relationship" in line for line in result.to_lines()))
+
+        def check():
+            set_verbosity(Level.WARNING)
+            return file.check_aasx_data(z)
+
+        quiet_result = copy_context().run(check)
+        quiet_result.dump()
+        self.assertEqual(quiet_result.level, result.level)
+        self.assertFalse(any("Relationship" in line for line in quiet_result.to_lines()))
+
+    def test_fail_fast(self):
+        z = in_memory_zipfile(os.path.join(script_dir, "fixtures/aasx/invalid/invalid_json"))
+        result = file.check_aasx_data(z, max_errors=1)
+        result.dump()
+        self.assertEqual(result.level, Level.ERROR)
+        # The only error is found by the last check, so nothing is skipped
+        self.assertEqual(result.to_dict(), file.check_aasx_data(z).to_dict())
+
     def test_relative_paths(self):
         z = in_memory_zipfile(os.path.join(script_dir, "fixtures/aasx/valid/relative_paths"))
         result = file.check_aasx_data(z)
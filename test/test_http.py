@@ -0,0 +1,57 @@
+from unittest import TestCase
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+from aas_test_engines.http import HttpClient, Request
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        body = self.path.encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HttpClientTest(TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.connections = 0
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.host = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_keep_alive(self):
+        client = HttpClient(self.host)
+        sub_client = client.descend("/shells")
+        self.assertIs(client.session, sub_client.session)
+        self.assertEqual(client.send(Request("/a")).text, "/a")
+        response = sub_client.send(Request("/b"))
+        self.assertEqual(response.text, "/shells/b")
+        self.assertNotIn("Cookie", response.request.headers)
+        client.close()
+        self.assertEqual(self.server.connections, 1)
+
+    def test_no_keep_alive(self):
+        client = HttpClient(self.host, keep_alive=False)
+        client.send(Request("/a"))
+        client.descend("/shells").send(Request("/b"))
+        client.close()
+        self.assertEqual(self.server.connections, 2)
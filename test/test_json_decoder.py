@@ -0,0 +1,45 @@
+from unittest import TestCase
+import io
+import json
+import math
+import os
+
+from aas_test_engines import json_decoder, file
+
+script_dir = os.path.dirname(os.path.realpath(__file__))
+
+
+class JsonDecoderTest(TestCase):
+
+    def test_available(self):
+        self.assertEqual(json_decoder.available_decoders()[-1], "json")
+
+    def test_loads(self):
+        for decoder in ["auto"] + json_decoder.available_decoders():
+            for data in ['{"a": [1, 2.5, null, "\\u00e4"]}', b'{"a": [1, 2.5, null, "\\u00e4"]}']:
+                self.assertEqual(json_decoder.loads(data, decoder), {"a": [1, 2.5, None, "ä"]})
+            self.assertEqual(json_decoder.loads(b"\xef\xbb\xbf[]", decoder), [])
+            self.assertEqual(json_decoder.loads("\ufeff[]", decoder), [])
+            with self.assertRaises(json.JSONDecodeError):
+                json_decoder.loads(b'{"a": }', decoder)
+
+    def test_default(self):
+        self.assertEqual(json_decoder.get_decoder(), "json")
+        self.assertEqual(json_decoder.loads(b"[18446744073709551616, 1e400]"), [18446744073709551616, float("inf")])
+        self.assertTrue(math.isnan(json_decoder.loads(b"NaN")))
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            json_decoder.loads("[]", "foo")
+        with self.assertRaises(ValueError):
+            json_decoder.set_decoder("foo")
+
+    def test_check_json_file(self):
+        with open(os.path.join(script_dir, "fixtures/submodel_templates/digital_nameplate.json"), "rb") as f:
+            data = f.read()
+        expected = file.check_json_file(io.BytesIO(data)).to_dict()
+        for decoder in ["auto"] + json_decoder.available_decoders():
+            self.assertEqual(file.check_json_file(io.BytesIO(data), json_decoder=decoder).to_dict(), expected)
+            result = file.check_json_file(io.BytesIO(b'{"submodels": ['), json_decoder=decoder)
+            self.assertFalse(result.ok())
+            self.assertTrue(result.message.startswith("Invalid JSON"))
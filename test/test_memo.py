@@ -0,0 +1,72 @@
+from unittest import TestCase
+
+from aas_test_engines import memo, data_types
+from aas_test_engines.reflect import StringFormattedValueType
+from aas_test_engines.test_cases.v3_0.model import RevisionString, PathString
+
+calls = []
+
+
+@memo.memoize("test")
+def double(x: int) -> int:
+    calls.append(x)
+    return 2 * x
+
+
+class MemoTest(TestCase):
+
+    def setUp(self):
+        calls.clear()
+        memo.clear_caches()
+
+    def tearDown(self):
+        memo.set_cache_size(memo.DEFAULT_CACHE_SIZE)
+
+    def test_cached(self):
+        self.assertEqual([double(i) for i in [1, 2, 1, 1]], [2, 4, 2, 2])
+        self.assertEqual(calls, [1, 2])
+        stats = memo.cache_stats()["test"]
+        self.assertEqual((stats.hits, stats.misses, stats.currsize), (2, 2, 2))
+        self.assertEqual(stats.hit_rate, 0.5)
+
+    def test_size(self):
+        memo.set_cache_size(1)
+        for i in [1, 2, 1]:
+            double(i)
+        self.assertEqual(calls, [1, 2, 1])
+        self.assertEqual(memo.cache_stats()["test"].maxsize, 1)
+        memo.set_cache_size(0)
+        double(1)
+        double(1)
+        self.assertEqual(calls, [1, 2, 1, 1, 1])
+        with self.assertRaises(ValueError):
+            memo.set_cache_size(-1)
+
+    def test_duplicate_name(self):
+        with self.assertRaises(ValueError):
+            memo.memoize("test")(lambda: None)
+
+    def test_validators(self):
+        uri = "https://admin-shell.io/zvei/nameplate/2/0/Nameplate"
+        for _ in range(3):
+            self.assertTrue(data_types.is_any_uri(uri))
+            self.assertFalse(data_types.is_bcp_lang_string("not a language"))
+            self.assertTrue(data_types.validators[data_types.DataTypeDefXsd.time]("12:00:00"))
+        stats = memo.cache_stats()
+        for name in ["xs:anyURI", "bcp47", "xs:time"]:
+            self.assertEqual((stats[name].hits, stats[name].misses), (2, 1))
+
+    def test_string_formatted_value(self):
+        t = StringFormattedValueType(RevisionString)
+        for _ in range(2):
+            value = t.construct("12")
+            self.assertIsInstance(value, RevisionString)
+            self.assertEqual(value.raw_value, "12")
+            with self.assertRaises(ValueError) as e:
+                t.construct("012")
+            self.assertEqual(str(e.exception), "String '012' does not match pattern (0|[1-9][0-9]*)")
+        with self.assertRaises(ValueError) as e:
+            StringFormattedValueType(PathString).construct("x y")
+        self.assertEqual(str(e.exception), "Not a valid path")
+        stats = memo.cache_stats()["StringFormattedValue"]
+        self.assertEqual((stats.hits, stats.misses), (2, 3))
@@ -6,6 +6,7 @@ from aas_test_engines.reflect import (
     ListType,
     StringFormattedValue,
     abstract,
+    slotted,
     FunctionType,
     NoneType,
     NonEmptyList,
@@ -191,6 +192,105 @@ class TestReflect(TestCase):
         self.assertIs(type.subclasses[0].cls, Bar)
         self.assertIs(type.subclasses[1].cls, Baz)
 
+    def test_slotted(self):
+        @dataclass
+        class Mixin:
+            __slots__ = ()
+            foo: str
+
+        @dataclass
+        @abstract
+        class Base(Mixin):
+            __slots__ = ()
+
+        @slotted
+        @dataclass
+        class Bar(Base):
+            bar: Optional[str] = None
+
+        @slotted
+        @dataclass
+        class Baz(Bar):
+            baz: str = "x"
+
+        self.assertEqual(Bar.__slots__, ("foo", "bar"))
+        self.assertEqual(Baz.__slots__, ("baz",))
+        baz = Baz("a")
+        self.assertFalse(hasattr(baz, "__dict__"))
+        self.assertEqual((baz.foo, baz.bar, baz.baz), ("a", None, "x"))
+        self.assertEqual(baz, Baz("a", None, "x"))
+        with self.assertRaises(AttributeError):
+            baz.other = 1
+        type, table = reflect(Base)
+        assert isinstance(type, ClassType)
+        self.assertEqual([i.cls for i in type.subclasses], [Bar, Baz])
+        self.assertEqual([i.name for i in type.subclasses[1].attrs], ["foo", "bar", "baz"])
+
+    def test_cached(self):
+        @dataclass
+        class Foo:
+            bar: List["Bar"]
+
+        @dataclass
+        class Bar:
+            pass
+
+        @dataclass
+        class Baz:
+            foo: Foo
+            invalid: "Invalid"
+
+        with self.assertRaises(Exception):
+            reflect(Baz)
+        foo, table = reflect(Foo, globals(), locals())
+        self.assertEqual(len(table.symbols), 3)
+        bar, table = reflect(Bar)
+        self.assertIs(bar, foo.attrs[0].type.item_type)
+        self.assertEqual(list(table.symbols.values()), [bar])
+        self.assertIs(reflect(Foo)[0], foo)
+
+    def test_list_forward_ref(self):
+        @dataclass
+        class Foo:
+            pass
+
+        type, table = reflect(List["Foo"], globals(), locals())
+        assert isinstance(type, ListType)
+        self.assertIs(type.item_type, reflect(Foo)[0])
+        self.assertEqual(len(table.symbols), 2)
+        self.assertIs(reflect(List[Foo])[0], type)
+
+
+class TestStringFormattedValue(TestCase):
+
+    def test_xml_serializable(self):
+        class Foo(StringFormattedValue):
+            pass
+
+        for value in ["", "abc", "a b~", "\t\n\r", "\x7f", "\u00e4", "\U0001f600"]:
+            self.assertEqual(Foo(value).raw_value, value)
+        for value in ["\x00", "a\x1fb", "\ufffe", "\ud800", "\u00e4\x0b"]:
+            with self.assertRaises(ValueError) as e:
+                Foo(value)
+            self.assertEqual(str(e.exception), "Constraint AASd-130 violated: String is not XML serializable")
+
+    def test_pattern(self):
+        class Foo(StringFormattedValue):
+            min_length = 1
+            pattern = r"[a-z]+"
+
+        class Bar(Foo):
+            max_length = 3
+
+        self.assertEqual(Foo("abcd").raw_value, "abcd")
+        for cls in [Foo, Bar]:
+            with self.assertRaises(ValueError) as e:
+                cls("ab1")
+            self.assertEqual(str(e.exception), "String 'ab1' does not match pattern [a-z]+")
+        with self.assertRaises(ValueError) as e:
+            Bar("abcd")
+        self.assertEqual(str(e.exception), "String is longer than 3 characters")
+
 
 class TestReflectFunction(TestCase):
 
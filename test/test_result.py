@@ -1,12 +1,21 @@
 from aas_test_engines.result import (
     AasTestResult,
+    AasTestResultGroup,
     Level,
     write,
     start,
+    set_verbosity,
+    set_aggregation,
     abort,
     ResultException,
 )
 from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+import threading
+import io
+import pickle
+import sys
 
 from unittest import TestCase
 
@@ -37,6 +46,81 @@ class ResultTest(TestCase):
         self.assertEqual(result.level, Level.ERROR)
         self.assertEqual(len(result.sub_results), 3)
 
+    def test_compact(self):
+        a = AasTestResult("".join(["fo", "o"]))
+        b = AasTestResult("".join(["f", "oo"]))
+        with start("".join(["fo", "o"])) as c:
+            pass
+        with start("".join(["f", "oo"])) as d:
+            pass
+        self.assertIs(c.message, d.message)
+        self.assertFalse(hasattr(a, "__dict__"))
+        self.assertEqual(len(a.sub_results), 0)
+        a.append(b)
+        self.assertEqual(a.sub_results, [b])
+        self.assertEqual(len(b.sub_results), 0)
+
+    def test_pickle(self):
+        result = pickle.loads(pickle.dumps(self.result))
+        self.assertEqual(result.to_dict(), self.result.to_dict())
+
+    def test_aggregation(self):
+        def run():
+            set_aggregation(2)
+            result = AasTestResult("root")
+            for i in range(5):
+                result.append(AasTestResult(f"Value '{i}' is not a 'xs:int' @ a.b[{i}]", Level.ERROR))
+                result.append(
+                    AasTestResult(f"Constraint AASd-117 violated: element {i} has no idShort @ x", Level.ERROR)
+                )
+                result.append(AasTestResult("info"))
+            result.append(AasTestResult("Value 'x' is not a 'xs:int'", Level.WARNING))
+            return result
+
+        result = copy_context().run(run)
+        self.assertEqual(
+            [i.message for i in result.sub_results],
+            [
+                "Value '*' is not a '*' [5 occurrences]",
+                "Constraint AASd-117 violated: element * has no idShort [5 occurrences]",
+                "info",
+                "info",
+                "info",
+                "info",
+                "info",
+                "Value 'x' is not a 'xs:int'",
+            ],
+        )
+        group = result.sub_results[0]
+        self.assertIsInstance(group, AasTestResultGroup)
+        self.assertEqual(group.count, 5)
+        self.assertEqual(group.level, Level.ERROR)
+        self.assertEqual(
+            [i.message for i in group.sub_results],
+            ["Value '0' is not a 'xs:int' @ a.b[0]", "Value '1' is not a 'xs:int' @ a.b[1]"],
+        )
+        self.assertEqual(result.level, Level.ERROR)
+
+    def test_aggregation_merge(self):
+        def run():
+            set_aggregation(3)
+            parts = []
+            for _ in range(3):
+                part = AasTestResult("part")
+                for i in range(2):
+                    part.append(AasTestResult(f"Missing attribute id @ submodels[{i}]", Level.ERROR))
+                parts.append(pickle.loads(pickle.dumps(part)))
+            result = AasTestResult("root")
+            for part in parts:
+                for i in part.sub_results:
+                    result.append(i)
+            return result
+
+        result = copy_context().run(run)
+        self.assertEqual(len(result.sub_results), 1)
+        self.assertEqual(result.sub_results[0].count, 6)
+        self.assertEqual(len(result.sub_results[0].sub_results), 3)
+
     def test_dump(self):
         self.result.dump()
 
@@ -64,6 +148,29 @@ class ResultTest(TestCase):
         self.assertTrue(len(checker.tags) == 0)
         checker.close()
 
+    def test_write_html(self):
+        buffer = io.StringIO()
+        self.result.write_html(buffer)
+        content = buffer.getvalue()
+        self.assertEqual(content, self.result.to_html())
+        self.assertIn(
+            '<div>\n<div class="warning">sub</div>\n</div>\n</div>\n</div>\n'
+            '<div>\n<div class="error">test3</div>\n</div>\n',
+            content,
+        )
+        self.assertNotIn("<!-- CONTENT -->", content)
+
+    def test_write_html_deep(self):
+        result = AasTestResult("root")
+        current = result
+        for i in range(5 * sys.getrecursionlimit()):
+            sub_result = AasTestResult(f"sub{i}")
+            current.append(sub_result)
+            current = sub_result
+        buffer = io.StringIO()
+        result.write_html(buffer)
+        self.assertIn("sub4", buffer.getvalue())
+
 
 class ContextManagerTest(TestCase):
 
@@ -160,3 +267,69 @@ class ContextManagerTest(TestCase):
                 raise RuntimeError("xyz")
         self.assertEqual(r.message, "foo")
         self.assertEqual(r.sub_results[0].message, "bar")
+
+    def test_detached(self):
+        with start("foo") as r:
+            with start("bar", detached=True) as detached:
+                write("bar_x")
+        self.assertEqual(len(r.sub_results), 0)
+        self.assertEqual(detached.sub_results[0].message, "bar_x")
+
+    def test_write_lazy(self):
+        with start("foo") as r:
+            write("bar %s %d", "x", 1)
+        self.assertEqual(r.sub_results[0].message, "bar x 1")
+
+    def test_verbosity(self):
+        def run():
+            set_verbosity(Level.WARNING)
+            with start("foo") as r:
+                write("bar %s", "not formatted")
+                write(AasTestResult("baz", Level.WARNING))
+                with start("info"):
+                    write("info_x")
+                with start("nested"):
+                    with start("nested_error"):
+                        abort(AasTestResult("x", Level.CRITICAL))
+                with start("warning"):
+                    write(AasTestResult("warning_x", Level.WARNING))
+            return r
+
+        r = copy_context().run(run)
+        self.assertEqual([i.message for i in r.sub_results], ["baz", "nested", "warning"])
+        self.assertEqual(r.sub_results[1].sub_results[0].sub_results[0].message, "x")
+        self.assertEqual(r.level, Level.CRITICAL)
+        # The setting is local to the context
+        with start("foo") as r:
+            write("bar")
+        self.assertEqual(len(r.sub_results), 1)
+
+    def test_verbosity_propagates_level(self):
+        def run():
+            set_verbosity(Level.ERROR)
+            with start("foo") as r:
+                write(AasTestResult("bar", Level.WARNING))
+            return r
+
+        r = copy_context().run(run)
+        self.assertEqual(len(r.sub_results), 0)
+        self.assertEqual(r.level, Level.WARNING)
+        self.assertTrue(r.ok())
+
+    def test_concurrent_contexts(self):
+        barrier = threading.Barrier(4)
+
+        def run(name: str) -> AasTestResult:
+            with start(name, detached=True) as r:
+                for i in range(3):
+                    barrier.wait()
+                    write(f"{name}_{i}")
+            return r
+
+        with start("foo") as root:
+            with ThreadPoolExecutor(4) as executor:
+                futures = [executor.submit(copy_context().run, run, f"t{i}") for i in range(4)]
+                results = [i.result() for i in futures]
+        self.assertEqual(len(root.sub_results), 0)
+        for idx, r in enumerate(results):
+            self.assertEqual([i.message for i in r.sub_results], [f"t{idx}_{i}" for i in range(3)])